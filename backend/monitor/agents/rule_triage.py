@@ -0,0 +1,146 @@
+"""
+Rule-based pre-triage for NYC 311 signals.
+Scores routine complaints locally from the normalized alert type, the handling
+agency and descriptor keywords, so only ambiguous or high-impact signals need
+a model call in the triage agent.
+"""
+import os
+import logging
+from typing import Dict, List, NamedTuple, Tuple
+
+from monitor.types.alert_categories import (
+    NYC_311_COMPLAINT_TYPE_MAPPING, categorize_311_complaint, get_alert_type_info)
+from monitor.utils.keyword_matcher import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+# Signals scored at or above this severity are confirmed by the LLM
+PRE_TRIAGE_LLM_SEVERITY = int(os.getenv('PRE_TRIAGE_LLM_SEVERITY', '8'))
+# Most signals sent to the LLM per run; the rest keep their rule score
+PRE_TRIAGE_MAX_LLM_SIGNALS = int(os.getenv('PRE_TRIAGE_MAX_LLM_SIGNALS', '200'))
+
+# Descriptor keyword categories and the severity adjustment each applies.
+# Keywords match as whole phrases: a keyword inside a longer matched one does
+# not count on its own ('smoke' in 'smoke detector', 'fire' in 'fire hydrant')
+DESCRIPTOR_KEYWORDS = {
+    'life_safety': [
+        'fire', 'smoke', 'explosion', 'collapse', 'gas leak', 'smell of gas',
+        'odor of gas', 'gas odor', 'carbon monoxide', 'sparking', 'downed wire',
+        'wire down', 'electrocution', 'injured', 'injury', 'trapped',
+        'evacuat', 'imminent', 'unsafe structure', 'falling debris'
+    ],
+    'service_outage': [
+        'no heat', 'no hot water', 'no water', 'water main', 'flooding',
+        'sewer backup', 'outage', 'blackout', 'elevator not working'
+    ],
+    'routine': [
+        'loud music', 'party', 'banging', 'pounding', 'talking',
+        'blocked hydrant', 'blocked driveway', 'double parked', 'overnight parking',
+        'posted parking sign', 'bulky', 'missed collection', 'graffiti', 'litter',
+        'dirty', 'rat sighting', 'mouse sighting', 'mice', 'pothole',
+        'street light out', 'lamppost', 'paint/plaster', 'pests', 'odor',
+        # Routine equipment and conditions named after life-safety words
+        'smoke detector', 'carbon monoxide detector', 'fire hydrant', 'hydrant',
+        'hydrant leak', 'leak'
+    ]
+}
+KEYWORD_SEVERITY_ADJUSTMENT = {
+    'life_safety': 3,
+    'service_outage': 1,
+    'routine': -1
+}
+
+# Severity adjustment by handling agency
+AGENCY_SEVERITY_ADJUSTMENT = {
+    'FDNY': 2,
+    'NYCEM': 2,
+    'OEM': 2,
+    'DEP': 1,
+    'DSNY': -1,
+    'DPR': -1
+}
+
+DESCRIPTOR_MATCHER = KeywordMatcher(DESCRIPTOR_KEYWORDS)
+
+
+class RuleVerdict(NamedTuple):
+    """Outcome of scoring one signal with the local rules"""
+    severity: int
+    alert_type: str
+    needs_llm: bool
+    reason: str
+
+
+def score_311_signal(signal: Dict) -> RuleVerdict:
+    """
+    Score a 311 signal from its complaint type, agency and descriptor
+
+    Args:
+        signal: Standardized 311 signal from NYC311Collector
+
+    Returns:
+        RuleVerdict with the rule severity and whether the LLM should decide
+    """
+    metadata = signal.get('metadata', {})
+    complaint_type = metadata.get('complaint_type', '')
+    descriptor = metadata.get('descriptor', '') or ''
+
+    alert_type = categorize_311_complaint(complaint_type)
+    severity = get_alert_type_info(alert_type).default_severity
+    severity += AGENCY_SEVERITY_ADJUSTMENT.get(
+        (metadata.get('agency') or '').upper(), 0)
+
+    categories = {hit.category for hit in DESCRIPTOR_MATCHER.find_all(descriptor)}
+    # Life-safety words outrank routine ones ("party" next to "fire" is not routine)
+    if 'life_safety' in categories:
+        categories.discard('routine')
+    for category in categories:
+        severity += KEYWORD_SEVERITY_ADJUSTMENT[category]
+    severity = max(1, min(10, severity))
+
+    if metadata.get('is_cluster'):
+        return RuleVerdict(severity, alert_type, True, 'volume_cluster')
+    if 'life_safety' in categories:
+        return RuleVerdict(severity, alert_type, True, 'life_safety_keywords')
+    if severity >= PRE_TRIAGE_LLM_SEVERITY:
+        return RuleVerdict(severity, alert_type, True, 'high_impact')
+    if (alert_type == 'general_inquiry' and complaint_type not in NYC_311_COMPLAINT_TYPE_MAPPING
+            and not categories):
+        return RuleVerdict(severity, alert_type, True, 'unrecognized_complaint')
+    return RuleVerdict(severity, alert_type, False, 'routine')
+
+
+def pre_triage_311(signals: List[Dict]) -> Tuple[List[Tuple[Dict, RuleVerdict]], List[Tuple[Dict, RuleVerdict]]]:
+    """
+    Split 311 signals into rule-scored signals and LLM candidates
+
+    LLM candidates are ordered by rule severity and capped at
+    PRE_TRIAGE_MAX_LLM_SIGNALS; signals over the cap stay rule-scored.
+
+    Args:
+        signals: Standardized 311 signals
+
+    Returns:
+        Tuple of (rule-scored, LLM candidates), each a list of (signal, verdict)
+    """
+    rule_scored = []
+    candidates = []
+    for signal in signals:
+        verdict = score_311_signal(signal)
+        (candidates if verdict.needs_llm else rule_scored).append(
+            (signal, verdict))
+
+    candidates.sort(key=lambda item: item[1].severity, reverse=True)
+    if len(candidates) > PRE_TRIAGE_MAX_LLM_SIGNALS:
+        overflow = candidates[PRE_TRIAGE_MAX_LLM_SIGNALS:]
+        candidates = candidates[:PRE_TRIAGE_MAX_LLM_SIGNALS]
+        logger.warning(
+            f"⚠️  {len(overflow)} 311 signals over the LLM cap keep their rule severity")
+        rule_scored.extend(overflow)
+
+    reasons = {}
+    for _, verdict in candidates:
+        reasons[verdict.reason] = reasons.get(verdict.reason, 0) + 1
+    logger.info(
+        f"📏 Rule pre-triage: {len(rule_scored)} scored locally, {len(candidates)} sent to LLM {reasons}")
+    return rule_scored, candidates
@@ -4,15 +4,62 @@ Quickly analyzes raw signals from multiple sources and assigns severity scores.
 Designed to be fast and cost-effective for 15-minute monitoring cycles.
 """
 import os
+import re
 import json
+import time
+import asyncio
 import logging
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import vertexai
 from vertexai.generative_models import GenerativeModel
 
+from monitor.agents.triage_cache import TriageCache, signal_cache_key
+from monitor.utils.near_duplicate import NearDuplicateIndex
+
 logger = logging.getLogger(__name__)
 
+# Shard size is bounded by the model's output limit: a shard's JSON response
+# must fit in TRIAGE_MAX_OUTPUT_TOKENS even if every signal yields its own
+# alert (the example alert in the prompt is about 430 tokens), after room for
+# the summary and the normal_activity/rejected_signals lists.
+TRIAGE_MAX_OUTPUT_TOKENS = int(os.getenv('TRIAGE_MAX_OUTPUT_TOKENS', '8192'))
+TRIAGE_ALERT_OUTPUT_TOKENS = int(os.getenv('TRIAGE_ALERT_OUTPUT_TOKENS', '450'))
+TRIAGE_OUTPUT_OVERHEAD_TOKENS = 1024
+TRIAGE_SHARD_MAX_SIGNALS = max(
+    1, (TRIAGE_MAX_OUTPUT_TOKENS - TRIAGE_OUTPUT_OVERHEAD_TOKENS) // TRIAGE_ALERT_OUTPUT_TOKENS)
+# Whole prompt per shard, in estimated tokens. The fixed instructions (about
+# 2.3k tokens) are subtracted to get the room left for signal data; it only
+# binds for unusually long signals, since TRIAGE_SHARD_MAX_SIGNALS compact
+# signals take a few thousand tokens. Every shard pays the instructions again,
+# which is the price of responses that are never cut off at the output limit.
+TRIAGE_PROMPT_TOKEN_BUDGET = int(os.getenv('TRIAGE_PROMPT_TOKEN_BUDGET', '16000'))
+TRIAGE_MAX_CONCURRENT_SHARDS = int(
+    os.getenv('TRIAGE_MAX_CONCURRENT_SHARDS', '4'))
+CHARS_PER_TOKEN = 4
+
+# raw_signals keys that describe the batch rather than hold signals
+TRIAGE_CONTEXT_KEYS = ('recent_alerts', 'timestamp', 'collection_window')
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting (about 4 characters per token)"""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _compact_json(data) -> str:
+    """Signal data as sent to the model, without indentation"""
+    return json.dumps(data, separators=(',', ':'), default=str)
+
+
+def _normalize(text: str) -> str:
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', (text or '').lower()).split())
+
+
+def _alert_title_key(alert: Dict) -> str:
+    """Normalized title under which alerts from different shards count as the same event"""
+    return _normalize(alert.get('title', ''))
+
 
 class TriageAgent:
     """Lightweight AI agent for quick severity assessment of NYC signals"""
@@ -48,6 +95,9 @@ class TriageAgent:
                 raise Exception(
                     f"No available Vertex AI models. Check project access and model availability.")
 
+        # Prompt size without signal data, estimated on first use
+        self._template_tokens: Optional[int] = None
+
         # Severity thresholds for alerting
         self.severity_thresholds = {
             'urgent_investigation': 8,  # Immediate full investigation
@@ -55,133 +105,455 @@ class TriageAgent:
             'monitor_only': 3          # Just monitor, no action
         }
 
-    async def analyze_signals(self, raw_signals: Dict) -> Dict:
+    async def analyze_signals(self, raw_signals: Dict, cache: Optional[TriageCache] = None) -> Dict:
         """
         Analyze raw signals from multiple sources and assign severity scores
 
+        Signals are split into token-budgeted shards that are triaged
+        concurrently (at most TRIAGE_MAX_CONCURRENT_SHARDS model calls in
+        flight), and the per-shard alert lists are merged with cross-shard
+        duplicate removal.
+
+        With a cache, signals whose verdict is cached stay out of the prompt.
+        Their cached alerts are merged like any shard's, and the fresh
+        verdicts are cached for later cycles.
+
+        Recent alerts are not sent to the model: every merged alert is checked
+        against a local near-duplicate index of them (and of the alerts before
+        it in this batch), which sets is_duplicate.
+
         Args:
             raw_signals: Dictionary containing data from all sources
+            cache: Optional per-signal verdict cache
 
         Returns:
-            Dictionary with alerts and severity scores
+            Dictionary with alerts, severity scores and per-shard stats
         """
         try:
-            logger.info("Starting triage analysis of collected signals")
-
-            # Create prompt for AI analysis
-            prompt = self._create_triage_prompt(raw_signals)
-
-            # Get AI response (using synchronous method)
-            response = self.model.generate_content(prompt)
-
-            if response and response.text:
-                try:
-                    # Clean the response text to extract JSON
-                    response_text = response.text.strip()
-
-                    # Try to extract JSON from the response (sometimes wrapped in markdown)
-                    if response_text.startswith('```json'):
-                        # Extract JSON from markdown code block
-                        start = response_text.find('{')
-                        end = response_text.rfind('}') + 1
-                        if start != -1 and end > start:
-                            response_text = response_text[start:end]
-                    elif response_text.startswith('```'):
-                        # Extract from generic code block
-                        lines = response_text.split('\n')
-                        json_lines = []
-                        in_json = False
-                        for line in lines:
-                            if line.strip() == '```':
-                                if in_json:
-                                    break
-                                continue
-                            if line.strip().startswith('{') or in_json:
-                                in_json = True
-                                json_lines.append(line)
-                        response_text = '\n'.join(json_lines)
-
-                    # Parse structured response
-                    analysis = json.loads(response_text)
-
-                    # Debug: Log what we got from the AI
-                    alerts = analysis.get('alerts', [])
-                    logger.info(
-                        f"🔍 AI Response: {len(alerts)} alerts generated")
-                    # Log first 3 alerts
-                    for i, alert in enumerate(alerts[:3]):
-                        logger.info(
-                            f"   Alert {i+1}: {alert.get('title', 'No title')} - Severity: {alert.get('severity', 'MISSING')}")
-
-                    # Add metadata
-                    analysis['timestamp'] = datetime.utcnow().isoformat()
-                    analysis['sources_analyzed'] = list(raw_signals.keys())
-
-                    # Categorize alerts by severity
-                    analysis['action_required'] = self._categorize_by_severity(
-                        analysis.get('alerts', []))
-
-                    logger.info(
-                        f"Triage complete: {len(analysis.get('alerts', []))} alerts generated")
-                    return analysis
-
-                except json.JSONDecodeError as e:
-                    logger.error(f"Failed to parse triage response: {e}")
-                    logger.error(f"Raw response: {response.text[:500]}...")
-                    return self._create_fallback_response(raw_signals)
-                except Exception as e:
-                    logger.error(f"Error processing triage response: {e}")
-                    return self._create_fallback_response(raw_signals)
-            else:
-                logger.warning("Empty response from triage agent")
-                return self._create_fallback_response(raw_signals)
+            sources_analyzed = list(raw_signals.keys())
+            recent_index = NearDuplicateIndex(
+                raw_signals.get('recent_alerts') or [])
+            raw_signals = self._with_signal_keys(raw_signals)
+
+            cached_alerts: List[Dict] = []
+            cached_signals = 0
+            if cache is not None:
+                raw_signals, cached_alerts, cached_signals = await self._take_cached_verdicts(
+                    raw_signals, cache)
+
+            has_uncached = any(isinstance(v, list) and v for k, v in raw_signals.items()
+                               if k not in TRIAGE_CONTEXT_KEYS)
+            shards = self._shard_signals(
+                raw_signals) if has_uncached or not cached_signals else []
+            logger.info(
+                f"Starting triage analysis of collected signals ({len(shards)} shards, "
+                f"{cached_signals} signals answered from cache)")
+
+            started = time.monotonic()
+            semaphore = asyncio.Semaphore(TRIAGE_MAX_CONCURRENT_SHARDS)
+            shard_results = await asyncio.gather(*[
+                self._analyze_shard(index, shard, semaphore)
+                for index, shard in enumerate(shards)
+            ])
+            wall_seconds = time.monotonic() - started
+
+            shard_stats = {
+                'shards': len(shards),
+                'failed': sum(1 for _, stats in shard_results if not stats['success']),
+                'max_concurrency': TRIAGE_MAX_CONCURRENT_SHARDS,
+                'token_budget': TRIAGE_PROMPT_TOKEN_BUDGET,
+                'max_signals_per_shard': TRIAGE_SHARD_MAX_SIGNALS,
+                'prompt_tokens': sum(stats['prompt_tokens'] for _, stats in shard_results),
+                'output_tokens': sum(stats['output_tokens'] for _, stats in shard_results),
+                'wall_seconds': round(wall_seconds, 3),
+                'per_shard': [stats for _, stats in shard_results]
+            }
+
+            if cache is not None:
+                self._cache_verdicts(cache, shards, shard_results)
+                await cache.save()
+
+            analyses = [analysis for analysis,
+                        _ in shard_results if analysis is not None]
+            if shards and not analyses and not cached_alerts:
+                fallback = self._create_fallback_response(raw_signals)
+                fallback['shard_stats'] = shard_stats
+                return fallback
+            if cached_alerts:
+                analyses.append({'alerts': cached_alerts})
+
+            analysis = self._merge_shard_analyses(analyses)
+            if not analysis['summary']:
+                analysis['summary'] = 'No new or changed signals since the last cycle'
+
+            alerts = analysis['alerts']
+            analysis['near_duplicates'] = self._mark_near_duplicates(
+                alerts, recent_index)
+            logger.info(f"🔍 AI Response: {len(alerts)} alerts generated")
+            # Log first 3 alerts
+            for i, alert in enumerate(alerts[:3]):
+                logger.info(
+                    f"   Alert {i+1}: {alert.get('title', 'No title')} - Severity: {alert.get('severity', 'MISSING')}")
+
+            # Add metadata
+            analysis['timestamp'] = datetime.utcnow().isoformat()
+            analysis['sources_analyzed'] = sources_analyzed
+            analysis['shard_stats'] = shard_stats
+            if cache is not None:
+                analysis['cache_stats'] = {
+                    'cached_signals': cached_signals,
+                    'cached_alerts': len(cached_alerts),
+                    **cache.get_stats()
+                }
+
+            # Categorize alerts by severity
+            analysis['action_required'] = self._categorize_by_severity(alerts)
+
+            logger.info(
+                f"Triage complete: {len(alerts)} alerts generated from {len(analyses)}/{len(shards)} shards "
+                f"in {wall_seconds:.2f}s ({shard_stats['prompt_tokens']} prompt / "
+                f"{shard_stats['output_tokens']} output tokens)")
+            return analysis
 
         except Exception as e:
             logger.error(f"Error in triage analysis: {str(e)}")
             return self._create_fallback_response(raw_signals)
 
+    def _with_signal_keys(self, raw_signals: Dict) -> Dict:
+        """Copy raw_signals with a 'signal_key' on every signal for the model to cite"""
+        keyed = {}
+        for source, data in raw_signals.items():
+            if source in TRIAGE_CONTEXT_KEYS or not isinstance(data, list):
+                keyed[source] = data
+                continue
+            keyed[source] = [{**signal, 'signal_key': signal_cache_key(source, signal)}
+                             if isinstance(signal, dict) else signal for signal in data]
+        return keyed
+
+    async def _take_cached_verdicts(self, raw_signals: Dict,
+                                    cache: TriageCache) -> Tuple[Dict, List[Dict], int]:
+        """
+        Remove signals with a cached verdict
+
+        Args:
+            raw_signals: Signals with signal keys
+            cache: Per-signal verdict cache
+
+        Returns:
+            Tuple of (remaining raw_signals, cached alerts, signals answered from cache)
+        """
+        keys = [signal['signal_key'] for source, data in raw_signals.items()
+                if source not in TRIAGE_CONTEXT_KEYS and isinstance(data, list)
+                for signal in data if isinstance(signal, dict)]
+        await cache.load(keys)
+
+        remaining = {}
+        cached_alerts = []
+        seen_alerts = set()
+        cached_signals = 0
+        for source, data in raw_signals.items():
+            if source in TRIAGE_CONTEXT_KEYS or not isinstance(data, list):
+                remaining[source] = data
+                continue
+            uncached = []
+            for signal in data:
+                verdict = cache.get(signal['signal_key']) if isinstance(
+                    signal, dict) else None
+                if verdict is None:
+                    uncached.append(signal)
+                    continue
+                cached_signals += 1
+                # An alert derived from several signals is cached under each of them
+                for alert in verdict:
+                    identity = json.dumps(alert, sort_keys=True, default=str)
+                    if identity not in seen_alerts:
+                        seen_alerts.add(identity)
+                        cached_alerts.append(alert)
+            if uncached:
+                remaining[source] = uncached
+        return remaining, cached_alerts, cached_signals
+
+    def _cache_verdicts(self, cache: TriageCache, shards: List[Dict],
+                        shard_results: List[Tuple[Optional[Dict], Dict]]):
+        """
+        Cache each signal's verdict from the shards that succeeded
+
+        A shard is skipped when any of its alerts lacks signal_keys, since its
+        alerts cannot then be attributed to individual signals.
+        """
+        for shard, (analysis, _) in zip(shards, shard_results):
+            if analysis is None:
+                continue
+            alerts = analysis.get('alerts') or []
+            if any(not isinstance(alert.get('signal_keys'), list) for alert in alerts):
+                continue
+            for source, data in shard.items():
+                if source in TRIAGE_CONTEXT_KEYS or not isinstance(data, list):
+                    continue
+                for signal in data:
+                    if isinstance(signal, dict):
+                        key = signal['signal_key']
+                        cache.put(key, [alert for alert in alerts
+                                        if key in alert['signal_keys']])
+
+    def _mark_near_duplicates(self, alerts: List[Dict], index: NearDuplicateIndex) -> int:
+        """
+        Set is_duplicate on alerts that repeat a recent alert or an earlier alert in the batch
+
+        Args:
+            alerts: Merged alerts, in output order
+            index: Near-duplicate index of recent alerts (new alerts are added to it)
+
+        Returns:
+            Number of alerts marked as duplicates
+        """
+        duplicates = 0
+        for alert in alerts:
+            match = index.find(alert)
+            if match is None:
+                alert['is_duplicate'] = False
+                index.add(alert)
+                continue
+
+            duplicates += 1
+            original = match.alert
+            distance = f", {match.distance_meters:.0f} m apart" if match.distance_meters is not None else ''
+            alert['is_duplicate'] = True
+            alert['duplicate_of'] = original.get(
+                'document_id') or original.get('title')
+            alert['duplicate_reason'] = f"Near-duplicate (similarity {match.similarity:.2f}{distance})"
+            alert['duplicate_created_at'] = original.get('created_at')
+        if duplicates:
+            logger.info(
+                f"🔄 Near-duplicate index flagged {duplicates}/{len(alerts)} alerts")
+        return duplicates
+
+    def _shard_signals(self, raw_signals: Dict) -> List[Dict]:
+        """
+        Split signals into shards of at most TRIAGE_SHARD_MAX_SIGNALS signals
+        whose prompt fits TRIAGE_PROMPT_TOKEN_BUDGET
+
+        Signals are packed greedily in source order, so a shard can hold
+        several sources (keeping cross-source correlation possible). Metadata
+        keys are copied into every shard; recent alerts are left out, since
+        duplicates are matched locally after triage.
+
+        Args:
+            raw_signals: Dictionary containing data from all sources
+
+        Returns:
+            List of raw_signals-shaped dictionaries, at least one
+        """
+        context = {k: v for k, v in raw_signals.items()
+                   if k != 'recent_alerts' and (k in TRIAGE_CONTEXT_KEYS or not isinstance(v, list))}
+
+        data_budget = max(TRIAGE_PROMPT_TOKEN_BUDGET - self._prompt_template_tokens(), 1)
+
+        shards = []
+        current: Dict[str, List] = {}
+        current_tokens = current_signals = 0
+        for source, signals in raw_signals.items():
+            if source in TRIAGE_CONTEXT_KEYS or not isinstance(signals, list):
+                continue
+            for signal in signals:
+                tokens = _estimate_tokens(_compact_json(signal))
+                if current and (current_tokens + tokens > data_budget
+                                or current_signals == TRIAGE_SHARD_MAX_SIGNALS):
+                    shards.append(current)
+                    current, current_tokens, current_signals = {}, 0, 0
+                current.setdefault(source, []).append(signal)
+                current_tokens += tokens
+                current_signals += 1
+        if current or not shards:
+            shards.append(current)
+
+        return [{**shard, **context} for shard in shards]
+
+    def _prompt_template_tokens(self) -> int:
+        """Estimated tokens of the triage prompt without any signal data"""
+        if self._template_tokens is None:
+            self._template_tokens = _estimate_tokens(self._create_triage_prompt({}))
+        return self._template_tokens
+
+    async def _analyze_shard(self, index: int, shard: Dict,
+                             semaphore: asyncio.Semaphore) -> Tuple[Optional[Dict], Dict]:
+        """
+        Triage one shard through the async model API
+
+        Args:
+            index: Shard position, for logging and stats
+            shard: raw_signals-shaped dictionary for this shard
+            semaphore: Shared cap on concurrent model calls
+
+        Returns:
+            Tuple of (parsed analysis or None on failure, shard stats)
+        """
+        prompt = self._create_triage_prompt(shard)
+        stats = {
+            'shard': index,
+            'signals': sum(len(v) for k, v in shard.items()
+                           if k not in TRIAGE_CONTEXT_KEYS and isinstance(v, list)),
+            'estimated_tokens': _estimate_tokens(prompt),
+            'prompt_tokens': 0,
+            'output_tokens': 0,
+            'latency_seconds': 0.0,
+            'alerts': 0,
+            'success': False
+        }
+
+        async with semaphore:
+            started = time.monotonic()
+            try:
+                response = await self.model.generate_content_async(
+                    prompt, generation_config={'max_output_tokens': TRIAGE_MAX_OUTPUT_TOKENS})
+            except Exception as e:
+                stats['latency_seconds'] = round(
+                    time.monotonic() - started, 3)
+                stats['error'] = str(e)
+                logger.error(f"Triage shard {index} failed: {str(e)}")
+                return None, stats
+            stats['latency_seconds'] = round(time.monotonic() - started, 3)
+
+        usage = getattr(response, 'usage_metadata', None)
+        stats['prompt_tokens'] = getattr(
+            usage, 'prompt_token_count', 0) or stats['estimated_tokens']
+        stats['output_tokens'] = getattr(usage, 'candidates_token_count', 0) or 0
+
+        try:
+            response_text = response.text if response else ''
+        except Exception as e:
+            # .text raises when the candidate was blocked or empty
+            response_text = ''
+            stats['error'] = str(e)
+
+        if not response_text:
+            logger.warning(f"Empty response from triage agent (shard {index})")
+            stats.setdefault('error', 'empty response')
+            return None, stats
+
+        try:
+            analysis = self._parse_response_text(response_text)
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse triage response (shard {index}): {e}")
+            logger.error(f"Raw response: {response_text[:500]}...")
+            stats['error'] = f"invalid JSON: {e}"
+            return None, stats
+
+        stats['alerts'] = len(analysis.get('alerts', []))
+        stats['success'] = True
+        return analysis, stats
+
+    def _parse_response_text(self, response_text: str) -> Dict:
+        """Extract and parse the JSON body of a model response"""
+        # Clean the response text to extract JSON
+        response_text = response_text.strip()
+
+        # Try to extract JSON from the response (sometimes wrapped in markdown)
+        if response_text.startswith('```json'):
+            # Extract JSON from markdown code block
+            start = response_text.find('{')
+            end = response_text.rfind('}') + 1
+            if start != -1 and end > start:
+                response_text = response_text[start:end]
+        elif response_text.startswith('```'):
+            # Extract from generic code block
+            lines = response_text.split('\n')
+            json_lines = []
+            in_json = False
+            for line in lines:
+                if line.strip() == '```':
+                    if in_json:
+                        break
+                    continue
+                if line.strip().startswith('{') or in_json:
+                    in_json = True
+                    json_lines.append(line)
+            response_text = '\n'.join(json_lines)
+
+        return json.loads(response_text)
+
+    def _merge_shard_analyses(self, analyses: List[Dict]) -> Dict:
+        """
+        Merge per-shard analyses into one, removing cross-shard duplicate alerts
+
+        Alerts from different shards are merged only when their normalized
+        titles match exactly; alerts of one shard are never merged (the prompt
+        already deduplicates within a shard). Looser matches are left to the
+        near-duplicate index, which flags them instead of dropping them. The
+        higher-severity alert is kept and the other's sources are folded into
+        its signals list.
+
+        Args:
+            analyses: Parsed shard analyses
+
+        Returns:
+            Single analysis with merged alerts and concatenated side lists
+        """
+        merged = {
+            'summary': ' '.join(a.get('summary', '') for a in analyses
+                                if a.get('summary')).strip(),
+            'alerts': [],
+            'duplicates_detected': [],
+            'normal_activity': [],
+            'rejected_signals': []
+        }
+        # Normalized title -> (index in merged alerts, shard it came from)
+        seen: Dict[str, Tuple[int, int]] = {}
+        cross_shard_duplicates = 0
+
+        for shard_index, analysis in enumerate(analyses):
+            for key in ('duplicates_detected', 'normal_activity', 'rejected_signals'):
+                merged[key].extend(analysis.get(key) or [])
+
+            for alert in analysis.get('alerts') or []:
+                title_key = _alert_title_key(alert)
+                first = seen.get(title_key) if title_key else None
+                if first is None or first[1] == shard_index:
+                    if title_key and first is None:
+                        seen[title_key] = (len(merged['alerts']), shard_index)
+                    merged['alerts'].append(alert)
+                    continue
+
+                cross_shard_duplicates += 1
+                index = first[0]
+                kept = merged['alerts'][index]
+                if alert.get('severity', 0) > kept.get('severity', 0):
+                    alert, kept = kept, alert
+                    merged['alerts'][index] = kept
+                kept['signals'] = list(dict.fromkeys(
+                    (kept.get('signals') or []) + (alert.get('signals') or [])))
+
+        if cross_shard_duplicates:
+            logger.info(
+                f"🔄 Merged {cross_shard_duplicates} duplicate alerts across shards")
+        merged['cross_shard_duplicates'] = cross_shard_duplicates
+        return merged
+
     def _create_triage_prompt(self, raw_signals: Dict) -> str:
         """Create the triage analysis prompt"""
 
         # Count signals for context
         signal_summary = {}
-        recent_alerts_summary = []
 
         for source, data in raw_signals.items():
             if source == 'recent_alerts':
-                # Handle recent alerts for duplicate detection
-                recent_alerts_summary = data if isinstance(data, list) else []
+                # Recent alerts are matched locally after triage, not in the prompt
                 continue
             elif isinstance(data, list):
                 signal_summary[source] = f"{len(data)} items"
             else:
                 signal_summary[source] = "1 dataset"
 
-        # Create the raw data snippet (excluding recent alerts from main data)
+        # Create the raw data snippet (excluding recent alerts from main data).
+        # Shards are sized to the token budget; the cut only guards against a
+        # single oversized signal
         signals_for_analysis = {k: v for k, v in raw_signals.items(
-        ) if k not in ['recent_alerts', 'timestamp', 'collection_window']}
-        raw_data_snippet = json.dumps(
-            signals_for_analysis, indent=2, default=str)[:4000]
+        ) if k not in TRIAGE_CONTEXT_KEYS}
+        raw_data_snippet = _compact_json(
+            signals_for_analysis)[:TRIAGE_PROMPT_TOKEN_BUDGET * CHARS_PER_TOKEN]
         signal_sources_json = json.dumps(signal_summary, indent=2)
         current_time = datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')
 
-        # Recent alerts summary for duplicate detection
-        recent_alerts_snippet = ""
-        if recent_alerts_summary:
-            recent_alerts_snippet = f"""
-**RECENT ALERTS (for duplicate detection)**:
-{json.dumps([{
-    'title': alert.get('title', ''),
-    'event_type': alert.get('event_type', ''),
-    'area': alert.get('area', ''),
-    'specific_streets': alert.get('specific_streets', []),
-    'venue_address': alert.get('venue_address', ''),
-    'event_date': alert.get('event_date', ''),
-    'created_at': alert.get('created_at', ''),
-    'document_id': alert.get('document_id', '')
-} for alert in recent_alerts_summary[:10]], indent=2, default=str)}
-"""
-
         # Enhanced triage prompt with specific categorization requirements
         prompt = f"""
 You are a NYC monitoring triage agent. Analyze these data signals and assign SPECIFIC event types and categories instead of generic "general" classifications.
@@ -190,8 +562,6 @@ You are a NYC monitoring triage agent. Analyze these data signals and assign SPE
 
 **Signal Sources**: {signal_sources_json}
 
-{recent_alerts_snippet}
-
 **Raw Data**: {raw_data_snippet}...
 
 **CRITICAL REQUIREMENT - SPECIFIC CATEGORIZATION**: 
@@ -218,32 +588,8 @@ You MUST categorize each alert with specific event types. DO NOT use "general" u
 8. **Environmental** → "air_quality", "sanitation"
 9. **311 emergency types** → match to appropriate emergency category
 
-**DUPLICATE DETECTION REQUIREMENTS**:
-1. **Check Recent Alerts**: Before creating new alerts, compare against recent alerts from the last 6 hours
-2. **Same Event Criteria**: Consider events duplicates if they share:
-   - Same or overlapping specific streets/intersections
-   - Same venue or landmark
-   - Same event type (parade, concert, emergency, etc.) 
-   - Same or adjacent time period (within 6 hours)
-3. **New Information Assessment**: Create a new alert ONLY if:
-   - Significant new details (route changes, time updates, new safety concerns)
-   - Different perspective or community reaction
-   - Escalation in severity or scope
-   - First-hand witness accounts vs. second-hand reports
-4. **Update vs. New Alert**: If it's the same event with minor updates, mark it as "duplicate_of" and include the original alert's document_id
-
-**🚨 CRITICAL DUPLICATE DETECTION RULES**:
-1. **EXACT TITLE MATCHES**: If the title is identical or 90%+ similar to any recent alert, mark as duplicate
-2. **SAME EVENT TYPE + LOCATION**: If event_type AND area/location are the same, mark as duplicate
-3. **RECURRING NON-EVENTS**: If seeing the same non-urgent event repeatedly (like "Birds on Fire Escape"), mark as duplicate after first occurrence
-4. **DEFAULT TO DUPLICATE**: When in doubt between duplicate vs. new alert, choose duplicate to avoid spam
-5. **AGGRESSIVE DUPLICATE DETECTION**: Be very strict - only create new alerts for genuinely new information
-
-**DUPLICATE MARKING INSTRUCTIONS**:
-- Set "is_duplicate": true for any alert that matches recent alerts
-- Set "duplicate_of": "[document_id or title]" to reference the original
-- Set "duplicate_reason": "Exact title match" or "Same event and location" etc.
-- Use "new_information": "None" if no new details, or describe what's new if any
+**SAME-EVENT MERGING**:
+Reports of the same event (same streets, venue or landmark, and event type) across signals and sources belong in ONE alert that lists all of their signal_keys. Earlier alerts are de-duplicated automatically after triage, so do not try to match against past events.
 
 **CONTENT AND SENTIMENT ANALYSIS**:
 1. **Analyze Actual Content**: Examine the full text, sentiment, and tone across all sources (Reddit posts, Tweets, HackerNews stories, 311 reports, etc.)
@@ -324,6 +670,7 @@ Only create alerts if you can identify SPECIFIC locations with actionable geogra
       "category": "infrastructure",
       "event_type": "water_system",
       "signals": ["reddit", "twitter", "311"],
+      "signal_keys": ["3f9a1c2b7d4e5f6a7b8c", "9e8d7c6b5a4f3e2d1c0b"],
       "description": "Detailed description with specific streets, times, and transportation impacts. Cross-referenced across multiple sources.",
       "keywords": ["example", "keywords"],
       "confidence": 0.85,
@@ -334,10 +681,6 @@ Only create alerts if you can identify SPECIFIC locations with actionable geogra
       "transportation_impact": "Street closures and alternative routes",
       "venue_address": "Specific address or area description",
       "coordinates": {{"lat": 40.7505, "lng": -73.9858}},
-      "is_duplicate": false,
-      "duplicate_of": null,
-      "duplicate_reason": null,
-      "new_information": null,
       "community_sentiment": "concerned",
       "information_quality": "first-hand",
       "urgency_markers": ["happening now", "urgent"],
@@ -350,14 +693,6 @@ Only create alerts if you can identify SPECIFIC locations with actionable geogra
       }}
     }}
   ],
-  "duplicates_detected": [
-    {{
-      "original_alert_id": "2025-06-01_1234_parade_5th_ave",
-      "reason": "Same parade route and timing across multiple sources",
-      "new_information": "Updated crowd size estimate from Twitter",
-      "action": "no_new_alert_needed"
-    }}
-  ],
   "normal_activity": [
     {{
       "source": "reddit",
@@ -381,13 +716,6 @@ Only create alerts if you can identify SPECIFIC locations with actionable geogra
   ]
 }}
 
-🚨 **DUPLICATE DETECTION PRIORITY**: 
-- ALWAYS check recent alerts first before creating any new alert
-- If ANY recent alert has similar title, location, or event type, mark as duplicate
-- Example: If you see "Birds on Fire Escape - Queens" in recent alerts, do NOT create another "Birds on Fire Escape - Queens" alert
-- Example: If you see "SunnyPride in Sunnyside" in recent alerts, mark any new "SunnyPride" or "Sunnyside" events as duplicates
-- Better to have zero alerts than duplicate alerts
-
 IMPORTANT: 
 - Respond with ONLY valid JSON - no markdown, no explanations, no code blocks
 - Start your response with '{{' and end with '}}'
@@ -395,10 +723,10 @@ IMPORTANT:
 - Ensure all strings are properly quoted and escaped
 - ONLY create alerts with specific, actionable location information
 - Include "specific_streets", "cross_streets", "venue_address", and "coordinates" fields when possible
+- In "signal_keys", list the "signal_key" of every input signal the alert is based on
 - Use descriptive titles WITHOUT date prefixes - dates go in separate "event_date" field
 - Use SPECIFIC event_type from the list above - NO "general" unless absolutely necessary
 - If no locationally-specific alerts can be created, use an empty alerts array: "alerts": []
-- 🚨 CRITICAL: Always set is_duplicate=true for any alert matching recent alerts
 """
         return prompt
 
@@ -0,0 +1,173 @@
+"""
+Triage verdict cache for NYC Monitor System.
+
+Hot Reddit and HackerNews posts stay on their listings for hours, so most of a
+15-minute cycle's signals were already triaged by an earlier cycle. Each
+signal's verdict (the alerts the model derived from it, possibly none) is
+cached under a hash of its source, source ID, normalized title and content, so
+only new or edited signals are sent to the model again.
+
+Verdicts are persisted in Firestore because every monitor cycle runs in a
+fresh process. The 'expires_at' field can be used as the collection's
+Firestore TTL field so expired entries are deleted server-side.
+"""
+import hashlib
+import logging
+import os
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TRIAGE_CACHE_TTL_SECONDS = float(
+    os.getenv('TRIAGE_CACHE_TTL_SECONDS', str(6 * 3600)))
+
+# Metadata fields that identify a signal within its source
+SOURCE_ID_FIELDS = ('post_id', 'story_id', 'tweet_id', 'unique_key')
+
+
+def _normalize_text(text) -> str:
+    return re.sub(r'\s+', ' ', str(text or '').strip().lower())
+
+
+def signal_cache_key(source: str, signal: Dict) -> str:
+    """
+    Stable key for a signal's content
+
+    Args:
+        source: Source name the signal was collected under
+        signal: Standardized signal
+
+    Returns:
+        Hex digest that changes whenever the title or content changes
+    """
+    metadata = signal.get('metadata') or {}
+    source_id = next((str(metadata[field]) for field in SOURCE_ID_FIELDS
+                      if metadata.get(field)), signal.get('url', ''))
+    digest = hashlib.sha1('\x1f'.join([
+        source,
+        source_id,
+        _normalize_text(signal.get('title')),
+        _normalize_text(signal.get('content'))
+    ]).encode('utf-8'))
+    return digest.hexdigest()[:20]
+
+
+def _as_utc_naive(value: datetime) -> datetime:
+    """Firestore returns timezone-aware timestamps; compare everything as naive UTC"""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class TriageCache:
+    """Per-signal triage verdicts with a TTL, backed by Firestore"""
+
+    def __init__(self, storage=None, ttl_seconds: Optional[float] = None):
+        """
+        Initialize the cache
+
+        Args:
+            storage: FirestoreManager used to load and persist verdicts.
+                     None keeps the cache in memory only.
+            ttl_seconds: Lifetime of a cached verdict
+        """
+        self.storage = storage
+        self.ttl_seconds = TRIAGE_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+
+        # key -> (expires_at, alerts)
+        self._entries: Dict[str, Tuple[datetime, List[Dict]]] = {}
+        self._pending: Dict[str, Dict] = {}
+
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'expired': 0,
+            'writes': 0
+        }
+
+    async def load(self, keys: Iterable[str]) -> int:
+        """
+        Fetch stored verdicts for the given keys into memory
+
+        Args:
+            keys: Signal cache keys about to be looked up
+
+        Returns:
+            Number of verdicts loaded
+        """
+        missing = [key for key in dict.fromkeys(keys) if key not in self._entries]
+        if self.storage is None or not missing:
+            return 0
+
+        stored = await self.storage.get_triage_verdicts(missing)
+        for key, document in stored.items():
+            expires_at = document.get('expires_at')
+            if isinstance(expires_at, datetime):
+                self._entries[key] = (_as_utc_naive(expires_at),
+                                      document.get('alerts') or [])
+        return len(stored)
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """
+        Look up a verdict
+
+        Args:
+            key: Signal cache key
+
+        Returns:
+            Copies of the cached alerts (empty if the signal produced none),
+            or None on a miss
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= datetime.utcnow():
+            del self._entries[key]
+            self.stats['expired'] += 1
+            entry = None
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+
+        self.stats['hits'] += 1
+        return [dict(alert) for alert in entry[1]]
+
+    def put(self, key: str, alerts: List[Dict]):
+        """
+        Record a fresh verdict (persisted on the next save())
+
+        Args:
+            key: Signal cache key
+            alerts: Alerts the model derived from the signal, possibly empty
+        """
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.ttl_seconds)
+        self._entries[key] = (expires_at, alerts)
+        self._pending[key] = {
+            'alerts': alerts,
+            'created_at': now,
+            'expires_at': expires_at
+        }
+
+    async def save(self) -> int:
+        """
+        Persist verdicts recorded since the last save
+
+        Returns:
+            Number of verdicts written
+        """
+        pending, self._pending = self._pending, {}
+        if self.storage is None or not pending:
+            return 0
+
+        written = await self.storage.save_triage_verdicts(pending)
+        self.stats['writes'] += written
+        return written
+
+    def get_stats(self) -> Dict:
+        """Return hit/miss counters and the hit rate"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'hit_rate': self.stats['hits'] / lookups if lookups else 0.0
+        }
@@ -3,9 +3,12 @@ Base collector class for NYC monitor system.
 Focused on simple data collection - analysis is handled by the triage agent.
 """
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import logging
-import re  # Import here to avoid top-level import issues
+
+from monitor.utils.geocode import geocode_many
+from monitor.utils.keyword_matcher import KeywordMatcher
+from monitor.utils.location_specificity import LOCATION_SPECIFICITY_SCANNER
 
 logger = logging.getLogger(__name__)
 
@@ -70,6 +73,56 @@ class BaseCollector(ABC):
         'illegal dumping', 'blocked driveway', 'double parking'
     ]
 
+    # NYC identifiers - standardized across all collectors for NYC relevance checks.
+    # Identifiers of 3 characters or less only match as whole words.
+    NYC_IDENTIFIER_CATEGORIES = {
+        # City names
+        'city': ['new york', 'nyc', 'new york city'],
+
+        # Boroughs
+        'borough': ['manhattan', 'brooklyn', 'queens', 'bronx', 'staten island'],
+
+        # Well-known neighborhoods
+        'neighborhood': [
+            'midtown', 'downtown', 'uptown', 'lower east side', 'upper west side',
+            'upper east side', 'east village', 'west village', 'greenwich village',
+            'soho', 'tribeca', 'chinatown', 'little italy', 'financial district',
+            'times square', 'central park', 'battery park', 'prospect park',
+            'williamsburg', 'park slope', 'bushwick', 'bed-stuy', 'crown heights',
+            'astoria', 'flushing', 'forest hills', 'long island city', 'lic',
+            'harlem', 'washington heights', 'inwood', 'morningside heights',
+            'chelsea', 'gramercy', 'murray hill', 'hell\'s kitchen',
+        ],
+
+        # Transit/Infrastructure
+        'transit': [
+            'mta', 'subway', 'metro-north', 'lirr', 'port authority',
+            'grand central', 'penn station', 'brooklyn bridge', 'manhattan bridge',
+            'queens-midtown tunnel', 'lincoln tunnel', 'holland tunnel',
+        ],
+
+        # Major venues
+        'venue': [
+            'madison square garden', 'msg', 'yankee stadium', 'citi field',
+            'barclays center', 'lincoln center', 'radio city music hall',
+        ],
+
+        # Tech/Business areas (for HackerNews/tech sources)
+        'business_district': [
+            'silicon alley', 'flatiron district', 'dumbo', 'brooklyn navy yard',
+            'cornell tech', 'hudson yards', 'one world trade',
+        ],
+
+        # Zip codes (major ones)
+        'zip_prefix': [
+            '100', '101', '102', '103', '104',  # Manhattan zip prefixes
+            '112', '113', '114', '116',         # Queens zip prefixes
+            '110', '111', '117',                # Queens zip prefixes
+            '104', '112',                       # Bronx zip prefixes
+            '103',                              # Staten Island zip prefix
+        ],
+    }
+
     def __init__(self, source_name: str):
         """
         Initialize the collector
@@ -161,58 +214,71 @@ class BaseCollector(ABC):
         Check if content is NYC-relevant based on geographic mentions
         Shared across all collectors to ensure consistent NYC relevance criteria
         """
-        full_text = f"{title} {content}".lower()
-
-        # NYC identifiers - standardized across all collectors
-        nyc_identifiers = [
-            # City names
-            'new york', 'nyc', 'new york city',
-
-            # Boroughs
-            'manhattan', 'brooklyn', 'queens', 'bronx', 'staten island',
-
-            # Well-known neighborhoods
-            'midtown', 'downtown', 'uptown', 'lower east side', 'upper west side',
-            'upper east side', 'east village', 'west village', 'greenwich village',
-            'soho', 'tribeca', 'chinatown', 'little italy', 'financial district',
-            'times square', 'central park', 'battery park', 'prospect park',
-            'williamsburg', 'park slope', 'bushwick', 'bed-stuy', 'crown heights',
-            'astoria', 'flushing', 'forest hills', 'long island city', 'lic',
-            'harlem', 'washington heights', 'inwood', 'morningside heights',
-            'chelsea', 'gramercy', 'murray hill', 'hell\'s kitchen',
+        return NYC_IDENTIFIER_MATCHER.contains_any(f"{title} {content}")
 
-            # Transit/Infrastructure
-            'mta', 'subway', 'metro-north', 'lirr', 'port authority',
-            'grand central', 'penn station', 'brooklyn bridge', 'manhattan bridge',
-            'queens-midtown tunnel', 'lincoln tunnel', 'holland tunnel',
+    def _location_query(self, metadata: Dict) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        Pick what to geocode for a signal: its first extracted location (with the
+        primary borough as context), otherwise the borough itself
 
-            # Major venues
-            'madison square garden', 'msg', 'yankee stadium', 'citi field',
-            'barclays center', 'lincoln center', 'radio city music hall',
+        Returns:
+            (location_text, context) or None if the signal has no location information
+        """
+        locations = metadata.get('locations') or []
+        borough = metadata.get('primary_borough')
+
+        if locations:
+            first_location = locations[0]
+            if isinstance(first_location, dict):
+                return first_location.get('name', ''), borough
+            return str(first_location), borough
+        if borough:
+            return borough, None
+        return None
+
+    async def _geocode_signals(self, signals: List[Dict]) -> int:
+        """
+        Batch-geocode signals and fill in their coordinate metadata
+        (latitude, longitude, formatted_address, geocoding_confidence,
+        geocoding_source, has_coordinates)
 
-            # Tech/Business areas (for HackerNews/tech sources)
-            'silicon alley', 'flatiron district', 'dumbo', 'brooklyn navy yard',
-            'cornell tech', 'hudson yards', 'one world trade',
+        Args:
+            signals: Standardized signals whose metadata holds 'locations' / 'primary_borough'
 
-            # Zip codes (major ones)
-            '100', '101', '102', '103', '104',  # Manhattan zip prefixes
-            '112', '113', '114', '116',         # Queens zip prefixes
-            '110', '111', '117',                # Queens zip prefixes
-            '104', '112',                       # Bronx zip prefixes
-            '103',                              # Staten Island zip prefix
-        ]
+        Returns:
+            Number of signals that received coordinates
+        """
+        requests = {}
+        for index, signal in enumerate(signals):
+            location_query = self._location_query(signal.get('metadata', {}))
+            if location_query and location_query[0]:
+                requests[index] = location_query
 
-        for identifier in nyc_identifiers:
-            # For short abbreviations (3 chars or less), require word boundaries
-            if len(identifier) <= 3:
-                if re.search(rf'\b{re.escape(identifier)}\b', full_text, re.IGNORECASE):
-                    return True
-            else:
-                # Regular substring match for longer location names
-                if identifier in full_text:
-                    return True
+        if not requests:
+            return 0
 
-        return False
+        try:
+            results = await geocode_many(requests)
+        except Exception as e:
+            logger.warning(
+                f"Warning: {self.source_name} batch geocoding failed: {e}")
+            return 0
+
+        geocoded = 0
+        for index, result in results.items():
+            metadata = signals[index]['metadata']
+            metadata.update({
+                'latitude': result.get('lat'),
+                'longitude': result.get('lng'),
+                'formatted_address': result.get('formatted_address'),
+                'geocoding_confidence': result.get('confidence', 0.0),
+                'geocoding_source': result.get('source', 'none'),
+                'has_coordinates': result.get('success', False)
+            })
+            if result.get('success'):
+                geocoded += 1
+
+        return geocoded
 
     def _assess_location_specificity(self, title: str, content: str, location_info: Dict) -> Dict:
         """
@@ -222,100 +288,9 @@ class BaseCollector(ABC):
         Returns:
             Dict with specificity assessment including specific streets, venues, etc.
         """
-        full_text = f"{title} {content}".lower()
-
-        specificity_score = 0
-        specific_streets = []
-        named_venues = []
-        cross_streets = []
-
-        # 1. Check for specific street addresses and intersections
-        street_patterns = [
-            # "123 Main Street"
-            r'\b\d+\s+\w+\s+(street|st|avenue|ave|road|rd|boulevard|blvd|place|pl|drive|dr)\b',
-            # "Main St and 5th Ave"
-            r'\b\w+\s+(street|st|avenue|ave)\s+(and|&|at|\+)\s+\w+\s+(street|st|avenue|ave)\b',
-            # "5th Ave between 42nd and 45th"
-            r'\b\w+\s+(street|st|avenue|ave)\s+between\s+\w+\s+and\s+\w+\b',
-            # Major avenues with cross streets
-            r'\b(broadway|5th avenue|madison avenue|park avenue|lexington avenue|third avenue|second avenue|first avenue)\s+(and|at|between)\s+\w+\b',
-        ]
-
-        for pattern in street_patterns:
-            matches = re.findall(pattern, full_text, re.IGNORECASE)
-            if matches:
-                specific_streets.extend([match[0] if isinstance(
-                    match, tuple) else match for match in matches])
-                specificity_score += 3
-
-        # 2. Check for named venues and landmarks
-        venue_patterns = [
-            r'\b(madison square garden|msg|central park|prospect park|brooklyn bridge|manhattan bridge|times square|union square|washington square park)\b',
-            r'\b(yankee stadium|citi field|barclays center|lincoln center|grand central|penn station)\b',
-            r'\b(world trade center|wtc|freedom tower|high line|chelsea market|south street seaport)\b',
-            r'\b(\w+\s+museum|\w+\s+theater|\w+\s+hotel|\w+\s+center|\w+\s+plaza|\w+\s+square)\b',
-        ]
-
-        for pattern in venue_patterns:
-            matches = re.findall(pattern, full_text, re.IGNORECASE)
-            if matches:
-                named_venues.extend(matches)
-                specificity_score += 2
-
-        # 3. Check for cross-street references
-        cross_street_patterns = [
-            # "42nd St and 5th Ave"
-            r'\b(\d+)(st|nd|rd|th)\s+(street|st)\s+(and|&|at)\s+(\w+\s+(avenue|ave))\b',
-            # "Main St and Park Ave"
-            r'\b(\w+\s+(street|st))\s+(and|&|at)\s+(\w+\s+(avenue|ave))\b',
-        ]
-
-        for pattern in cross_street_patterns:
-            matches = re.findall(pattern, full_text, re.IGNORECASE)
-            if matches:
-                cross_streets.extend(
-                    [f"{match[0]}{match[1]} {match[2]} & {match[4]}" for match in matches])
-                specificity_score += 2
-
-        # 4. Check for subway station references with specificity
-        subway_patterns = [
-            r'\b(\w+\s+\w+)\s+station\b',  # "Union Square station"
-            # "42nd St station"
-            r'\b(\d+)(st|nd|rd|th)\s+(st\s+)?(station|subway)\b',
-        ]
-
-        for pattern in subway_patterns:
-            matches = re.findall(pattern, full_text, re.IGNORECASE)
-            if matches:
-                specificity_score += 1
-
-        # 5. Penalty for vague location references
-        vague_patterns = [
-            r'\b(throughout|across|various|multiple|different)\s+(areas|locations|places|neighborhoods)\b',
-            r'\b(all over|around|near|somewhere in)\s+(manhattan|brooklyn|queens|bronx|staten island)\b',
-            # "downtown" without specific area
-            r'\b(downtown|uptown|midtown)\b(?!\s+(manhattan|area))',
-        ]
-
-        for pattern in vague_patterns:
-            if re.search(pattern, full_text, re.IGNORECASE):
-                specificity_score -= 2
-
-        # Determine if location is specific enough
-        is_specific = (
-            specificity_score >= 2 or  # Has street addresses or multiple venue references
-            len(specific_streets) > 0 or  # Has specific street addresses
-            len(cross_streets) > 0 or  # Has intersection references
-            # Has named venues with some specificity
-            (len(named_venues) > 0 and specificity_score >= 1)
-        )
+        return LOCATION_SPECIFICITY_SCANNER.assess(title, content)
 
-        return {
-            'is_specific': is_specific,
-            'specificity_score': specificity_score,
-            'specific_streets': specific_streets,
-            'named_venues': named_venues,
-            'cross_streets': cross_streets,
-            'has_intersections': len(cross_streets) > 0,
-            'has_venues': len(named_venues) > 0
-        }
+
+# Shared NYC relevance matcher, compiled once per process and used by every collector
+NYC_IDENTIFIER_MATCHER = KeywordMatcher(
+    BaseCollector.NYC_IDENTIFIER_CATEGORIES, boundary_max_length=3)
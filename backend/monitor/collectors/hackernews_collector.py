@@ -11,16 +11,25 @@ import logging
 import re
 
 from .base_collector import BaseCollector
+from monitor.utils.hn_item_cache import HNItemCache
 from monitor.utils.location_extractor import NYCLocationExtractor
-from monitor.utils.geocode import geocode_nyc_location
 
 logger = logging.getLogger(__name__)
 
+# Item requests in flight at once against the HackerNews API
+HN_MAX_CONCURRENT_REQUESTS = int(os.getenv('HN_MAX_CONCURRENT_REQUESTS', '16'))
+
 
 class HackerNewsCollector(BaseCollector):
     """HackerNews collector for NYC signals"""
 
-    def __init__(self):
+    def __init__(self, item_cache: Optional[HNItemCache] = None):
+        """
+        Initialize the collector
+
+        Args:
+            item_cache: Item cache shared across cycles (memory-only if not given)
+        """
         super().__init__("hackernews")
 
         # HackerNews API endpoints
@@ -39,6 +48,9 @@ class HackerNewsCollector(BaseCollector):
         # Priority keywords now inherited from BaseCollector.PRIORITY_KEYWORDS
         # No need to redefine here - available as self.priority_keywords
 
+        # Item JSON from earlier cycles (titles and text don't change)
+        self.item_cache = item_cache or HNItemCache()
+
         # Initialize location extractor
         self.location_extractor = NYCLocationExtractor()
         logger.info(
@@ -96,9 +108,9 @@ class HackerNewsCollector(BaseCollector):
 
             # Get recent story IDs from both new and top stories
             async with aiohttp.ClientSession() as session:
-                # Fetch new stories
-                new_story_ids = await self._fetch_story_ids(session, self.new_stories_url, "new")
-                top_story_ids = await self._fetch_story_ids(session, self.top_stories_url, "top")
+                new_story_ids, top_story_ids = await asyncio.gather(
+                    self._fetch_story_ids(session, self.new_stories_url, "new"),
+                    self._fetch_story_ids(session, self.top_stories_url, "top"))
 
                 # Combine and deduplicate story IDs, prioritizing new stories
                 all_story_ids = new_story_ids[:30] + [
@@ -108,10 +120,21 @@ class HackerNewsCollector(BaseCollector):
                 logger.info(
                     f"📡 Checking {len(all_story_ids)} recent HackerNews stories")
 
-                # Fetch and process individual stories
-                for i, story_id in enumerate(all_story_ids):
+                # Fetch all stories concurrently (cached stories that are no
+                # longer in play are not fetched again)
+                await self.item_cache.load(all_story_ids)
+                semaphore = asyncio.Semaphore(HN_MAX_CONCURRENT_REQUESTS)
+                stories = await asyncio.gather(*[
+                    self._fetch_story(session, story_id, semaphore)
+                    for story_id in all_story_ids
+                ])
+                await self.item_cache.save()
+                logger.info(
+                    f"📰 HN item cache: {self.item_cache.get_stats()}")
+
+                # Process individual stories
+                for story_id, story_data in zip(all_story_ids, stories):
                     try:
-                        story_data = await self._fetch_story_details(session, story_id)
                         if not story_data:
                             continue
 
@@ -172,10 +195,6 @@ class HackerNewsCollector(BaseCollector):
                                 logger.info(
                                     f"📍 NYC-RELEVANT HN STORY: {signal['title'][:60]}...")
 
-                        # Rate limiting - small delay between requests
-                        if i % 10 == 9:  # Every 10 requests
-                            await asyncio.sleep(0.5)
-
                     except Exception as e:
                         logger.error(
                             f"❌ Error processing HN story {story_id}: {str(e)}")
@@ -191,6 +210,11 @@ class HackerNewsCollector(BaseCollector):
             # Limit results
             final_signals = all_signals[:self.max_signals_to_return]
 
+            # Geocode the returned signals in one batch (deduplicated, rate limited)
+            geocoded_count = await self._geocode_signals(final_signals)
+            logger.info(
+                f"🗺️ Geocoded {geocoded_count}/{len(final_signals)} HackerNews signals")
+
             # Report monitoring summary
             logger.info(f"📊 HACKERNEWS MONITORING SUMMARY:")
             logger.info(
@@ -238,19 +262,46 @@ class HackerNewsCollector(BaseCollector):
             logger.error(f"❌ Error fetching {story_type} story IDs: {str(e)}")
             return []
 
-    async def _fetch_story_details(self, session: aiohttp.ClientSession, story_id: int) -> Optional[Dict]:
-        """Fetch individual story details from HackerNews API"""
-        try:
-            url = self.item_url.format(story_id)
-            async with session.get(url) as response:
-                if response.status == 200:
-                    story_data = await response.json()
-                    # Only return if it's actually a story (not comment, poll, etc.)
-                    if story_data and story_data.get('type') == 'story':
-                        return story_data
+    async def _fetch_story(self, session: aiohttp.ClientSession, story_id: int,
+                           semaphore: asyncio.Semaphore) -> Optional[Dict]:
+        """
+        Fetch a story, skipping the request for cached stories no longer in play
+
+        Cached stories are checked for recency and NYC relevance on their cached
+        text; only those still in play are fetched again (one item request) for
+        their current score and comment count.
+
+        Returns:
+            Story JSON, or None if the item is missing or not a story
+        """
+        story_data = self.item_cache.get(story_id)
+        if story_data is None or (
+                story_data.get('type') == 'story' and self._is_recent_story(story_data)
+                and self._is_hackernews_nyc_relevant(story_data.get('title', ''), story_data.get('text', ''))):
+            fetched = await self._fetch_json(
+                session, self.item_url.format(story_id), semaphore)
+            if fetched:
+                story_data = fetched
+                self.item_cache.put(story_id, story_data)
+            if not story_data:
                 return None
+
+        # Only return if it's actually a story (not comment, poll, etc.)
+        if story_data.get('type') == 'story':
+            return story_data
+        return None
+
+    async def _fetch_json(self, session: aiohttp.ClientSession, url: str,
+                          semaphore: asyncio.Semaphore):
+        """Fetch a JSON document from the HackerNews API, None on failure"""
+        try:
+            async with semaphore:
+                async with session.get(url) as response:
+                    if response.status == 200:
+                        return await response.json()
+                    return None
         except Exception as e:
-            logger.debug(f"Error fetching story {story_id}: {str(e)}")
+            logger.debug(f"Error fetching {url}: {str(e)}")
             return None
 
     def _is_recent_story(self, story_data: Dict) -> bool:
@@ -295,8 +346,8 @@ class HackerNewsCollector(BaseCollector):
             location_info = self.location_extractor.extract_location_info(
                 title, content)
 
-            # Get coordinates using geocoding service
-            geocoding_result = await self._geocode_location_info(location_info, title, content)
+            # Coordinates are filled in by the batched geocoding stage in collect_signals
+            geocoding_result = self._empty_geocoding_result()
 
             # Assess location specificity
             location_specificity = self._assess_location_specificity(
@@ -369,37 +420,6 @@ class HackerNewsCollector(BaseCollector):
             logger.error(f"   Story ID: {story_data.get('id', 'unknown')}")
             return None
 
-    async def _geocode_location_info(self, location_info: Dict, title: str, content: str) -> Dict:
-        """
-        Geocode location information to get real coordinates
-        (Same logic as Reddit collector)
-        """
-        try:
-            locations = location_info['locations_found']
-            borough = location_info.get('primary_borough')
-
-            if locations:
-                # Extract the location name string from the first location dict
-                first_location = locations[0]
-                if isinstance(first_location, dict):
-                    location_text = first_location.get('name', '')
-                else:
-                    location_text = str(first_location)
-
-                logger.debug(
-                    f"Geocoding location: '{location_text}' with borough: '{borough}'")
-                geocoding_result = await geocode_nyc_location(location_text, borough)
-            elif borough:
-                logger.debug(f"Geocoding borough: '{borough}'")
-                geocoding_result = await geocode_nyc_location(borough)
-            else:
-                return self._empty_geocoding_result()
-
-            return geocoding_result
-        except Exception as e:
-            logger.warning(f"Warning: Failed to geocode HN location: {e}")
-            return self._empty_geocoding_result()
-
     def _empty_geocoding_result(self) -> Dict:
         """Return empty geocoding result"""
         return {
@@ -1,27 +1,97 @@
 """
 NYC 311 Service Requests collector for NYC monitor system.
-Collects raw 311 data for triage analysis.
+Collects raw 311 data, plus aggregated volume spike and geographic cluster signals, for triage analysis.
 """
+import asyncio
 import os
-import requests
 import json
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import logging
-from collections import defaultdict
+
+import aiohttp
 
 from .base_collector import BaseCollector
 from ..types.alert_categories import categorize_311_complaint, get_alert_type_info
 
 logger = logging.getLogger(__name__)
 
+# Query families collected incrementally, each with its own high-watermark checkpoint
+QUERY_FAMILIES = ('emergency', 'event', 'volume', 'geographic')
+
+# Window used when a family has no checkpoint yet (API data can lag by a day)
+DEFAULT_LOOKBACK = timedelta(days=2)
+# Re-read this much before a checkpoint to pick up late-arriving and updated rows
+CHECKPOINT_OVERLAP = timedelta(
+    minutes=int(os.getenv('NYC311_CHECKPOINT_OVERLAP_MINUTES', '60')))
+# Never reach further back than this, however old a checkpoint is
+MAX_LOOKBACK = timedelta(days=int(os.getenv('NYC311_MAX_LOOKBACK_DAYS', '7')))
+# Pages of $limit rows fetched per query before the window is truncated
+MAX_PAGES_PER_QUERY = int(os.getenv('NYC311_MAX_PAGES', '5'))
+
+# SODA client: shared connection pool, concurrency cap and retry policy
+SODA_MAX_CONNECTIONS = int(os.getenv('NYC311_MAX_CONNECTIONS', '8'))
+SODA_MAX_CONCURRENT_REQUESTS = int(os.getenv('NYC311_MAX_CONCURRENT_REQUESTS', '4'))
+SODA_MAX_RETRIES = int(os.getenv('NYC311_MAX_RETRIES', '3'))
+SODA_RETRY_BASE_SECONDS = 1.0
+SODA_REQUEST_TIMEOUT_SECONDS = 30
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+# Spike/cluster detection: hourly request counts are aggregated by Socrata
+# ($group) and compared with each group's rolling baseline for that hour of the week
+AGGREGATE_FAMILIES = {
+    'volume': ('complaint_type',),                    # citywide spikes
+    'geographic': ('complaint_type', 'incident_zip'),  # local clusters
+}
+BASELINE_DAYS = int(os.getenv('NYC311_BASELINE_DAYS', '28'))
+BASELINE_REFRESH = timedelta(
+    hours=int(os.getenv('NYC311_BASELINE_REFRESH_HOURS', '24')))
+# (group, hour of week) slots rarer than this over the baseline window share the floor rate
+BASELINE_MIN_TOTAL = 4
+# Pages of aggregated baseline rows fetched before the baseline is truncated
+BASELINE_PAGE_SIZE = 5000
+BASELINE_MAX_PAGES = int(os.getenv('NYC311_BASELINE_MAX_PAGES', '20'))
+MIN_CLUSTER_SIZE = int(os.getenv('NYC311_MIN_CLUSTER_SIZE', '5'))
+SPIKE_RATIO = float(os.getenv('NYC311_SPIKE_RATIO', '3.0'))
+MAX_CLUSTER_SIGNALS = int(os.getenv('NYC311_MAX_CLUSTER_SIGNALS', '25'))
+MAX_CLUSTER_MEMBERS = 50
+
+
+def _hour_of_week(timestamp: str) -> str:
+    """'day of week|hour' slot of a SoQL timestamp, day of week counted from Sunday = 0"""
+    moment = datetime.fromisoformat(timestamp[:19])
+    return f"{(moment.weekday() + 1) % 7}|{moment.hour}"
+
 
 class NYC311Collector(BaseCollector):
     """NYC 311 Service Requests collector"""
 
-    def __init__(self):
+    def __init__(self, checkpoints: Optional[Dict[str, Dict]] = None,
+                 baselines: Optional[Dict[str, Dict]] = None):
+        """
+        Initialize the collector
+
+        Args:
+            checkpoints: Per query family high-watermarks from a previous run,
+                family -> {'created_date', 'unique_key', 'updated_at'}
+            baselines: Stored spike baselines, family -> {'computed_at', 'weeks', 'rates'}
+        """
         super().__init__("nyc_311")
 
+        # Committed checkpoints (where this run starts) and the ones this run reached
+        self.checkpoints: Dict[str, Dict] = dict(checkpoints or {})
+        self.pending_checkpoints: Dict[str, Dict] = {}
+        # Last row read by a truncated window, per family: the checkpoint stops there
+        self.checkpoint_ceilings: Dict[str, Dict] = {}
+
+        # Rolling hour-of-week baselines for spike detection; refreshed when stale
+        self.baselines: Dict[str, Dict] = dict(baselines or {})
+        self.baselines_refreshed = False
+
+        # HTTP session and request cap, live only while a collection is running
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._request_semaphore: Optional[asyncio.Semaphore] = None
+
         # NYC Open Data 311 API endpoint
         self.base_url = "https://data.cityofnewyork.us/resource/erm2-nwe9.json"
 
@@ -99,24 +169,30 @@ class NYC311Collector(BaseCollector):
                 'total_requests': 0,
                 'emergency_requests': 0,
                 'event_requests': 0,
-                'high_volume_areas': 0,
+                'high_volume_areas': 0,  # spike/cluster signals
                 'complaint_types_found': set(),
                 'agencies_involved': set(),
                 'boroughs_active': set()
             }
 
-            # Calculate time window (last 2 days to account for API delays)
+            # Each query family resumes from its own checkpoint (minus a small
+            # overlap), or covers the last 2 days when it has none
             now = datetime.utcnow()
-            since = now - timedelta(days=2)
-            since_str = since.strftime('%Y-%m-%dT%H:%M:%S.000')
-
-            logger.info(
-                f"📅 Collecting 311 requests since: {since_str} (last 2 days)")
+            since_times = {family: self._window_start(family, now)
+                           for family in QUERY_FAMILIES}
+            self.pending_checkpoints = {}
+            self.checkpoint_ceilings = {}
+            self.baselines_refreshed = False
+
+            for family, since_str in since_times.items():
+                source = 'checkpoint' if family in self.checkpoints else 'default window'
+                logger.info(
+                    f"📅 Collecting {family} 311 requests since: {since_str} ({source})")
             logger.info(
                 f"🕐 Current time: {now.strftime('%Y-%m-%dT%H:%M:%S.000')}")
 
             # Collect different types of 311 signals
-            signals_collected = await self._collect_priority_signals(since_str, collection_stats)
+            signals_collected = await self._collect_priority_signals(since_times, collection_stats)
             all_signals.extend(signals_collected)
 
             # Report collection summary
@@ -127,6 +203,8 @@ class NYC311Collector(BaseCollector):
                 f"   Emergency requests: {collection_stats['emergency_requests']}")
             logger.info(
                 f"   Event requests: {collection_stats['event_requests']}")
+            logger.info(
+                f"   Spike/cluster signals: {collection_stats['high_volume_areas']}")
             logger.info(
                 f"   Boroughs active: {len(collection_stats['boroughs_active'])}")
             logger.info(
@@ -148,31 +226,228 @@ class NYC311Collector(BaseCollector):
             logger.error(
                 f"❌ FATAL ERROR in NYC 311 signal collection: {str(e)}")
             logger.error(f"   Exception type: {type(e).__name__}")
+            self.pending_checkpoints = {}
             return []
 
-    async def _collect_priority_signals(self, since_time: str, stats: Dict) -> List[Dict]:
-        """Collect priority 311 signals: emergency, events, and volume spikes"""
-        all_signals = []
+    async def _collect_priority_signals(self, since_times: Dict[str, str], stats: Dict) -> List[Dict]:
+        """
+        Collect priority 311 signals: emergency, events, and volume spikes
+
+        All query families are fetched concurrently over one connection pool,
+        then merged so a request returned by several families becomes one signal.
+        """
+        connector = aiohttp.TCPConnector(limit=SODA_MAX_CONNECTIONS)
+        timeout = aiohttp.ClientTimeout(total=SODA_REQUEST_TIMEOUT_SECONDS)
+        self._request_semaphore = asyncio.Semaphore(SODA_MAX_CONCURRENT_REQUESTS)
+
+        async with aiohttp.ClientSession(connector=connector, headers=self.headers, timeout=timeout) as session:
+            self._session = session
+            try:
+                emergency_rows, event_rows, volume_signals, cluster_signals = await asyncio.gather(
+                    # 1. Emergency-related requests
+                    self._fetch_emergency_requests(since_times['emergency']),
+                    # 2. Event-related requests
+                    self._fetch_event_requests(since_times['event']),
+                    # 3. Citywide volume spikes (potential incidents)
+                    self._fetch_high_volume_requests(since_times['volume'], stats),
+                    # 4. Geographic clusters (same complaint type in same area)
+                    self._fetch_geographic_clusters(since_times['geographic'], stats))
+            finally:
+                self._session = None
+
+        signals = await self._merge_family_rows(
+            {'emergency': emergency_rows, 'event': event_rows}, stats)
+        return signals + volume_signals + cluster_signals
+
+    async def _merge_family_rows(self, family_rows: Dict[str, List[Dict]], stats: Dict) -> List[Dict]:
+        """
+        Convert fetched rows to signals, once per unique_key
+
+        A request found by several query families is categorized by the first
+        family in QUERY_FAMILIES order and lists every family in
+        metadata['query_families'].
+
+        Args:
+            family_rows: Raw rows by query family
+            stats: Collection statistics to update
+
+        Returns:
+            List of standardized signals
+        """
+        merged: Dict[str, Dict] = {}
+        for family in QUERY_FAMILIES:
+            for request in family_rows.get(family) or []:
+                request_key = request.get('unique_key')
+                if not request_key:
+                    continue
+                entry = merged.get(request_key)
+                if entry is None:
+                    merged[request_key] = {'request': request, 'families': [family]}
+                elif family not in entry['families']:
+                    entry['families'].append(family)
+
+        repeated = sum(1 for entry in merged.values() if len(entry['families']) > 1)
+        logger.info(
+            f"🔗 Merged {sum(len(rows) for rows in family_rows.values())} rows into "
+            f"{len(merged)} unique 311 requests ({repeated} found by several query families)")
+
+        signals = []
+        for entry in merged.values():
+            signal_category = entry['families'][0]
+            signal = await self._request_to_signal(entry['request'], signal_category, stats)
+            if not signal:
+                continue
+            signal['metadata']['query_families'] = entry['families']
+            signals.append(signal)
+            if signal_category == 'emergency':
+                stats['emergency_requests'] += 1
+            elif signal_category == 'event':
+                stats['event_requests'] += 1
+
+        return signals
+
+    def _window_start(self, family: str, now: datetime) -> str:
+        """Start of a query family's collection window, as a SoQL timestamp"""
+        since = now - DEFAULT_LOOKBACK
+        checkpoint_date = self.checkpoints.get(family, {}).get('created_date')
+        if checkpoint_date:
+            try:
+                since = max(datetime.fromisoformat(checkpoint_date) - CHECKPOINT_OVERLAP,
+                            now - MAX_LOOKBACK)
+            except ValueError:
+                logger.warning(
+                    f"⚠️ Ignoring unreadable {family} checkpoint: {checkpoint_date}")
+        return since.strftime('%Y-%m-%dT%H:%M:%S.000')
+
+    async def _fetch_window(self, family: str, params: Dict) -> Tuple[List[Dict], bool]:
+        """
+        Fetch every row of a query window, paging with $offset past $limit
+
+        Windows are read oldest first, so when MAX_PAGES_PER_QUERY is reached
+        the family's checkpoint can stop at the last row read and the next run
+        picks up the rest. The caller advances the checkpoint once every query
+        of the family has succeeded.
+
+        Args:
+            family: Query family the window belongs to (for logging)
+            params: SoQL parameters; $limit is the page size and $order must be
+                total and ascending ('created_date,unique_key') so pages don't
+                overlap
+
+        Returns:
+            (rows of the window oldest first, whether the window was truncated)
+        """
+        rows, truncated = await self._fetch_pages(params)
+        if truncated:
+            logger.warning(
+                f"⚠️ {family} 311 window truncated at {len(rows)} rows ({MAX_PAGES_PER_QUERY} pages), "
+                f"the next run resumes after the last row read")
+        return rows, truncated
+
+    async def _fetch_pages(self, params: Dict, max_pages: int = MAX_PAGES_PER_QUERY) -> Tuple[List[Dict], bool]:
+        """
+        Fetch up to max_pages pages of a query, paging with $offset past $limit
+
+        Args:
+            params: SoQL parameters; $limit is the page size and $order must be total
+            max_pages: Pages fetched before giving up
 
-        # 1. Emergency-related requests
-        emergency_signals = await self._fetch_emergency_requests(since_time, stats)
-        all_signals.extend(emergency_signals)
+        Returns:
+            (rows, whether more rows were left unread)
+        """
+        page_size = params['$limit']
+        rows = []
+        for page in range(max_pages):
+            page_rows = await self._get_json({**params, '$offset': page * page_size})
+            rows.extend(page_rows)
+            if len(page_rows) < page_size:
+                return rows, False
+        return rows, True
+
+    async def _get_json(self, params: Dict) -> List[Dict]:
+        """
+        GET one SODA page, retrying 429 and 5xx responses with backoff
 
-        # 2. Event-related requests
-        event_signals = await self._fetch_event_requests(since_time, stats)
-        all_signals.extend(event_signals)
+        At most SODA_MAX_CONCURRENT_REQUESTS requests are in flight at once;
+        a Retry-After header is honored when present.
+        """
+        params = {key: str(value) for key, value in params.items()}
 
-        # 3. High-volume general requests (potential incidents)
-        volume_signals = await self._fetch_high_volume_requests(since_time, stats)
-        all_signals.extend(volume_signals)
+        for attempt in range(SODA_MAX_RETRIES + 1):
+            delay = SODA_RETRY_BASE_SECONDS * (2 ** attempt)
+            try:
+                async with self._request_semaphore:
+                    async with self._session.get(self.base_url, params=params) as response:
+                        if response.status in RETRYABLE_STATUSES and attempt < SODA_MAX_RETRIES:
+                            retry_after = response.headers.get('Retry-After', '')
+                            if retry_after.isdigit():
+                                delay = float(retry_after)
+                            logger.warning(
+                                f"⚠️ NYC 311 API returned {response.status}, retrying in {delay:.1f}s")
+                        else:
+                            response.raise_for_status()
+                            return await response.json(content_type=None)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt == SODA_MAX_RETRIES:
+                    raise
+                logger.warning(
+                    f"⚠️ NYC 311 API request failed ({type(e).__name__}), retrying in {delay:.1f}s")
 
-        # 4. Geographic clusters (same complaint type in same area)
-        cluster_signals = await self._fetch_geographic_clusters(since_time, stats)
-        all_signals.extend(cluster_signals)
+            # Back off outside the semaphore so other queries keep going
+            await asyncio.sleep(delay)
 
-        return all_signals
+    def _advance_checkpoint(self, family: str, rows: List[Dict], truncated: bool = False):
+        """
+        Move a family's pending high-watermark to the newest row seen
 
-    async def _fetch_emergency_requests(self, since_time: str, stats: Dict) -> List[Dict]:
+        A truncated window caps the family's checkpoint at its last row, even
+        if another query of the family read further, so the rows it did not
+        reach are read by the next run.
+        """
+        dated_rows = [row for row in rows if row.get('created_date')]
+        if not dated_rows:
+            return
+
+        def position(checkpoint: Dict):
+            return checkpoint.get('created_date', ''), checkpoint.get('unique_key', '')
+
+        newest = max(dated_rows, key=position)
+        if truncated:
+            ceiling = self.checkpoint_ceilings.get(family)
+            if ceiling is None or position(newest) < position(ceiling):
+                self.checkpoint_ceilings[family] = newest
+
+        current = self.pending_checkpoints.get(family) or self.checkpoints.get(family) or {}
+        reached = max(newest, current, key=position) if current else newest
+        ceiling = self.checkpoint_ceilings.get(family)
+        if ceiling is not None and position(reached) > position(ceiling):
+            reached = ceiling
+        if reached is not current:
+            self.pending_checkpoints[family] = {
+                'created_date': reached['created_date'],
+                'unique_key': reached.get('unique_key', ''),
+                'updated_at': datetime.utcnow().isoformat()
+            }
+
+    def _discard_checkpoint(self, family: str):
+        """Forget a failed family's pending checkpoint so the next run re-reads its window"""
+        if self.pending_checkpoints.pop(family, None) is not None:
+            logger.warning(
+                f"⚠️ {family} 311 checkpoint not advanced, the next run re-reads its window")
+
+    def commit_checkpoints(self) -> Dict[str, Dict]:
+        """
+        Adopt the checkpoints reached by the last collection. Call once its
+        signals are safely stored, then persist the returned checkpoints.
+
+        Returns:
+            Checkpoints for every query family seen so far
+        """
+        self.checkpoints.update(self.pending_checkpoints)
+        self.pending_checkpoints = {}
+        return dict(self.checkpoints)
+
+    async def _fetch_emergency_requests(self, since_time: str) -> List[Dict]:
         """Fetch emergency-related 311 requests"""
         logger.info("🚨 Fetching emergency-related 311 requests")
 
@@ -185,17 +460,9 @@ class NYC311Collector(BaseCollector):
                 '$where': f"created_date >= '{since_time}' AND ({emergency_filter})",
                 '$select': 'unique_key,created_date,complaint_type,descriptor,borough,latitude,longitude,incident_zip,agency,agency_name,status,due_date',
                 '$limit': 500,
-                '$order': 'created_date DESC'
+                '$order': 'created_date,unique_key'
             }
 
-            response = requests.get(
-                self.base_url, params=params, headers=self.headers, timeout=30)
-            response.raise_for_status()
-
-            emergency_data = response.json()
-            logger.info(
-                f"📞 Found {len(emergency_data)} emergency-type 311 requests")
-
             # Also search for emergency keywords in descriptions
             keyword_filter = " OR ".join(
                 [f"descriptor LIKE '%{kw}%'" for kw in self.emergency_keywords])
@@ -204,46 +471,29 @@ class NYC311Collector(BaseCollector):
                 '$where': f"created_date >= '{since_time}' AND ({keyword_filter})",
                 '$select': 'unique_key,created_date,complaint_type,descriptor,borough,latitude,longitude,incident_zip,agency,agency_name,status,due_date',
                 '$limit': 300,
-                '$order': 'created_date DESC'
+                '$order': 'created_date,unique_key'
             }
 
-            response_desc = requests.get(
-                self.base_url, params=params_desc, headers=self.headers, timeout=30)
-            response_desc.raise_for_status()
-
-            keyword_data = response_desc.json()
+            (emergency_data, emergency_truncated), (keyword_data, keyword_truncated) = await asyncio.gather(
+                self._fetch_window('emergency', params),
+                self._fetch_window('emergency', params_desc))
+            # Only once both queries succeeded, so a failure can't skip either window
+            self._advance_checkpoint('emergency', emergency_data, emergency_truncated)
+            self._advance_checkpoint('emergency', keyword_data, keyword_truncated)
             logger.info(
-                f"🔍 Found {len(keyword_data)} requests with emergency keywords")
-
-            # Combine and deduplicate
-            all_emergency = emergency_data + keyword_data
-            seen_ids = set()
-            unique_emergency = []
-
-            for request in all_emergency:
-                request_id = request.get('unique_key')
-                if request_id and request_id not in seen_ids:
-                    seen_ids.add(request_id)
-                    unique_emergency.append(request)
-
+                f"📞 Found {len(emergency_data)} emergency-type 311 requests")
             logger.info(
-                f"✅ Collected {len(unique_emergency)} unique emergency 311 requests")
-
-            # Convert to standardized signals
-            signals = []
-            for request in unique_emergency:
-                signal = await self._request_to_signal(request, 'emergency', stats)
-                if signal:
-                    signals.append(signal)
-                    stats['emergency_requests'] += 1
+                f"🔍 Found {len(keyword_data)} requests with emergency keywords")
 
-            return signals
+            # Duplicates between the two queries are merged with the other families
+            return emergency_data + keyword_data
 
         except Exception as e:
             logger.error(f"❌ Error fetching emergency 311 requests: {e}")
+            self._discard_checkpoint('emergency')
             return []
 
-    async def _fetch_event_requests(self, since_time: str, stats: Dict) -> List[Dict]:
+    async def _fetch_event_requests(self, since_time: str) -> List[Dict]:
         """Fetch event-related 311 requests"""
         logger.info("🎉 Fetching event-related 311 requests")
 
@@ -256,95 +506,276 @@ class NYC311Collector(BaseCollector):
                 '$where': f"created_date >= '{since_time}' AND ({event_filter})",
                 '$select': 'unique_key,created_date,complaint_type,descriptor,borough,latitude,longitude,incident_zip,agency,agency_name,status,due_date',
                 '$limit': 200,
-                '$order': 'created_date DESC'
+                '$order': 'created_date,unique_key'
             }
 
-            response = requests.get(
-                self.base_url, params=params, headers=self.headers, timeout=30)
-            response.raise_for_status()
-
-            event_data = response.json()
+            event_data, truncated = await self._fetch_window('event', params)
+            self._advance_checkpoint('event', event_data, truncated)
             logger.info(
                 f"🎭 Found {len(event_data)} event-related 311 requests")
-
-            # Convert to standardized signals
-            signals = []
-            for request in event_data:
-                signal = await self._request_to_signal(request, 'event', stats)
-                if signal:
-                    signals.append(signal)
-                    stats['event_requests'] += 1
-
-            return signals
+            return event_data
 
         except Exception as e:
             logger.error(f"❌ Error fetching event 311 requests: {e}")
+            self._discard_checkpoint('event')
             return []
 
     async def _fetch_high_volume_requests(self, since_time: str, stats: Dict) -> List[Dict]:
-        """Fetch general requests to detect volume spikes"""
-        logger.info("📈 Fetching general 311 requests for volume analysis")
+        """Detect citywide hourly volume spikes per complaint type"""
+        logger.info("📈 Aggregating 311 request volume for spike detection")
+        return await self._detect_spikes('volume', since_time, stats)
 
+    async def _fetch_geographic_clusters(self, since_time: str, stats: Dict) -> List[Dict]:
+        """Detect hourly clusters of one complaint type in one ZIP code"""
+        logger.info("🗺️ Aggregating 311 requests by area for cluster analysis")
+        return await self._detect_spikes('geographic', since_time, stats)
+
+    async def _detect_spikes(self, family: str, since_time: str, stats: Dict) -> List[Dict]:
+        """
+        Find anomalous hourly groups and turn each into one cluster signal
+
+        Socrata counts requests per (AGGREGATE_FAMILIES[family] x hour) since
+        the window start, oldest hour first. A group is anomalous when its
+        count reaches both MIN_CLUSTER_SIZE and SPIKE_RATIO times its baseline
+        rate for the same hour of the week (Monday 9am is compared with earlier
+        Mondays at 9am, not with the average hour).
+
+        Args:
+            family: 'volume' or 'geographic'
+            since_time: Window start (SoQL timestamp)
+            stats: Collection statistics to update
+
+        Returns:
+            Cluster signals, strongest spikes first
+        """
+        dimensions = AGGREGATE_FAMILIES[family]
         try:
+            baseline = await self._get_baseline(family)
+
             params = {
-                '$where': f"created_date >= '{since_time}'",
-                '$select': 'unique_key,created_date,complaint_type,descriptor,borough,latitude,longitude,incident_zip,agency,agency_name,status',
-                '$limit': 300,
-                '$order': 'created_date DESC'
+                '$select': f"{', '.join(dimensions)}, date_trunc_ymdh(created_date) AS hour, count(*) AS requests",
+                '$where': f"created_date >= '{since_time}'" + ''.join(
+                    f" AND {dimension} IS NOT NULL" for dimension in dimensions),
+                '$group': f"{', '.join(dimensions)}, hour",
+                '$having': f"count(*) >= {MIN_CLUSTER_SIZE}",
+                '$order': f"hour, {', '.join(dimensions)}",
+                '$limit': 1000
             }
-
-            response = requests.get(
-                self.base_url, params=params, headers=self.headers, timeout=30)
-            response.raise_for_status()
-
-            volume_data = response.json()
+            groups, truncated = await self._fetch_pages(params)
+            if truncated:
+                logger.warning(
+                    f"⚠️ {family} 311 aggregation truncated at {len(groups)} groups "
+                    f"({MAX_PAGES_PER_QUERY} pages), the next run resumes after the last hour read")
+
+            floor_rate = BASELINE_MIN_TOTAL / baseline['weeks']
+            anomalies = []
+            for group in groups:
+                if not group.get('hour'):
+                    continue
+                slot = f"{self._group_key(group, dimensions)}|{_hour_of_week(group['hour'])}"
+                count = int(group.get('requests', 0))
+                expected = max(baseline['rates'].get(slot, 0.0), floor_rate)
+                if count >= max(MIN_CLUSTER_SIZE, SPIKE_RATIO * expected):
+                    anomalies.append({**group, 'requests': count, 'expected': expected,
+                                      'ratio': count / expected})
+
+            anomalies.sort(key=lambda anomaly: anomaly['ratio'], reverse=True)
+            anomalies = anomalies[:MAX_CLUSTER_SIGNALS]
             logger.info(
-                f"📊 Found {len(volume_data)} recent 311 requests for volume analysis")
+                f"📊 {family}: {len(groups)} busy hourly groups, {len(anomalies)} above baseline")
+
+            members = await self._fetch_cluster_members(dimensions, anomalies) if anomalies else {}
 
-            # Convert to standardized signals
             signals = []
-            for request in volume_data:
-                signal = await self._request_to_signal(request, 'volume', stats)
+            for anomaly in anomalies:
+                anomaly_members = members.get(
+                    (self._group_key(anomaly, dimensions), anomaly['hour'][:13]), [])
+                signal = self._cluster_to_signal(family, anomaly, anomaly_members, dimensions)
                 if signal:
                     signals.append(signal)
+                    stats['high_volume_areas'] += 1
 
+            self._advance_checkpoint(
+                family, [{'created_date': group['hour']} for group in groups if group.get('hour')],
+                truncated)
             return signals
 
         except Exception as e:
-            logger.error(f"❌ Error fetching volume 311 requests: {e}")
+            logger.error(f"❌ Error detecting {family} 311 spikes: {e}")
+            self._discard_checkpoint(family)
             return []
 
-    async def _fetch_geographic_clusters(self, since_time: str, stats: Dict) -> List[Dict]:
-        """Fetch requests with coordinates for geographic cluster analysis"""
-        logger.info("🗺️ Fetching geolocated 311 requests for cluster analysis")
+    @staticmethod
+    def _group_key(row: Dict, dimensions) -> str:
+        return '|'.join(str(row.get(dimension, '')).upper() for dimension in dimensions)
 
-        try:
+    async def _get_baseline(self, family: str) -> Dict:
+        """
+        Return the family's hour-of-week baseline rates, recomputing them with
+        a Socrata aggregation over the last BASELINE_DAYS when missing or stale
+
+        Rates are keyed 'group key|day of week|hour' (day of week counted from
+        Sunday = 0, like date_extract_dow) and hold the mean number of requests
+        in that hour of the week.
+        """
+        baseline = self.baselines.get(family)
+        # Baselines stored before they were kept per hour of the week have no 'weeks'
+        if baseline and 'weeks' in baseline:
+            try:
+                if datetime.utcnow() - datetime.fromisoformat(baseline['computed_at']) < BASELINE_REFRESH:
+                    return baseline
+            except (KeyError, ValueError):
+                pass
+
+        dimensions = AGGREGATE_FAMILIES[family]
+        end = datetime.utcnow() - timedelta(days=1)
+        start = end - timedelta(days=BASELINE_DAYS)
+        params = {
+            '$select': (f"{', '.join(dimensions)}, date_extract_dow(created_date) AS dow, "
+                        f"date_extract_hh(created_date) AS hh, count(*) AS requests"),
+            '$where': (f"created_date >= '{start.strftime('%Y-%m-%dT%H:%M:%S.000')}' AND "
+                       f"created_date < '{end.strftime('%Y-%m-%dT%H:%M:%S.000')}'"),
+            '$group': f"{', '.join(dimensions)}, dow, hh",
+            '$having': f"count(*) >= {BASELINE_MIN_TOTAL}",
+            '$order': f"{', '.join(dimensions)}, dow, hh",
+            '$limit': BASELINE_PAGE_SIZE
+        }
+        rows, truncated = await self._fetch_pages(params, BASELINE_MAX_PAGES)
+        if truncated:
+            logger.warning(
+                f"⚠️ {family} 311 baseline truncated at {len(rows)} slots ({BASELINE_MAX_PAGES} pages)")
+
+        weeks = BASELINE_DAYS / 7
+        baseline = {
+            'computed_at': datetime.utcnow().isoformat(),
+            'weeks': weeks,
+            'rates': {f"{self._group_key(row, dimensions)}|{int(float(row['dow']))}|{int(float(row['hh']))}":
+                      int(row.get('requests', 0)) / weeks
+                      for row in rows if row.get('dow') is not None and row.get('hh') is not None}
+        }
+        self.baselines[family] = baseline
+        self.baselines_refreshed = True
+        logger.info(
+            f"📐 Refreshed {family} 311 baseline: {len(baseline['rates'])} hour-of-week slots "
+            f"over {BASELINE_DAYS} days")
+        return baseline
+
+    async def _fetch_cluster_members(self, dimensions, anomalies: List[Dict]) -> Dict:
+        """
+        Fetch the newest requests behind each anomalous group, one query per
+        group so every cluster gets up to MAX_CLUSTER_MEMBERS members
+
+        Returns:
+            (group key, hour prefix 'YYYY-MM-DDTHH') -> member rows
+        """
+        async def fetch(anomaly: Dict) -> List[Dict]:
+            hour_start = datetime.fromisoformat(anomaly['hour'][:19])
+            hour_end = hour_start + timedelta(hours=1)
+            matches = ' AND '.join(
+                f"{dimension}='{str(anomaly[dimension]).replace(chr(39), chr(39) * 2)}'"
+                for dimension in dimensions)
             params = {
-                '$where': f"created_date >= '{since_time}' AND latitude IS NOT NULL AND longitude IS NOT NULL",
-                '$select': 'unique_key,created_date,complaint_type,descriptor,borough,latitude,longitude,incident_zip,community_board,agency,agency_name',
-                '$limit': 400,
-                '$order': 'created_date DESC'
+                '$select': 'unique_key,created_date,complaint_type,descriptor,borough,latitude,longitude,incident_zip,agency,agency_name,status',
+                '$where': (f"{matches} AND created_date >= '{hour_start.strftime('%Y-%m-%dT%H:%M:%S.000')}' "
+                           f"AND created_date < '{hour_end.strftime('%Y-%m-%dT%H:%M:%S.000')}'"),
+                '$order': 'created_date DESC,unique_key',
+                '$limit': MAX_CLUSTER_MEMBERS
             }
+            try:
+                return await self._get_json(params)
+            except Exception as e:
+                logger.warning(
+                    f"⚠️ Could not fetch 311 cluster members for {self._group_key(anomaly, dimensions)}: {e}")
+                return []
 
-            response = requests.get(
-                self.base_url, params=params, headers=self.headers, timeout=30)
-            response.raise_for_status()
+        rows = await asyncio.gather(*[fetch(anomaly) for anomaly in anomalies])
+        return {(self._group_key(anomaly, dimensions), anomaly['hour'][:13]): anomaly_rows
+                for anomaly, anomaly_rows in zip(anomalies, rows)}
 
-            geo_data = response.json()
-            logger.info(f"📍 Found {len(geo_data)} geolocated 311 requests")
+    def _cluster_to_signal(self, family: str, anomaly: Dict, members: List[Dict], dimensions) -> Optional[Dict]:
+        """Build one compact signal describing a spike and its member requests"""
+        try:
+            complaint_type = anomaly.get('complaint_type', 'Unknown')
+            incident_zip = anomaly.get('incident_zip', '')
+            count = anomaly['requests']
+            hour = anomaly['hour'][:13]
+
+            def most_common(field: str, default: str = '') -> str:
+                values = [member.get(field) for member in members if member.get(field)]
+                return max(set(values), key=values.count) if values else default
+
+            borough = most_common('borough', 'Unknown')
+            descriptor = most_common('descriptor')
+            agency = most_common('agency', 'Unknown')
+            agency_name = most_common('agency_name', agency)
+            coordinates = [(float(member['latitude']), float(member['longitude']))
+                           for member in members if member.get('latitude') and member.get('longitude')]
+            latitude = sum(lat for lat, _ in coordinates) / len(coordinates) if coordinates else None
+            longitude = sum(lng for _, lng in coordinates) / len(coordinates) if coordinates else None
 
-            # Convert to standardized signals
-            signals = []
-            for request in geo_data:
-                signal = await self._request_to_signal(request, 'geographic', stats)
-                if signal:
-                    signals.append(signal)
+            try:
+                created_at = datetime.fromisoformat(anomaly['hour'][:19])
+            except ValueError:
+                created_at = datetime.utcnow()
 
-            return signals
+            alert_type_info = get_alert_type_info(categorize_311_complaint(complaint_type))
+            is_emergency = complaint_type in self.emergency_complaint_types
+            area = f"ZIP {incident_zip}" if incident_zip else 'NYC'
+            ratio = anomaly['ratio']
+            # Open data record of the newest member request (members are newest first)
+            first_key = members[0].get('unique_key') if members else None
+            first_member_url = (f"{self.base_url}?unique_key={first_key}" if first_key
+                                else "https://portal.311.nyc.gov/article/?kanumber=KA-01010")
+
+            raw_signal = {
+                'title': f"{complaint_type} spike: {count} requests in {area} ({hour}:00)",
+                'content': (f"311 Cluster: {count} '{complaint_type}' requests in {area} within one hour "
+                            f"(~{anomaly['expected']:.1f} expected, {ratio:.1f}x baseline)\n"
+                            f"Most common description: {descriptor}\nBorough: {borough}\nAgency: {agency_name}"),
+                'url': first_member_url,
+                'score': alert_type_info.default_severity + min(4, int(ratio // SPIKE_RATIO)) + (2 if is_emergency else 0),
+                'comments': 0,
+                'shares': 0,
+                'created_at': created_at,
+                'timestamp': created_at,
+                'full_text': f"{complaint_type} {descriptor}".strip(),
+                'content_length': len(descriptor),
+                'metadata': {
+                    'unique_key': f"cluster_{family}_{self._group_key(anomaly, dimensions)}_{hour}".replace(' ', '_').replace('/', '-'),
+                    'complaint_type': complaint_type,
+                    'descriptor': descriptor,
+                    'borough': borough,
+                    'agency': agency,
+                    'agency_name': agency_name,
+                    'status': 'Cluster',
+                    'incident_zip': incident_zip,
+
+                    # Location data (centroid of member requests)
+                    'latitude': latitude,
+                    'longitude': longitude,
+                    'has_coordinates': latitude is not None,
+
+                    # Cluster details
+                    'signal_category': family,
+                    'is_cluster': True,
+                    'cluster_size': count,
+                    'expected_count': round(anomaly['expected'], 2),
+                    'spike_ratio': round(ratio, 2),
+                    'cluster_hour': anomaly['hour'],
+                    'member_keys': [member.get('unique_key') for member in members],
+                    'is_emergency': is_emergency,
+                    'is_event': complaint_type in self.event_complaint_types,
+
+                    'nyc_relevant': True,
+                    'primary_borough': borough,
+                }
+            }
+
+            return self.standardize_signal(raw_signal)
 
         except Exception as e:
-            logger.error(f"❌ Error fetching geographic 311 requests: {e}")
-            return []
+            logger.error(f"❌ Failed to build 311 cluster signal: {e}")
+            return None
 
     async def _request_to_signal(self, request: Dict, signal_category: str, stats: Dict) -> Optional[Dict]:
         """Convert 311 request to standardized signal format"""
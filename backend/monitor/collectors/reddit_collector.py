@@ -3,6 +3,8 @@ Reddit collector for NYC monitor system.
 Collects raw data from NYC-related subreddits for triage analysis.
 """
 import os
+import asyncio
+from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Optional, Tuple
 from redditwarp.ASYNC import Client
@@ -12,10 +14,13 @@ import re
 
 from .base_collector import BaseCollector
 from monitor.utils.location_extractor import NYCLocationExtractor
-from monitor.utils.geocode import geocode_nyc_location
 
 logger = logging.getLogger(__name__)
 
+# Subreddit listings pulled at once on the shared client (Reddit allows ~100 requests/min)
+REDDIT_MAX_CONCURRENT_LISTINGS = int(
+    os.getenv('REDDIT_MAX_CONCURRENT_LISTINGS', '6'))
+
 
 class RedditCollector(BaseCollector):
     """Reddit collector for NYC signals"""
@@ -95,79 +100,92 @@ class RedditCollector(BaseCollector):
         """
         Collect recent signals from NYC subreddits with priority-based filtering
 
+        Listings for all subreddits are pulled concurrently on the shared client
+        (at most REDDIT_MAX_CONCURRENT_LISTINGS at a time), converting each
+        submission as it arrives. Posts cross-posted to several monitored
+        subreddits are merged by submission ID, and the surviving signals are
+        geocoded in one batch at the end.
+
         Returns:
             List of raw Reddit signals for triage analysis, prioritized by emergency/safety keywords
         """
         logger.info("🔍 STARTING REDDIT SIGNAL COLLECTION")
         try:
-            all_signals = []
             priority_signals = []
             monitoring_stats = {
                 'total_posts': 0,
                 'priority_posts': 0,
                 'emergency_posts': 0,
                 'subreddits_monitored': len(self.nyc_subreddits),
+                'cross_posts_merged': 0,
                 'keywords_found': set(),
                 'priority_flags': set()
             }
 
-            # Collect recent hot posts from NYC subreddits
-            for i, subreddit in enumerate(self.nyc_subreddits, 1):
-                try:
-                    logger.info(
-                        f"📡 Collecting from r/{subreddit} ({i}/{len(self.nyc_subreddits)})")
-                    # Increase limit per subreddit to get more potential signals
-                    signals = await self._fetch_subreddit_signals(subreddit, limit=20)
-
-                    # Categorize signals by priority content (for logging)
-                    for signal in signals:
-                        all_signals.append(signal)
-                        monitoring_stats['total_posts'] += 1
-
-                        has_priority = signal['metadata'].get(
-                            'has_priority_content', False)
-                        keywords = signal['metadata'].get(
-                            'priority_keywords', [])
-                        priority_flags = signal['metadata'].get(
-                            'priority_flags', [])
-
-                        # Track statistics
-                        monitoring_stats['keywords_found'].update(keywords)
-                        monitoring_stats['priority_flags'].update(
-                            priority_flags)
-
-                        # Categorization by priority content (emergencies OR major events)
-                        if has_priority:
-                            priority_signals.append(signal)
-                            monitoring_stats['priority_posts'] += 1
-
-                            # Distinguish between emergencies and events in logging
-                            emergency_terms = ['911', 'emergency', 'fire', 'shooting', 'explosion',
-                                               'ambulance', 'police', 'evacuation', 'lockdown', 'collapse',
-                                               'accident', 'power outage', 'blackout', 'gas leak', 'outbreak']
-
-                            has_emergency = any(
-                                term in priority_flags for term in emergency_terms)
-
-                            if has_emergency:
-                                monitoring_stats['emergency_posts'] += 1
-                                logger.warning(f"🚨 EMERGENCY CONTENT: {signal['title'][:60]}... "
-                                               f"(Keywords: {priority_flags})")
-                            else:
-                                logger.info(f"🎉 MAJOR EVENT/GATHERING: {signal['title'][:60]}... "
-                                            f"(Keywords: {priority_flags})")
-                        elif len(keywords) > 0:
-                            logger.info(f"⚠️  RELEVANT KEYWORDS: {signal['title'][:60]}... "
-                                        f"(Keywords: {keywords})")
-
-                    logger.info(
-                        f"✅ Collected {len(signals)} signals from r/{subreddit}")
-
-                except Exception as e:
-                    logger.error(
-                        f"❌ Error collecting from r/{subreddit}: {str(e)}")
-                    logger.error(f"   Exception type: {type(e).__name__}")
-                    continue
+            per_subreddit = await self._fetch_subreddits(self.nyc_subreddits, limit=20)
+
+            # Merge posts seen in several subreddits, keeping the first occurrence
+            all_signals = []
+            signals_by_post_id = {}
+            for subreddit in self.nyc_subreddits:
+                signals = per_subreddit.get(subreddit, [])
+                logger.info(
+                    f"✅ Collected {len(signals)} signals from r/{subreddit}")
+                for signal in signals:
+                    post_id = signal['metadata']['post_id']
+                    existing = signals_by_post_id.get(post_id)
+                    if existing is not None:
+                        existing['metadata']['subreddits'].append(subreddit)
+                        monitoring_stats['cross_posts_merged'] += 1
+                        continue
+                    signal['metadata']['subreddits'] = [subreddit]
+                    signals_by_post_id[post_id] = signal
+                    all_signals.append(signal)
+
+            # Geocode every collected post in one batch (deduplicated, rate limited)
+            geocoded_count = await self._geocode_signals(all_signals)
+            logger.info(
+                f"🗺️ Geocoded {geocoded_count}/{len(all_signals)} Reddit signals")
+
+            # Categorize signals by priority content (for logging)
+            for signal in all_signals:
+                monitoring_stats['total_posts'] += 1
+
+                has_priority = signal['metadata'].get(
+                    'has_priority_content', False)
+                keywords = signal['metadata'].get(
+                    'priority_keywords', [])
+                priority_flags = signal['metadata'].get(
+                    'priority_flags', [])
+
+                # Track statistics
+                monitoring_stats['keywords_found'].update(keywords)
+                monitoring_stats['priority_flags'].update(
+                    priority_flags)
+
+                # Categorization by priority content (emergencies OR major events)
+                if has_priority:
+                    priority_signals.append(signal)
+                    monitoring_stats['priority_posts'] += 1
+
+                    # Distinguish between emergencies and events in logging
+                    emergency_terms = ['911', 'emergency', 'fire', 'shooting', 'explosion',
+                                       'ambulance', 'police', 'evacuation', 'lockdown', 'collapse',
+                                       'accident', 'power outage', 'blackout', 'gas leak', 'outbreak']
+
+                    has_emergency = any(
+                        term in priority_flags for term in emergency_terms)
+
+                    if has_emergency:
+                        monitoring_stats['emergency_posts'] += 1
+                        logger.warning(f"🚨 EMERGENCY CONTENT: {signal['title'][:60]}... "
+                                       f"(Keywords: {priority_flags})")
+                    else:
+                        logger.info(f"🎉 MAJOR EVENT/GATHERING: {signal['title'][:60]}... "
+                                    f"(Keywords: {priority_flags})")
+                elif len(keywords) > 0:
+                    logger.info(f"⚠️  RELEVANT KEYWORDS: {signal['title'][:60]}... "
+                                f"(Keywords: {keywords})")
 
             # Sort signals: priority content first, then by Reddit score
             all_signals.sort(key=lambda x: (
@@ -186,6 +204,8 @@ class RedditCollector(BaseCollector):
                 f"   High priority posts: {monitoring_stats['priority_posts']}")
             logger.info(
                 f"   Subreddits monitored: {monitoring_stats['subreddits_monitored']}")
+            logger.info(
+                f"   Cross-posts merged: {monitoring_stats['cross_posts_merged']}")
 
             if monitoring_stats['priority_flags']:
                 logger.warning(
@@ -208,55 +228,87 @@ class RedditCollector(BaseCollector):
             return []
 
     async def _fetch_subreddit_signals(self, subreddit: str, limit: int = 20) -> List[Dict]:
-        """Fetch recent signals from a specific subreddit"""
+        """Fetch recent signals from a specific subreddit (without coordinates)"""
+        per_subreddit = await self._fetch_subreddits([subreddit], limit)
+        return per_subreddit.get(subreddit, [])
+
+    async def _fetch_subreddits(self, subreddits: List[str], limit: int = 20) -> Dict[str, List[Dict]]:
+        """
+        Pull and convert the hot and new listings of several subreddits
+
+        Listings are pulled concurrently; each submission is converted as it
+        arrives (conversion is synchronous and cheap next to the network wait),
+        so a listing advances only as fast as its submissions are converted and
+        nothing piles up in memory.
+
+        Args:
+            subreddits: Subreddits to pull
+            limit: Maximum signals kept per subreddit
+
+        Returns:
+            Subreddit -> its unique signals, hot posts first, at most `limit`
+        """
+        listing_semaphore = asyncio.Semaphore(REDDIT_MAX_CONCURRENT_LISTINGS)
+        converted: Dict[str, List[Tuple[int, Dict]]] = defaultdict(list)
+
+        await asyncio.gather(*[
+            self._fetch_subreddit_submissions(
+                subreddit, limit, converted[subreddit], listing_semaphore)
+            for subreddit in subreddits
+        ])
+
+        per_subreddit = {}
+        for subreddit, ranked_signals in converted.items():
+            # Combine and deduplicate (a hot post is often also in new)
+            ranked_signals.sort(key=lambda item: item[0])
+            signals = []
+            seen_ids = set()
+            for _, signal in ranked_signals:
+                post_id = signal['metadata']['post_id']
+                if post_id not in seen_ids:
+                    signals.append(signal)
+                    seen_ids.add(post_id)
+            per_subreddit[subreddit] = signals[:limit]  # Keep top N unique posts
+            logger.debug(
+                f"📋 Final result for r/{subreddit}: {len(per_subreddit[subreddit])} unique signals")
+        return per_subreddit
+
+    async def _fetch_subreddit_submissions(self, subreddit: str, limit: int,
+                                           ranked_signals: List[Tuple[int, Dict]],
+                                           listing_semaphore: asyncio.Semaphore):
+        """
+        Pull the hot and new listings of a subreddit concurrently, converting each submission
+
+        Hot posts are ranked ahead of new posts so the per-subreddit limit keeps
+        the same posts it did when listings were pulled one after the other.
+        """
         logger.debug(f"🎯 Fetching signals from r/{subreddit} (limit: {limit})")
-        signals = []
 
-        try:
-            # Get both hot and new posts for better coverage
-            hot_posts = []
-            new_posts = []
+        def add(rank: int, submission):
+            signal = self._submission_to_signal(submission, subreddit)
+            if signal is not None:  # Only add if not filtered out
+                ranked_signals.append((rank, signal))
 
-            # Fetch hot posts (increase the portion for hot posts)
-            logger.debug(f"🔥 Fetching hot posts from r/{subreddit}")
+        async def pull_hot():
+            # Use 2/3 of limit for hot posts
             hot_count = 0
-            try:
+            async with listing_semaphore:
                 async for submission in self.client.p.subreddit.pull.hot(subreddit):
-                    if hot_count >= limit * 2 // 3:  # Use 2/3 of limit for hot posts
+                    if hot_count >= limit * 2 // 3:
                         break
-                    # Debug: log submission attributes for the first few posts
-                    if hot_count < 2:
-                        logger.debug(
-                            f"HOT SUBMISSION {hot_count}: type={type(submission).__name__}")
-                        logger.debug(
-                            f"  Available attributes: {[attr for attr in dir(submission) if not attr.startswith('_')]}")
-
-                    signal = await self._submission_to_signal(submission, subreddit)
-                    if signal is not None:  # Only add if not filtered out
-                        hot_posts.append(signal)
+                    add(hot_count, submission)
                     hot_count += 1
-                logger.debug(
-                    f"✅ Got {len(hot_posts)} hot posts from r/{subreddit}")
-            except Exception as e:
-                logger.error(
-                    f"❌ Error fetching hot posts from r/{subreddit}: {str(e)}")
-                logger.error(f"   Exception type: {type(e).__name__}")
+            logger.debug(f"✅ Got {hot_count} hot posts from r/{subreddit}")
 
-            # Fetch recent posts (extend time window to 12 hours for more coverage)
-            logger.debug(f"🆕 Fetching new posts from r/{subreddit}")
+        async def pull_new():
+            # Recent posts within a 12 hour window, up to the full limit
             cutoff_time = datetime.utcnow().replace(
-                tzinfo=timezone.utc) - timedelta(hours=12)  # Extended from 4 to 12 hours
+                tzinfo=timezone.utc) - timedelta(hours=12)
             new_count = 0
-            try:
+            async with listing_semaphore:
                 async for submission in self.client.p.subreddit.pull.new(subreddit):
-                    if new_count >= limit:  # Use full limit for new posts
+                    if new_count >= limit:
                         break
-                    # Debug: log submission attributes for the first few posts
-                    if new_count < 2:
-                        logger.debug(
-                            f"NEW SUBMISSION {new_count}: type={type(submission).__name__}")
-                        logger.debug(
-                            f"  Available attributes: {[attr for attr in dir(submission) if not attr.startswith('_')]}")
 
                     if hasattr(submission, 'created_at'):
                         post_time = submission.created_at
@@ -268,47 +320,26 @@ class RedditCollector(BaseCollector):
                             f"Submission missing created_at: {submission}")
                         continue
 
-                    if post_time >= cutoff_time:
-                        signal = await self._submission_to_signal(
-                            submission, subreddit)
-                        if signal is not None:  # Only add if not filtered out
-                            new_posts.append(signal)
-                        new_count += 1
-                    else:
+                    if post_time < cutoff_time:
                         break  # Posts are ordered by time, so we can break early
-                logger.debug(
-                    f"✅ Got {len(new_posts)} new posts from r/{subreddit}")
-            except Exception as e:
-                logger.error(
-                    f"❌ Error fetching new posts from r/{subreddit}: {str(e)}")
-                logger.error(f"   Exception type: {type(e).__name__}")
+                    add(limit + new_count, submission)
+                    new_count += 1
+            logger.debug(f"✅ Got {new_count} new posts from r/{subreddit}")
 
-            # Combine and deduplicate
-            logger.debug(
-                f"🔄 Combining and deduplicating posts from r/{subreddit}")
-            all_posts = hot_posts + new_posts
-            seen_ids = set()
-            for post in all_posts:
-                if post is None:  # Skip None values from filtering
-                    continue
-                post_id = post['metadata']['post_id']
-                if post_id not in seen_ids:
-                    signals.append(post)
-                    seen_ids.add(post_id)
-
-            final_signals = signals[:limit]  # Return top N unique posts
-            logger.debug(
-                f"📋 Final result for r/{subreddit}: {len(final_signals)} unique signals")
-            return final_signals
+        results = await asyncio.gather(pull_hot(), pull_new(), return_exceptions=True)
+        for listing, result in zip(('hot', 'new'), results):
+            if isinstance(result, Exception):
+                logger.error(
+                    f"❌ Error fetching {listing} posts from r/{subreddit}: {str(result)}")
+                logger.error(f"   Exception type: {type(result).__name__}")
 
-        except Exception as e:
-            logger.error(
-                f"❌ COMPLETE FAILURE fetching from r/{subreddit}: {str(e)}")
-            logger.error(f"   Exception type: {type(e).__name__}")
-            return []
+    def _submission_to_signal(self, submission, subreddit: str) -> Optional[Dict]:
+        """
+        Convert Reddit submission to standardized signal format
 
-    async def _submission_to_signal(self, submission, subreddit: str) -> Dict:
-        """Convert Reddit submission to standardized signal format"""
+        Locations come from the offline extractor only; coordinates are filled
+        in afterwards by the batch geocoding stage in collect_signals().
+        """
         try:
             # Use created_at directly since it's already a datetime object in redditwarp
             created_at = getattr(submission, 'created_at', datetime.utcnow())
@@ -340,22 +371,10 @@ class RedditCollector(BaseCollector):
             # Analyze keywords for basic emergency detection (pre-filtering)
             keyword_analysis = self._analyze_keywords(title, content)
 
-            # Extract location information using the dedicated extractor with geocoding
-            location_info = await self.location_extractor.extract_location_info_with_geocoding(
+            # Extract location information (coordinates are geocoded later in one batch)
+            location_info = self.location_extractor.extract_location_info(
                 title, content)
-
-            # NEW: Get real coordinates using geocoding service (now handled in location extractor)
-            # geocoding_result = await self._geocode_location_info(location_info, title, content)
-
-            # Extract coordinates from the geocoding-enhanced location info
-            geocoding_result = {
-                'lat': location_info.get('center_latitude'),
-                'lng': location_info.get('center_longitude'),
-                'formatted_address': location_info['locations_found'][0].get('name') if location_info['locations_found'] else None,
-                'confidence': location_info['locations_found'][0].get('confidence', 0.0) if location_info['locations_found'] else 0.0,
-                'source': location_info.get('geocoding_source', 'hardcoded'),
-                'success': location_info.get('has_coordinates', False)
-            }
+            geocoding_result = self._empty_geocoding_result()
 
             # NEW: Check location specificity - but be less aggressive about filtering
             location_specificity = self._assess_location_specificity(
@@ -459,42 +478,19 @@ class RedditCollector(BaseCollector):
             logger.warning(f"Error extracting content from submission: {e}")
             return ''
 
-    async def _geocode_location_info(self, location_info: Dict, title: str, content: str) -> Dict:
+    def _location_query(self, metadata: Dict) -> Optional[Tuple[str, Optional[str]]]:
         """
-        Geocode location information to get real coordinates
-
-        Returns:
-            Dict with geocoding result including latitude, longitude, formatted address, and confidence
+        Pick what to geocode for a post: an extracted NYC location or borough,
+        otherwise the most specific street, intersection or venue it mentions
         """
-        try:
-            # Extract relevant location information
-            locations = location_info['locations_found']
-            borough = location_info.get('primary_borough')
-
-            # Try to geocode the most specific location available
-            if locations:
-                # Extract the location name string from the first location dict
-                first_location = locations[0]
-                if isinstance(first_location, dict):
-                    location_text = first_location.get('name', '')
-                else:
-                    location_text = str(first_location)
-
-                logger.debug(
-                    f"Geocoding location: '{location_text}' with borough: '{borough}'")
-                geocoding_result = await geocode_nyc_location(location_text, borough)
-            elif borough:
-                # Fall back to borough-level geocoding
-                logger.debug(f"Geocoding borough: '{borough}'")
-                geocoding_result = await geocode_nyc_location(borough)
-            else:
-                # No specific location information available
-                return self._empty_geocoding_result()
-
-            return geocoding_result
-        except Exception as e:
-            logger.warning(f"Warning: Failed to geocode location: {e}")
-            return self._empty_geocoding_result()
+        location_query = super()._location_query(metadata)
+        if location_query:
+            return location_query
+        for field in ('cross_streets', 'specific_streets', 'named_venues'):
+            candidates = metadata.get(field) or []
+            if candidates:
+                return str(candidates[0]), None
+        return None
 
     def _empty_geocoding_result(self) -> Dict:
         """Return empty geocoding result"""
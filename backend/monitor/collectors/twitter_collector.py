@@ -53,7 +53,9 @@ class TwitterCollector(BaseCollector):
         self.max_tweets_per_query = 5      # Reduce from 10 to 5 to avoid rate limits
         self.time_window_hours = 2         # Increase to 2 hours for more coverage
         self.max_collection_time = 30      # Reduce to 30 seconds to be safer
-        self.wait_on_rate_limit = True     # Change to True to handle rate limits better
+        # tweepy sleeps out rate limits synchronously, which would block the event
+        # loop; TooManyRequests is handled below with a cooldown instead
+        self.wait_on_rate_limit = False
         self.rate_limit_reset_time = None  # Track when rate limit will reset
         self.contexts_per_cycle = 2        # Reduce from 3 to 2 contexts per cycle
         self.delay_between_contexts = 5    # Increase delay from 2 to 5 seconds
@@ -181,8 +183,10 @@ class TwitterCollector(BaseCollector):
                         if monitoring_stats['contexts_processed'] > 0:
                             await asyncio.sleep(self.delay_between_contexts)
 
-                        # Search recent tweets for this context
-                        tweets = self.client_v2.search_recent_tweets(
+                        # Search recent tweets for this context (tweepy is
+                        # synchronous, so run it off the event loop)
+                        tweets = await asyncio.to_thread(
+                            self.client_v2.search_recent_tweets,
                             query=base_query,
                             tweet_fields=[
                                 'created_at', 'public_metrics', 'geo', 'entities'],
@@ -237,7 +241,10 @@ class TwitterCollector(BaseCollector):
 
                     except tweepy.TooManyRequests as e:
                         monitoring_stats['rate_limits_hit'] += 1
-                        reset_time = getattr(e, 'reset_time', None)
+                        reset_header = getattr(getattr(e, 'response', None), 'headers', {}).get(
+                            'x-rate-limit-reset', '')
+                        reset_time = (datetime.utcfromtimestamp(int(reset_header))
+                                      if str(reset_header).isdigit() else None)
                         if reset_time:
                             self.rate_limit_reset_time = reset_time
                             logger.warning(
@@ -7,7 +7,12 @@ from monitor.collectors.reddit_collector import RedditCollector
 from monitor.collectors.hackernews_collector import HackerNewsCollector
 from monitor.collectors.twitter_collector import TwitterCollector
 from monitor.agents.triage_agent import TriageAgent
+from monitor.agents.triage_cache import TriageCache
 from monitor.storage.firestore_manager import FirestoreManager
+from monitor.utils.geocode_cache import configure_geocode_cache, get_geocode_cache
+from monitor.utils.hn_item_cache import HNItemCache
+from monitor.utils.gazetteer import get_gazetteer
+from monitor.utils.geocode import close_geocoding_client
 from monitor.types.alert_categories import (
     categorize_monitor_event,
     get_alert_type_info,
@@ -17,7 +22,7 @@ import os
 import asyncio
 import logging
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Tuple
 import sys
 import signal
 
@@ -40,6 +45,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Default per-source collection deadlines (seconds), each overridable with
+# MONITOR_<SOURCE>_DEADLINE_SECONDS (e.g. MONITOR_REDDIT_DEADLINE_SECONDS)
+DEFAULT_COLLECTOR_DEADLINES = {
+    'reddit': 300,
+    'hackernews': 120,
+    'twitter': 60
+}
+
 
 class MonitorJob:
     """Main background monitor job implementing the triage system"""
@@ -50,6 +63,17 @@ class MonitorJob:
 
         # Initialize components
         try:
+            # Initialize Firestore storage
+            self.storage = FirestoreManager()
+            logger.info("Firestore manager initialized successfully")
+
+            # HackerNews item JSON, so stories seen by earlier cycles are not
+            # downloaded again unless they are still in play
+            self.hn_item_cache = HNItemCache(self.storage)
+
+            # Geocoding results, so places resolved by earlier cycles skip Nominatim
+            configure_geocode_cache(self.storage)
+
             # Initialize data collectors
             self.collectors = []
 
@@ -64,7 +88,7 @@ class MonitorJob:
 
             # HackerNews collector (no credentials required)
             try:
-                hackernews_collector = HackerNewsCollector()
+                hackernews_collector = HackerNewsCollector(self.hn_item_cache)
                 self.collectors.append(hackernews_collector)
                 logger.info("✅ HackerNews collector initialized successfully")
             except Exception as e:
@@ -87,9 +111,22 @@ class MonitorJob:
             self.triage_agent = TriageAgent()
             logger.info("Triage agent initialized successfully")
 
-            # Initialize Firestore storage
-            self.storage = FirestoreManager()
-            logger.info("Firestore manager initialized successfully")
+            # Per-signal triage verdicts, so posts that stay hot across cycles
+            # are not re-sent to the model
+            self.triage_cache = TriageCache(self.storage)
+
+            # Collection mode - run all collectors at once unless disabled
+            self.concurrent_collection = os.getenv(
+                'MONITOR_CONCURRENT_COLLECTION', 'true').lower() != 'false'
+
+            # Per-source collection deadlines (seconds); a source that runs past
+            # its deadline is cancelled and the cycle continues without it
+            self.default_collector_deadline = float(
+                os.getenv('MONITOR_COLLECTOR_DEADLINE_SECONDS', '180'))
+            self.collector_deadlines = {
+                source: float(os.getenv(f'MONITOR_{source.upper()}_DEADLINE_SECONDS', str(default)))
+                for source, default in DEFAULT_COLLECTOR_DEADLINES.items()
+            }
 
             # Job statistics
             self.stats = {
@@ -98,7 +135,11 @@ class MonitorJob:
                 'alerts_generated': 0,
                 'alerts_stored': 0,
                 'errors': [],
-                'source_stats': {}  # NEW: Detailed stats by source
+                'source_stats': {},  # NEW: Detailed stats by source
+                'collection_timing': {},
+                'storage_write': {},
+                'triage_shards': {},
+                'triage_cache': {}
             }
 
         except Exception as e:
@@ -193,17 +234,14 @@ class MonitorJob:
                         'no new' not in new_info.lower()
                     )
 
-                    # Allow through if it's been more than 2 hours since similar alert
+                    # Allow through if it's been more than 2 hours since the alert it
+                    # duplicates (matched by the triage agent's near-duplicate index)
                     should_allow_time_based = False
-                    if recent_alerts:
-                        similar_alerts = [ra for ra in recent_alerts
-                                          if ra.get('title', '').lower() in alert.get('title', '').lower()
-                                          or alert.get('title', '').lower() in ra.get('title', '').lower()]
-                        if similar_alerts:
-                            newest_similar = max(similar_alerts,
-                                                 key=lambda x: x.get('created_at', datetime.min))
-                            time_since = datetime.utcnow() - newest_similar.get('created_at', datetime.utcnow())
-                            should_allow_time_based = time_since.total_seconds() > 7200  # 2 hours
+                    original_created_at = alert.get('duplicate_created_at')
+                    if isinstance(original_created_at, datetime):
+                        # Firestore timestamps are timezone-aware UTC
+                        time_since = datetime.utcnow() - original_created_at.replace(tzinfo=None)
+                        should_allow_time_based = time_since.total_seconds() > 7200  # 2 hours
 
                     # Override duplicate detection in certain cases
                     if has_substantial_new_info or should_allow_time_based:
@@ -328,64 +366,179 @@ class MonitorJob:
         """
         Collect raw signals from all available data sources
 
+        Returns:
+            Dictionary with signals organized by source
+        """
+        if self.concurrent_collection and len(self.collectors) > 1:
+            logger.info(
+                f"⚡ Collecting from {len(self.collectors)} sources concurrently")
+            return await self._collect_signals_concurrently()
+
+        return await self._collect_signals_sequentially()
+
+    async def _collect_signals_concurrently(self) -> Dict:
+        """
+        Fan out every collector at once and merge results as each source finishes
+
         Returns:
             Dictionary with signals organized by source
         """
         all_signals = {}
         total_count = 0
+        cycle_start = datetime.utcnow()
 
-        for collector in self.collectors:
-            try:
-                logger.info(f"Collecting signals from {collector.source_name}")
+        tasks = [asyncio.create_task(self._collect_from_source(collector))
+                 for collector in self.collectors]
 
-                # Track start time for this collector
-                collector_start_time = datetime.utcnow()
+        for finished in asyncio.as_completed(tasks):
+            source_name, signals, source_stats = await finished
+            self.stats['source_stats'][source_name] = source_stats
 
-                signals = await collector.collect_signals()
+            if signals:
+                all_signals[source_name] = signals
+                total_count += len(signals)
+                logger.info(
+                    f"📥 Merged {len(signals)} signals from {source_name} ({total_count} so far)")
 
-                # Track end time and calculate duration
-                collector_end_time = datetime.utcnow()
-                collection_duration = (
-                    collector_end_time - collector_start_time).total_seconds()
+        self._record_collection_timing('concurrent', cycle_start)
+        self.stats['signals_collected'] = total_count
+        return all_signals
 
-                if signals:
-                    all_signals[collector.source_name] = signals
-                    total_count += len(signals)
-                    logger.info(
-                        f"Collected {len(signals)} signals from {collector.source_name}")
-                else:
-                    logger.info(
-                        f"No signals collected from {collector.source_name}")
-
-                # Store detailed source statistics
-                self.stats['source_stats'][collector.source_name] = {
-                    'signals_collected': len(signals) if signals else 0,
-                    'collection_duration_seconds': collection_duration,
-                    'collection_start_time': collector_start_time.isoformat(),
-                    'collection_end_time': collector_end_time.isoformat(),
-                    'success': True,
-                    'error': None
-                }
+    async def _collect_signals_sequentially(self) -> Dict:
+        """
+        Collect from each source one after another (fallback mode)
 
-            except Exception as e:
-                error_msg = f"Error collecting from {collector.source_name}: {str(e)}"
-                logger.error(error_msg)
-                self.stats['errors'].append(error_msg)
+        Returns:
+            Dictionary with signals organized by source
+        """
+        all_signals = {}
+        total_count = 0
+        cycle_start = datetime.utcnow()
 
-                # Store error statistics for this source
-                self.stats['source_stats'][collector.source_name] = {
-                    'signals_collected': 0,
-                    'collection_duration_seconds': 0,
-                    'collection_start_time': None,
-                    'collection_end_time': None,
-                    'success': False,
-                    'error': str(e)
-                }
-                continue
+        for collector in self.collectors:
+            source_name, signals, source_stats = await self._collect_from_source(collector)
+            self.stats['source_stats'][source_name] = source_stats
+
+            if signals:
+                all_signals[source_name] = signals
+                total_count += len(signals)
 
+        self._record_collection_timing('sequential', cycle_start)
         self.stats['signals_collected'] = total_count
         return all_signals
 
+    async def _collect_from_source(self, collector) -> Tuple[str, List[Dict], Dict]:
+        """
+        Run a single collector under its deadline. Never raises - failures and
+        timeouts are reported through the returned source statistics.
+
+        Collectors hand back their signals only when collect_signals() returns,
+        so a source cut off by its deadline contributes no signals this cycle:
+        whatever it had gathered is dropped. Nothing is lost for good - Reddit
+        and HackerNews are read again from their listings next cycle, and
+        cached HackerNews items are only saved by a collection that finishes.
+
+        Returns:
+            Tuple of (source name, signals, source statistics)
+        """
+        source_name = collector.source_name
+        deadline = self.collector_deadlines.get(
+            source_name, self.default_collector_deadline)
+
+        logger.info(
+            f"Collecting signals from {source_name} (deadline: {deadline:.0f}s)")
+
+        # Track start time for this collector
+        collector_start_time = datetime.utcnow()
+
+        try:
+            signals = await asyncio.wait_for(collector.collect_signals(), timeout=deadline)
+
+            # Track end time and calculate duration
+            collector_end_time = datetime.utcnow()
+            collection_duration = (
+                collector_end_time - collector_start_time).total_seconds()
+
+            if signals:
+                logger.info(
+                    f"Collected {len(signals)} signals from {source_name}")
+            else:
+                logger.info(f"No signals collected from {source_name}")
+
+            # Store detailed source statistics
+            return source_name, signals or [], {
+                'signals_collected': len(signals) if signals else 0,
+                'collection_duration_seconds': collection_duration,
+                'collection_start_time': collector_start_time.isoformat(),
+                'collection_end_time': collector_end_time.isoformat(),
+                'deadline_seconds': deadline,
+                'cut_off': False,
+                'success': True,
+                'error': None
+            }
+
+        except asyncio.TimeoutError:
+            collector_end_time = datetime.utcnow()
+            error_msg = (f"Collection from {source_name} cut off after {deadline:.0f}s deadline "
+                         f"(signals gathered so far dropped, retried next cycle)")
+            logger.warning(f"⏰ {error_msg}")
+            self.stats['errors'].append(error_msg)
+
+            return source_name, [], {
+                'signals_collected': 0,
+                'collection_duration_seconds': (
+                    collector_end_time - collector_start_time).total_seconds(),
+                'collection_start_time': collector_start_time.isoformat(),
+                'collection_end_time': collector_end_time.isoformat(),
+                'deadline_seconds': deadline,
+                'cut_off': True,
+                'success': False,
+                'error': error_msg
+            }
+
+        except Exception as e:
+            error_msg = f"Error collecting from {source_name}: {str(e)}"
+            logger.error(error_msg)
+            self.stats['errors'].append(error_msg)
+
+            # Store error statistics for this source
+            return source_name, [], {
+                'signals_collected': 0,
+                'collection_duration_seconds': 0,
+                'collection_start_time': None,
+                'collection_end_time': None,
+                'deadline_seconds': deadline,
+                'cut_off': False,
+                'success': False,
+                'error': str(e)
+            }
+
+    def _record_collection_timing(self, mode: str, cycle_start: datetime):
+        """
+        Record wall-clock vs. summed per-source collection time so the overlap
+        gained from concurrent collection shows up in the run statistics
+        """
+        wall_clock = (datetime.utcnow() - cycle_start).total_seconds()
+        source_stats = self.stats['source_stats']
+        summed = sum(s.get('collection_duration_seconds', 0)
+                     for s in source_stats.values())
+        cut_off = [source for source, s in source_stats.items()
+                   if s.get('cut_off')]
+
+        self.stats['collection_timing'] = {
+            'mode': mode,
+            'wall_clock_seconds': wall_clock,
+            'sum_of_source_seconds': summed,
+            'overlap_seconds': max(summed - wall_clock, 0),
+            'parallel_speedup': summed / wall_clock if wall_clock > 0 else 1.0,
+            'sources_cut_off': cut_off
+        }
+
+        logger.info(
+            f"⏱️  Collection ({mode}): {wall_clock:.2f}s wall clock, {summed:.2f}s summed across sources")
+        if cut_off:
+            logger.warning(f"⏰ Sources cut off by deadline: {cut_off}")
+
     async def _run_triage_analysis(self, raw_signals: Dict, recent_alerts: List[Dict] = None) -> Dict:
         """
         Run lightweight triage analysis on collected signals
@@ -410,7 +563,10 @@ class MonitorJob:
             }
 
             # Run triage analysis with duplicate detection
-            triage_results = await self.triage_agent.analyze_signals(signals_with_metadata)
+            triage_results = await self.triage_agent.analyze_signals(
+                signals_with_metadata, cache=self.triage_cache)
+            self.stats['triage_shards'] = triage_results.get('shard_stats', {})
+            self.stats['triage_cache'] = triage_results.get('cache_stats', {})
 
             # Log triage summary
             summary = triage_results.get('summary', 'No summary available')
@@ -445,7 +601,7 @@ class MonitorJob:
 
     async def _store_alerts(self, alerts: List[Dict]) -> int:
         """
-        Store alerts in Firestore
+        Store alerts in Firestore with batched writes
 
         Args:
             alerts: List of alert dictionaries from triage analysis
@@ -458,13 +614,14 @@ class MonitorJob:
         logger.info(
             f"   Firestore Project: {os.getenv('GOOGLE_CLOUD_PROJECT')}")
 
-        stored_count = 0
+        enhanced_alerts = []
+        document_ids = []
         failed_count = 0
 
         for i, alert in enumerate(alerts, 1):
             try:
                 logger.info(
-                    f"📝 Storing alert {i}/{len(alerts)}: {alert.get('title', 'Unknown')}")
+                    f"📝 Preparing alert {i}/{len(alerts)}: {alert.get('title', 'Unknown')}")
 
                 # Generate a descriptive document ID based on the alert
                 alert_id = self._generate_alert_document_id(alert)
@@ -553,19 +710,38 @@ class MonitorJob:
                     'original_alert_data': alert
                 }
 
+                enhanced_alerts.append(enhanced_alert)
                 # Use the custom alert_id as the document ID
-                stored_alert_id = await self.storage.store_alert(enhanced_alert, document_id=alert_id)
-                stored_count += 1
-                logger.info(
-                    f"✅ SUCCESS - Alert stored with ID: {stored_alert_id}")
+                document_ids.append(alert_id)
 
             except Exception as e:
                 failed_count += 1
-                error_msg = f"❌ FAILED to store alert {i}: {alert.get('title', 'Unknown')} - {str(e)}"
+                error_msg = f"❌ FAILED to prepare alert {i}: {alert.get('title', 'Unknown')} - {str(e)}"
                 logger.error(error_msg)
                 self.stats['errors'].append(error_msg)
                 continue
 
+        stored_count = 0
+        if enhanced_alerts:
+            try:
+                report = await self.storage.store_alerts(enhanced_alerts, document_ids=document_ids)
+                stored_count = report['written']
+                failed_count += report['failed']
+                for document_id, error in report['errors'].items():
+                    self.stats['errors'].append(
+                        f"❌ FAILED to store alert {document_id}: {error}")
+                self.stats['storage_write'] = {
+                    'batches': report['batches'],
+                    'retries': report['retries'],
+                    'failed': report['failed'],
+                    'duration_seconds': report['duration_seconds']
+                }
+            except Exception as e:
+                failed_count += len(enhanced_alerts)
+                error_msg = f"❌ FAILED to store {len(enhanced_alerts)} alerts: {str(e)}"
+                logger.error(error_msg)
+                self.stats['errors'].append(error_msg)
+
         # Summary logging
         logger.info(f"📊 STORAGE SUMMARY:")
         logger.info(f"   ✅ Stored: {stored_count}")
@@ -807,6 +983,12 @@ class MonitorJob:
             'source_stats': self.stats['source_stats'],
             'sources_successful': len([s for s in self.stats['source_stats'].values() if s.get('success', False)]),
             'sources_failed': len([s for s in self.stats['source_stats'].values() if not s.get('success', True)]),
+            'collection_timing': self.stats['collection_timing'],
+            'triage_shards': self.stats['triage_shards'],
+            'triage_cache': self.stats['triage_cache'],
+            'geocode_cache': get_geocode_cache().get_stats(),
+            'hn_item_cache': self.hn_item_cache.get_stats(),
+            'gazetteer': dict(get_gazetteer().stats),
 
             # Environment information
             'environment': {
@@ -868,6 +1050,10 @@ async def main():
         logger.error(f"Fatal error in background monitor: {str(e)}")
         sys.exit(1)
 
+    finally:
+        # Release pooled geocoding connections before the event loop closes
+        await close_geocoding_client()
+
 if __name__ == "__main__":
     # Run the background monitor
     asyncio.run(main())
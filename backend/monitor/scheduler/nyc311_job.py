@@ -1,19 +1,21 @@
 """
 NYC 311 Daily Collector Job.
 Collects 311 service requests daily and stores them directly in Firestore.
-Uses triage agent for severity scoring (consistent with monitor alerts).
+Scores routine complaints with rule pre-triage and uses the triage agent for
+ambiguous or high-impact ones (consistent with monitor alerts).
 """
 from monitor.storage.firestore_manager import FirestoreManager
+from monitor.storage.firestore_pool import run_firestore
 from monitor.collectors.nyc_311_collector import NYC311Collector
 from monitor.agents.triage_agent import TriageAgent
+from monitor.agents.rule_triage import RuleVerdict, pre_triage_311
 import os
 import asyncio
 import logging
 import signal
 import sys
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import List, Dict, Set
-from google.cloud import firestore
 
 # Add the backend directory to Python path
 backend_dir = os.path.dirname(os.path.dirname(
@@ -64,9 +66,14 @@ class NYC311Job:
                 'signals_stored': 0,
                 'duplicates_found': 0,
                 'triage_analysis_time': 0,
+                'triage_shards': {},
+                'rule_triaged': 0,
+                'llm_triaged': 0,
                 'errors': [],
                 'collection_duration': 0,
                 'storage_duration': 0,
+                'storage_batches': 0,
+                'storage_retries': 0,
                 'complaint_type_breakdown': {},
                 'borough_breakdown': {},
                 'agency_breakdown': {},
@@ -97,8 +104,17 @@ class NYC311Job:
             logger.info("📡 PHASE 1: COLLECTING 311 SIGNALS")
             collection_start = datetime.utcnow()
 
+            # Resume each query family from where the last successful run stopped
+            self.collector.checkpoints = await self.storage.get_collector_checkpoints(
+                self.collector.source_name)
+            self.collector.baselines = await self.storage.get_collector_baselines(
+                self.collector.source_name)
             signals = await self.collector.collect_signals()
 
+            if self.collector.baselines_refreshed:
+                await self.storage.save_collector_baselines(
+                    self.collector.source_name, self.collector.baselines)
+
             collection_end = datetime.utcnow()
             self.stats['collection_duration'] = (
                 collection_end - collection_start).total_seconds()
@@ -116,9 +132,9 @@ class NYC311Job:
 
             # Step 2: Query existing signals for duplicate detection
             logger.info("🔍 PHASE 2: DUPLICATE DETECTION")
-            existing_unique_keys = await self._get_existing_unique_keys()
+            existing_unique_keys = await self._get_existing_unique_keys(signals)
             logger.info(
-                f"📋 Found {len(existing_unique_keys)} existing 311 records for duplicate checking")
+                f"📋 Found {len(existing_unique_keys)} already stored 311 records among collected signals")
 
             # Step 3: Filter out duplicates using unique_key
             logger.info("🔄 PHASE 3: FILTERING DUPLICATES")
@@ -136,6 +152,7 @@ class NYC311Job:
             if not new_signals:
                 logger.info(
                     "ℹ️  No new 311 signals to store (all were duplicates)")
+                await self._commit_collection_checkpoints()
                 return self._generate_stats_report()
 
             # Step 4: Run triage analysis for severity scoring
@@ -164,6 +181,14 @@ class NYC311Job:
                 storage_end - storage_start).total_seconds()
             self.stats['signals_stored'] = stored_count
 
+            # Only move the checkpoints forward once everything collected is stored,
+            # so failed writes are collected again next run
+            if stored_count == len(scored_signals):
+                await self._commit_collection_checkpoints()
+            else:
+                logger.warning(
+                    "⚠️  Some signals were not stored - keeping previous collection checkpoints")
+
             # Final summary
             logger.info("🎉 === NYC 311 COLLECTION COMPLETED ===")
             logger.info(
@@ -248,40 +273,34 @@ class NYC311Job:
         logger.info(
             "   Severity distribution will be calculated after triage analysis")
 
-    async def _get_existing_unique_keys(self, days_back: int = 7) -> Set[str]:
+    async def _get_existing_unique_keys(self, signals: List[Dict]) -> Set[str]:
         """
-        Get existing unique_key values from Firestore for duplicate detection
+        Find which collected signals are already stored, for duplicate detection
+
+        Signals are stored with their unique_key as the document ID, so the
+        candidate keys are looked up directly instead of loading every key
+        stored in the last few days.
 
         Args:
-            days_back: Number of days to look back for existing keys
+            signals: Collected signals
 
         Returns:
-            Set of existing unique_key values
+            Set of candidate unique_key values that already exist
         """
         try:
-            # Query recent documents to build duplicate detection set
-            cutoff_time = datetime.utcnow() - timedelta(days=days_back)
-
-            # Use direct Firestore query for efficiency
-            query = (self.storage.db.collection(self.collection_name)
-                     .where(filter=firestore.FieldFilter('created_at', '>=', cutoff_time))
-                     .select(['unique_key']))  # Only fetch unique_key field for efficiency
+            candidate_keys = [signal.get('metadata', {}).get('unique_key')
+                              for signal in signals]
+            candidate_keys = [key for key in candidate_keys if key]
 
-            docs = query.stream()
-            existing_keys = set()
-
-            for doc in docs:
-                data = doc.to_dict()
-                unique_key = data.get('unique_key')
-                if unique_key:
-                    existing_keys.add(unique_key)
+            existing_keys = await self.storage.existing_document_ids(
+                self.collection_name, candidate_keys)
 
             logger.info(
-                f"✅ Loaded {len(existing_keys)} existing unique keys for duplicate detection")
+                f"✅ Checked {len(candidate_keys)} candidate unique keys, {len(existing_keys)} already stored")
             return existing_keys
 
         except Exception as e:
-            logger.error(f"❌ Error getting existing unique keys: {e}")
+            logger.error(f"❌ Error checking existing unique keys: {e}")
             # Return empty set to continue with processing (will skip duplicate detection)
             return set()
 
@@ -296,12 +315,8 @@ class NYC311Job:
         Returns:
             List of new (non-duplicate) signals
         """
-        if not existing_keys:
-            logger.warning(
-                "⚠️  No existing keys loaded - skipping duplicate detection")
-            return signals
-
         new_signals = []
+        seen_keys = set(existing_keys)
 
         for signal in signals:
             unique_key = signal.get('metadata', {}).get('unique_key')
@@ -313,7 +328,8 @@ class NYC311Job:
                 new_signals.append(signal)
                 continue
 
-            if unique_key not in existing_keys:
+            if unique_key not in seen_keys:
+                seen_keys.add(unique_key)
                 new_signals.append(signal)
             # else: duplicate found, skip this signal
 
@@ -321,7 +337,8 @@ class NYC311Job:
 
     async def _store_signals(self, signals: List[Dict]) -> int:
         """
-        Store NYC 311 signals directly in Firestore with AI-calculated severity scores
+        Store NYC 311 signals directly in Firestore with AI-calculated severity scores,
+        using batched writes
 
         Args:
             signals: List of 311 signals with severity scores from triage analysis
@@ -332,7 +349,7 @@ class NYC311Job:
         logger.info(f"📦 STORING {len(signals)} NEW 311 SIGNALS")
         logger.info(f"   Target Collection: {self.collection_name}")
 
-        stored_count = 0
+        documents = []
         failed_count = 0
 
         for i, signal in enumerate(signals, 1):
@@ -391,31 +408,51 @@ class NYC311Job:
                 }
 
                 # Store with unique_key as document ID for guaranteed uniqueness
-                doc_ref = self.storage.db.collection(
-                    self.collection_name).document(unique_key)
-                doc_ref.set(doc_data)
-
-                stored_count += 1
-
-                if i % 100 == 0:  # Log progress every 100 items
-                    logger.info(
-                        f"📝 Progress: {i}/{len(signals)} signals stored")
+                documents.append((unique_key, doc_data))
 
             except Exception as e:
                 failed_count += 1
-                error_msg = f"❌ Failed to store signal {i}: {str(e)}"
+                error_msg = f"❌ Failed to prepare signal {i}: {str(e)}"
                 logger.error(error_msg)
                 self.stats['errors'].append(error_msg)
                 continue
 
+        stored_count = 0
+        if documents:
+            try:
+                report = await self.storage.bulk_set(
+                    self.collection_name, documents, check_existing=True)
+                stored_count = report['written']
+                failed_count += report['failed']
+                for unique_key, error in report['errors'].items():
+                    self.stats['errors'].append(
+                        f"❌ Failed to store signal {unique_key}: {error}")
+                self.stats['storage_batches'] = report['batches']
+                self.stats['storage_retries'] = report['retries']
+                await self.storage.record_alert_counts(
+                    self.collection_name, documents, report)
+            except Exception as e:
+                failed_count += len(documents)
+                error_msg = f"❌ Failed to store {len(documents)} signals: {str(e)}"
+                logger.error(error_msg)
+                self.stats['errors'].append(error_msg)
+
         # Summary
         logger.info(f"📊 STORAGE SUMMARY:")
         logger.info(f"   ✅ Stored: {stored_count}")
         logger.info(f"   ❌ Failed: {failed_count}")
+        logger.info(f"   📦 Batches: {self.stats['storage_batches']}")
         logger.info(f"   📍 Collection: {self.collection_name}")
 
         return stored_count
 
+    async def _commit_collection_checkpoints(self):
+        """Persist the collection checkpoints reached by this run"""
+        checkpoints = self.collector.commit_checkpoints()
+        if await self.storage.save_collector_checkpoints(self.collector.source_name, checkpoints):
+            logger.info(
+                f"📌 Saved 311 collection checkpoints for {len(checkpoints)} query families")
+
     def _map_severity_to_priority(self, severity: int) -> str:
         """
         Map numeric severity to priority string (consistent with monitor alerts)
@@ -441,7 +478,7 @@ class NYC311Job:
             }
 
             doc_ref = self.storage.db.collection('nyc311_job_runs').document()
-            doc_ref.set(stats_doc)
+            await run_firestore(doc_ref.set, stats_doc)
 
         except Exception as e:
             logger.error(f"Error storing job stats: {e}")
@@ -469,7 +506,12 @@ class NYC311Job:
             # Performance metrics
             'collection_duration_seconds': self.stats['collection_duration'],
             'storage_duration_seconds': self.stats['storage_duration'],
+            'storage_batches': self.stats['storage_batches'],
+            'storage_retries': self.stats['storage_retries'],
             'triage_analysis_duration_seconds': self.stats['triage_analysis_time'],
+            'triage_shards': self.stats['triage_shards'],
+            'rule_triaged': self.stats['rule_triaged'],
+            'llm_triaged': self.stats['llm_triaged'],
             'efficiency_percent': (self.stats['signals_stored'] / self.stats['signals_collected'] * 100) if self.stats['signals_collected'] > 0 else 0,
 
             # Data composition
@@ -490,12 +532,58 @@ class NYC311Job:
         """
         Run triage analysis on 311 signals to assign severity scores
 
+        Routine complaints are scored locally by rule pre-triage; only
+        ambiguous or high-impact signals go to the triage agent, and any it
+        cannot score keep their rule severity.
+
         Args:
             signals: List of 311 signals to analyze
 
         Returns:
             List of signals with severity scores added
         """
+        rule_scored, candidates = pre_triage_311(signals)
+        self.stats['rule_triaged'] = len(rule_scored)
+        self.stats['llm_triaged'] = len(candidates)
+
+        scored_signals = [self._apply_rule_severity(signal, verdict, 'rule_based')
+                          for signal, verdict in rule_scored]
+        if candidates:
+            scored_signals.extend(await self._run_llm_triage(
+                [self._apply_rule_severity(signal, verdict, 'rule_fallback')
+                 for signal, verdict in candidates]))
+
+        # Log severity distribution
+        severity_counts = {}
+        for signal in scored_signals:
+            priority = signal['priority']
+            severity_counts[priority] = severity_counts.get(priority, 0) + 1
+
+        logger.info(f"📊 Severity distribution: {severity_counts}")
+        self.stats['severity_distribution'] = severity_counts
+
+        return scored_signals
+
+    def _apply_rule_severity(self, signal: Dict, verdict: RuleVerdict, triage_method: str) -> Dict:
+        """Copy a signal with its rule pre-triage severity"""
+        signal_copy = signal.copy()
+        signal_copy['severity'] = verdict.severity
+        signal_copy['priority'] = self._map_severity_to_priority(
+            verdict.severity)
+        signal_copy['triage_method'] = triage_method
+        return signal_copy
+
+    async def _run_llm_triage(self, signals: List[Dict]) -> List[Dict]:
+        """
+        Run AI triage on the signals rule pre-triage could not settle
+
+        Args:
+            signals: Rule-scored 311 signals needing an AI verdict
+
+        Returns:
+            The signals with AI severity where the agent matched them, rule
+            severity otherwise
+        """
         try:
             logger.info(
                 f"🧠 Running AI triage analysis on {len(signals)} 311 signals")
@@ -510,36 +598,26 @@ class NYC311Job:
 
             # Run triage analysis
             triage_results = await self.triage_agent.analyze_signals(signals_for_triage)
+            self.stats['triage_shards'] = triage_results.get('shard_stats', {})
 
             if not triage_results or not triage_results.get('alerts'):
                 logger.warning(
-                    "⚠️  Triage agent returned no alerts for 311 signals")
-                return []
+                    "⚠️  Triage agent returned no alerts for 311 signals - keeping rule severity")
+                return signals
 
             # Map triage results back to original signals
             scored_signals = self._map_triage_results_to_signals(
-                signals, triage_results)
+                list(signals), triage_results)
 
             # Log triage summary
             summary = triage_results.get('summary', 'No summary available')
             logger.info(f"✅ Triage analysis complete: {summary}")
 
-            # Log severity distribution
-            severity_counts = {}
-            for signal in scored_signals:
-                severity = signal.get('severity', 3)
-                priority = self._map_severity_to_priority(severity)
-                severity_counts[priority] = severity_counts.get(
-                    priority, 0) + 1
-
-            logger.info(f"📊 Severity distribution: {severity_counts}")
-            self.stats['severity_distribution'] = severity_counts
-
             return scored_signals
 
         except Exception as e:
             logger.error(f"❌ Error in 311 triage analysis: {str(e)}")
-            return []
+            return signals
 
     def _map_triage_results_to_signals(self, original_signals: List[Dict], triage_results: Dict) -> List[Dict]:
         """
@@ -603,19 +681,21 @@ class NYC311Job:
                         # Remove from unmatched list
                         original_signals.remove(best_match)
 
-            # For any remaining unmatched signals, apply simple defaults
+            # For any remaining unmatched signals, keep the rule pre-triage
+            # severity, or apply simple defaults
             for signal in original_signals:
-                metadata = signal.get('metadata', {})
-                is_emergency = metadata.get('is_emergency', False)
+                signal_copy = signal.copy()
+                if 'severity' not in signal:
+                    metadata = signal.get('metadata', {})
+                    is_emergency = metadata.get('is_emergency', False)
 
-                # Use metadata hints for unmatched signals
-                severity = 8 if is_emergency else 4  # Emergency or medium default
+                    # Use metadata hints for unmatched signals
+                    severity = 8 if is_emergency else 4  # Emergency or medium default
 
-                signal_copy = signal.copy()
-                signal_copy['severity'] = severity
-                signal_copy['priority'] = self._map_severity_to_priority(
-                    severity)
-                signal_copy['triage_method'] = 'metadata_based'
+                    signal_copy['severity'] = severity
+                    signal_copy['priority'] = self._map_severity_to_priority(
+                        severity)
+                    signal_copy['triage_method'] = 'metadata_based'
                 signal_copy['ai_alert_match'] = None
                 signal_copy['ai_confidence'] = 0.0
 
@@ -630,7 +710,7 @@ class NYC311Job:
 
             logger.info(f"✅ AI-based severity mapping complete:")
             logger.info(f"   Matched to AI alerts: {len(alerts)}")
-            logger.info(f"   Metadata-based defaults: {len(original_signals)}")
+            logger.info(f"   Rule/metadata-based defaults: {len(original_signals)}")
             logger.info(f"   Severity distribution: {severity_counts}")
 
             self.stats['severity_distribution'] = severity_counts
@@ -0,0 +1,297 @@
+"""
+Hourly alert counter buckets for NYC Monitor System.
+
+Each write of monitor alerts or 311 signals increments one bucket document per
+hour touched (alert_counters/{collection}/hours/{YYYYMMDDHH}) with the total
+and per-source, per-category and per-priority counts. Counting a window then
+reads one small document per hour instead of every alert in it.
+
+Only documents a write actually created are counted - overwrites of an
+existing document ID are not. A window starting mid-hour reads the buckets
+from the next full hour and counts the partial hour before it from the
+documents themselves, so counts are exact rather than rounded to the hour.
+
+Buckets only exist from the hour after counting started (recorded in
+alert_counters/{collection}.counting_since); windows reaching further back are
+counted with a Firestore count() aggregation query instead.
+"""
+import asyncio
+import logging
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from google.api_core import exceptions as core_exceptions
+from google.cloud import firestore
+
+from monitor.storage.firestore_pool import run_firestore, stream_query
+from monitor.types.alert_categories import (categorize_311_complaint, get_alert_type_info,
+                                            normalize_category)
+
+logger = logging.getLogger(__name__)
+
+ALERT_COUNTERS_COLLECTION = 'alert_counters'
+HOURS_SUBCOLLECTION = 'hours'
+BUCKET_ID_FORMAT = '%Y%m%d%H'
+
+# Firestore accepts at most 500 writes per batch
+COUNTER_BATCH_SIZE = 500
+
+
+def severity_priority(severity) -> str:
+    """Priority band of a severity score (the bands the alerts API reports)"""
+    try:
+        severity = float(severity)
+    except (TypeError, ValueError):
+        severity = 0
+    if severity >= 8:
+        return 'critical'
+    elif severity >= 6:
+        return 'high'
+    elif severity >= 4:
+        return 'medium'
+    return 'low'
+
+
+def _monitor_counter_key(data: Dict) -> Tuple[str, str, str]:
+    """(source, category, priority) of a monitor alert document"""
+    original_alert = data.get('original_alert') or {}
+    signals = (original_alert.get('original_alert_data') or {}).get('signals') or []
+    source = signals[0] if signals else 'monitor'
+    return (source, normalize_category(data.get('category', 'general')),
+            severity_priority(data.get('severity', 5)))
+
+
+def _signal_counter_key(data: Dict) -> Tuple[str, str, str]:
+    """(source, category, priority) of a 311 signal document"""
+    severity = data.get('severity')
+    if severity is None:
+        severity = 7 if data.get('is_emergency', False) else 3
+    category = data.get('category')
+    if not category:
+        event_type = data.get('event_type') or categorize_311_complaint(
+            data.get('complaint_type', ''))
+        category = get_alert_type_info(event_type).category.value
+    return '311', normalize_category(category), severity_priority(severity)
+
+
+# Counted collection -> (field a document's hour is taken from, breakdown key)
+COUNTED_COLLECTIONS: Dict[str, Tuple[str, Callable[[Dict], Tuple[str, str, str]]]] = {
+    'nyc_monitor_alerts': ('created_at', _monitor_counter_key),
+    'nyc_311_signals': ('signal_timestamp', _signal_counter_key),
+}
+
+
+def as_utc_naive(value) -> Optional[datetime]:
+    """Naive UTC datetime of a Firestore timestamp or ISO string, None if neither"""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def floor_hour(value: datetime) -> datetime:
+    """Start of the hour a (naive UTC) time falls in"""
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def ceil_hour(value: datetime) -> datetime:
+    """Start of the first hour at or after a (naive UTC) time"""
+    start = floor_hour(value)
+    return start if start == value else start + timedelta(hours=1)
+
+
+def _empty_counts() -> Dict:
+    return {'total': 0, 'by_source': {}, 'by_category': {}, 'by_priority': {}}
+
+
+class AlertCounters:
+    """Reads and increments the hourly counter buckets of the alert collections"""
+
+    def __init__(self, db: firestore.Client):
+        """
+        Initialize the counters
+
+        Args:
+            db: Firestore client
+        """
+        self.db = db
+        # collection -> first fully counted hour (never changes once set)
+        self._counting_since: Dict[str, datetime] = {}
+
+    def _meta_reference(self, collection: str) -> firestore.DocumentReference:
+        return self.db.collection(ALERT_COUNTERS_COLLECTION).document(collection)
+
+    def _hours_reference(self, collection: str):
+        return self._meta_reference(collection).collection(HOURS_SUBCOLLECTION)
+
+    async def record(self, collection: str, documents: Iterable[Dict]) -> int:
+        """
+        Increment the buckets for newly written documents
+
+        Call once per document actually created (not for overwrites), after
+        the write succeeded.
+
+        Args:
+            collection: Counted collection the documents were written to
+            documents: Stored document data
+
+        Returns:
+            Number of documents counted
+        """
+        time_field, counter_key = COUNTED_COLLECTIONS[collection]
+        await self._start_counting(collection)
+
+        buckets: Dict[datetime, Dict[str, Counter]] = {}
+        counted = 0
+        for data in documents:
+            written = as_utc_naive(data.get(time_field))
+            if written is None:
+                continue
+            source, category, priority = counter_key(data)
+            bucket = buckets.setdefault(floor_hour(written), {
+                'total': Counter(), 'by_source': Counter(),
+                'by_category': Counter(), 'by_priority': Counter()})
+            bucket['total']['total'] += 1
+            bucket['by_source'][source] += 1
+            bucket['by_category'][category] += 1
+            bucket['by_priority'][priority] += 1
+            counted += 1
+
+        writes = []
+        hours_ref = self._hours_reference(collection)
+        for hour, bucket in buckets.items():
+            increments = {
+                'hour': hour,
+                'total': firestore.Increment(bucket['total']['total']),
+                'updated_at': datetime.utcnow()
+            }
+            for field in ('by_source', 'by_category', 'by_priority'):
+                increments[field] = {value: firestore.Increment(count)
+                                     for value, count in bucket[field].items()}
+            writes.append((hours_ref.document(hour.strftime(BUCKET_ID_FORMAT)), increments))
+
+        for i in range(0, len(writes), COUNTER_BATCH_SIZE):
+            batch = self.db.batch()
+            for doc_ref, increments in writes[i:i + COUNTER_BATCH_SIZE]:
+                batch.set(doc_ref, increments, merge=True)
+            await run_firestore(batch.commit)
+
+        return counted
+
+    async def _start_counting(self, collection: str):
+        """Record when counting started, the first time a collection is counted"""
+        if collection in self._counting_since:
+            return
+        # Documents already written this hour were not counted: start at the next one
+        counting_since = floor_hour(datetime.utcnow()) + timedelta(hours=1)
+        try:
+            await run_firestore(self._meta_reference(collection).create,
+                                {'collection': collection, 'counting_since': counting_since})
+            logger.info(
+                f"🔢 Started hourly counters for {collection} (complete from {counting_since.isoformat()})")
+        except core_exceptions.AlreadyExists:
+            pass
+        await self.get_counting_since(collection)
+
+    async def get_counting_since(self, collection: str) -> Optional[datetime]:
+        """First hour the buckets of a collection are complete from, None if not counting yet"""
+        if collection not in self._counting_since:
+            snapshot = await run_firestore(self._meta_reference(collection).get)
+            if not snapshot.exists:
+                return None
+            self._counting_since[collection] = as_utc_naive(
+                snapshot.to_dict().get('counting_since'))
+        return self._counting_since[collection]
+
+    async def count(self, collection: str, since: datetime) -> Dict:
+        """
+        Count a collection's documents from a time onwards
+
+        Args:
+            collection: Counted collection
+            since: Start of the window (naive UTC)
+
+        Returns:
+            Dict with 'total', 'counted_since' and 'method'. Bucket counts
+            ('method': 'buckets') read the buckets from the first full hour
+            after `since`, count the partial hour before it from its documents
+            and add 'by_source', 'by_category' and 'by_priority'; older
+            windows fall back to an exact count() aggregation
+            ('method': 'aggregation') without a breakdown.
+        """
+        start = ceil_hour(since)
+        counting_since = await self.get_counting_since(collection)
+        if counting_since is None or start < counting_since:
+            return {
+                'total': await self.count_documents(collection, since),
+                'counted_since': since.isoformat(),
+                'method': 'aggregation'
+            }
+
+        query = self._hours_reference(collection).where(
+            filter=firestore.FieldFilter('hour', '>=', start))
+        counts = _empty_counts()
+        buckets, edge_documents = await asyncio.gather(
+            stream_query(query), self._count_edge(collection, since, start))
+        for data in [snapshot.to_dict() for snapshot in buckets] + [edge_documents]:
+            counts['total'] += data.get('total', 0)
+            for field in ('by_source', 'by_category', 'by_priority'):
+                totals = counts[field]
+                for value, count in (data.get(field) or {}).items():
+                    totals[value] = totals.get(value, 0) + count
+
+        return {
+            **counts,
+            'counted_since': since.isoformat(),
+            'method': 'buckets',
+            'buckets_read': len(buckets)
+        }
+
+    async def _count_edge(self, collection: str, since: datetime, until: datetime) -> Dict:
+        """Counts of the documents in the partial hour [since, until), read one by one"""
+        counts = _empty_counts()
+        if since >= until:
+            return counts
+
+        time_field, counter_key = COUNTED_COLLECTIONS[collection]
+        query = self.db.collection(collection).where(
+            filter=firestore.FieldFilter(time_field, '>=', since)).where(
+            filter=firestore.FieldFilter(time_field, '<', until))
+        for snapshot in await stream_query(query):
+            counts['total'] += 1
+            for field, value in zip(('by_source', 'by_category', 'by_priority'),
+                                    counter_key(snapshot.to_dict())):
+                counts[field][value] = counts[field].get(value, 0) + 1
+        return counts
+
+    async def count_documents(self, collection: str, since: datetime) -> int:
+        """Exact number of documents in the window, via a count() aggregation query"""
+        time_field, _ = COUNTED_COLLECTIONS[collection]
+        query = self.db.collection(collection).where(
+            filter=firestore.FieldFilter(time_field, '>=', since))
+        results = await run_firestore(query.count(alias='total').get)
+        return int(results[0][0].value) if results and results[0] else 0
+
+
+def written_documents(documents: List[Tuple[str, Dict]], report: Dict) -> List[Dict]:
+    """
+    Data of the documents a bulk_set report says were created
+
+    Failed writes, overwrites of documents that already existed (the report's
+    'existing' IDs) and all but the last write of an ID repeated within the
+    call are left out, so each stored document is counted exactly once.
+    """
+    skipped = set(report.get('errors') or {}) | set(report.get('existing') or ())
+    created = {}
+    for document_id, data in documents:
+        if document_id not in skipped:
+            created.pop(document_id, None)
+            created[document_id] = data
+    return list(created.values())
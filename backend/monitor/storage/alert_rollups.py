@@ -0,0 +1,281 @@
+"""
+Hourly and daily rollups of alerts and monitor runs for NYC Monitor System.
+
+Whenever a scheduler job writes alerts, one rollup document per hour and per
+day touched (rollups/{stream}/hour/{YYYYMMDDHH}, rollups/{stream}/day/{YYYYMMDD})
+is updated with field transforms: count and severity sum (Increment), severity
+min/max and latest time in epoch seconds (Minimum/Maximum - the transforms
+only take numbers), and per-source and per-category
+counts - overall and per topic, category and borough. Monitor runs roll up
+run, success, signal and alert totals the same way.
+
+Reading a window takes the hourly rollups up to the first midnight and daily
+rollups after it, so dashboards and trending queries read a few dozen
+documents instead of every alert. Windows are aligned to the hour.
+"""
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from google.cloud import firestore
+
+from monitor.storage.alert_counters import COUNTED_COLLECTIONS, as_utc_naive, floor_hour
+from monitor.storage.firestore_pool import run_firestore, stream_query
+
+logger = logging.getLogger(__name__)
+
+ROLLUPS_COLLECTION = 'rollups'
+MONITOR_RUNS_STREAM = 'monitor_runs'
+HOUR_PERIOD = 'hour'
+DAY_PERIOD = 'day'
+PERIOD_ID_FORMATS = {HOUR_PERIOD: '%Y%m%d%H', DAY_PERIOD: '%Y%m%d'}
+
+# Dimensions alerts are rolled up by, and the field holding each one's groups
+ROLLUP_DIMENSIONS = {'topic': 'by_topic', 'category': 'by_category', 'borough': 'by_borough'}
+# Longest topic kept as a map key (topics are alert titles)
+MAX_TOPIC_LENGTH = 200
+
+# Firestore accepts at most 500 writes per batch
+ROLLUP_BATCH_SIZE = 500
+
+# Fields merged with min / max when rollups are combined; other numbers are summed
+MIN_FIELDS = {'severity_min'}
+MAX_FIELDS = {'severity_max', 'latest_epoch'}
+
+
+def floor_day(value: datetime) -> datetime:
+    """Start of the (UTC) day a naive UTC time falls in"""
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _group_key(value, default: str = 'Unknown') -> str:
+    key = str(value or '').strip()[:MAX_TOPIC_LENGTH]
+    return key or default
+
+
+def _alert_dimensions(data: Dict, category: str) -> Dict[str, str]:
+    """Topic, category and borough of a monitor alert or 311 signal document"""
+    original_alert = data.get('original_alert') or {}
+    return {
+        'topic': _group_key(data.get('topic') or data.get('complaint_type')),
+        'category': category,
+        'borough': _group_key(data.get('borough') or original_alert.get('borough')),
+    }
+
+
+def _new_stats() -> Dict:
+    return {'count': 0, 'severity_sum': 0, 'severity_min': None, 'severity_max': None,
+            'latest_epoch': None, 'sources': {}, 'categories': {}}
+
+
+def _add_to_stats(stats: Dict, severity: float, written: datetime, source: str, category: str):
+    stats['count'] += 1
+    stats['severity_sum'] += severity
+    if stats['severity_min'] is None or severity < stats['severity_min']:
+        stats['severity_min'] = severity
+    if stats['severity_max'] is None or severity > stats['severity_max']:
+        stats['severity_max'] = severity
+    written_epoch = written.replace(tzinfo=timezone.utc).timestamp()
+    if stats['latest_epoch'] is None or written_epoch > stats['latest_epoch']:
+        stats['latest_epoch'] = written_epoch
+    stats['sources'][source] = stats['sources'].get(source, 0) + 1
+    stats['categories'][category] = stats['categories'].get(category, 0) + 1
+
+
+def _stats_transforms(stats: Dict) -> Dict:
+    """Field transforms that fold locally aggregated stats into a rollup document"""
+    return {
+        'count': firestore.Increment(stats['count']),
+        'severity_sum': firestore.Increment(stats['severity_sum']),
+        'severity_min': firestore.Minimum(stats['severity_min']),
+        'severity_max': firestore.Maximum(stats['severity_max']),
+        'latest_epoch': firestore.Maximum(stats['latest_epoch']),
+        'sources': {key: firestore.Increment(count) for key, count in stats['sources'].items()},
+        'categories': {key: firestore.Increment(count) for key, count in stats['categories'].items()},
+    }
+
+
+def merge_rollup(into: Dict, data: Dict) -> Dict:
+    """
+    Fold one rollup document (or part of one) into a running total
+
+    Numbers are summed, MIN_FIELDS/MAX_FIELDS take the min/max, maps are
+    merged recursively and anything else is ignored.
+    """
+    for key, value in data.items():
+        if isinstance(value, dict):
+            merge_rollup(into.setdefault(key, {}), value)
+        elif key in MIN_FIELDS or key in MAX_FIELDS:
+            if value is None:
+                continue
+            current = into.get(key)
+            if current is None:
+                into[key] = value
+            elif key in MIN_FIELDS:
+                into[key] = min(current, value)
+            else:
+                into[key] = max(current, value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            into[key] = into.get(key, 0) + value
+    return into
+
+
+def latest_time(stats: Dict) -> Optional[datetime]:
+    """Latest alert time of a rolled up group (naive UTC)"""
+    latest_epoch = stats.get('latest_epoch')
+    if latest_epoch is None:
+        return None
+    return datetime.fromtimestamp(latest_epoch, tz=timezone.utc).replace(tzinfo=None)
+
+
+def average_severity(stats: Dict) -> float:
+    """Mean severity of a rolled up group"""
+    count = stats.get('count', 0)
+    return stats.get('severity_sum', 0) / count if count else 0.0
+
+
+class AlertRollups:
+    """Writes and reads the hourly and daily rollup documents"""
+
+    def __init__(self, db: firestore.Client):
+        """
+        Initialize the rollups
+
+        Args:
+            db: Firestore client
+        """
+        self.db = db
+
+    def _period_reference(self, stream: str, period: str):
+        return self.db.collection(ROLLUPS_COLLECTION).document(stream).collection(period)
+
+    async def _apply(self, stream: str, hours: Dict[datetime, Dict], to_transforms: Callable[[Dict], Dict]):
+        """
+        Fold per-hour rollup values into the hourly and daily documents of a stream
+
+        Args:
+            stream: Alert collection name or MONITOR_RUNS_STREAM
+            hours: Start of hour -> locally aggregated values
+            to_transforms: Turns aggregated values into field transforms
+        """
+        days: Dict[datetime, Dict] = {}
+        for hour, values in hours.items():
+            merge_rollup(days.setdefault(floor_day(hour), {}), values)
+        writes = ([(HOUR_PERIOD, hour, values) for hour, values in hours.items()] +
+                  [(DAY_PERIOD, day, values) for day, values in days.items()])
+
+        for i in range(0, len(writes), ROLLUP_BATCH_SIZE):
+            batch = self.db.batch()
+            for period, start, values in writes[i:i + ROLLUP_BATCH_SIZE]:
+                doc_ref = self._period_reference(stream, period).document(
+                    start.strftime(PERIOD_ID_FORMATS[period]))
+                batch.set(doc_ref, {**to_transforms(values), 'period': period, 'start': start,
+                                    'updated_at': datetime.utcnow()}, merge=True)
+            await run_firestore(batch.commit)
+
+    async def record_alerts(self, collection: str, documents: Iterable[Dict]) -> int:
+        """
+        Roll up newly written alert documents
+
+        Args:
+            collection: Alert collection the documents were written to
+            documents: Stored document data
+
+        Returns:
+            Number of documents rolled up
+        """
+        time_field, counter_key = COUNTED_COLLECTIONS[collection]
+        hours: Dict[datetime, Dict] = {}
+        rolled_up = 0
+        for data in documents:
+            written = as_utc_naive(data.get(time_field))
+            if written is None:
+                continue
+            source, category, _ = counter_key(data)
+            try:
+                severity = float(data.get('severity') or 0)
+            except (TypeError, ValueError):
+                severity = 0.0
+            dimensions = _alert_dimensions(data, category)
+
+            rollup = hours.setdefault(floor_hour(written), {
+                'total': _new_stats(), **{field: {} for field in ROLLUP_DIMENSIONS.values()}})
+            _add_to_stats(rollup['total'], severity, written, source, dimensions['category'])
+            for dimension, field in ROLLUP_DIMENSIONS.items():
+                group = rollup[field].setdefault(dimensions[dimension], _new_stats())
+                _add_to_stats(group, severity, written, source, dimensions['category'])
+            rolled_up += 1
+
+        await self._apply(collection, hours, self._alert_transforms)
+        return rolled_up
+
+    @staticmethod
+    def _alert_transforms(rollup: Dict) -> Dict:
+        transforms = {'total': _stats_transforms(rollup['total'])}
+        for field in ROLLUP_DIMENSIONS.values():
+            transforms[field] = {key: _stats_transforms(stats)
+                                 for key, stats in rollup[field].items()}
+        return transforms
+
+    async def record_monitor_run(self, run_stats: Dict, run_at: datetime):
+        """
+        Roll up one monitor run
+
+        Args:
+            run_stats: Run statistics as stored in monitor_runs
+            run_at: When the run was stored (naive UTC)
+        """
+        values = {
+            'runs': 1,
+            'successful_runs': int(run_stats.get('status') == 'completed' and not run_stats.get('errors')),
+            'signals_collected': run_stats.get('total_signals_collected', 0) or 0,
+            'alerts_generated': run_stats.get('alerts_generated', 0) or 0,
+            'source_signals': {source: (stats or {}).get('signals_collected', 0) or 0
+                               for source, stats in (run_stats.get('source_stats') or {}).items()},
+        }
+        await self._apply(MONITOR_RUNS_STREAM, {floor_hour(run_at): values}, self._run_transforms)
+
+    @staticmethod
+    def _run_transforms(values: Dict) -> Dict:
+        transforms = {key: firestore.Increment(value)
+                      for key, value in values.items() if not isinstance(value, dict)}
+        transforms['source_signals'] = {source: firestore.Increment(count)
+                                        for source, count in values['source_signals'].items()}
+        return transforms
+
+    async def read_window(self, stream: str, since: datetime,
+                          now: Optional[datetime] = None) -> Tuple[Dict, int]:
+        """
+        Combine the rollups of a stream from the hour `since` falls in up to now
+
+        Args:
+            stream: Alert collection name or MONITOR_RUNS_STREAM
+            since: Start of the window (naive UTC)
+            now: End of the window (defaults to the current time)
+
+        Returns:
+            (combined rollup, number of rollup documents read)
+        """
+        now = now or datetime.utcnow()
+        start = floor_hour(since)
+        first_midnight = floor_day(start) if start == floor_day(start) else floor_day(start) + timedelta(days=1)
+
+        queries = []
+        if start < first_midnight:
+            queries.append(self._period_reference(stream, HOUR_PERIOD)
+                           .where(filter=firestore.FieldFilter('start', '>=', start))
+                           .where(filter=firestore.FieldFilter('start', '<', first_midnight)))
+        if first_midnight <= now:
+            queries.append(self._period_reference(stream, DAY_PERIOD)
+                           .where(filter=firestore.FieldFilter('start', '>=', first_midnight)))
+
+        combined: Dict = {}
+        read = 0
+        for snapshots in [await stream_query(query) for query in queries]:
+            for snapshot in snapshots:
+                data = snapshot.to_dict()
+                for field in ('period', 'start', 'updated_at'):
+                    data.pop(field, None)
+                merge_rollup(combined, data)
+                read += 1
+        return combined, read
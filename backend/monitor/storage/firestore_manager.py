@@ -2,26 +2,70 @@
 Firestore manager for storing and retrieving monitor alerts.
 Handles NYC-focused alerts with structured data including topic, confidence scores, and metadata.
 """
+import asyncio
 import os
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from google.api_core import exceptions as core_exceptions
 from google.cloud import firestore
 from google.cloud.firestore import Query
 import logging
 
+from monitor.storage.alert_counters import AlertCounters, written_documents
+from monitor.storage.alert_rollups import (MONITOR_RUNS_STREAM, AlertRollups, average_severity,
+                                           latest_time)
+from monitor.storage.firestore_pool import run_firestore, stream_query
+
 logger = logging.getLogger(__name__)
 
+# Bulk write tuning. Firestore accepts at most 500 writes per batch.
+BULK_WRITE_BATCH_SIZE = min(int(os.getenv('FIRESTORE_BULK_BATCH_SIZE', '500')), 500)
+BULK_WRITE_CONCURRENCY = int(os.getenv('FIRESTORE_BULK_CONCURRENCY', '4'))
+BULK_WRITE_MAX_RETRIES = int(os.getenv('FIRESTORE_BULK_MAX_RETRIES', '3'))
+BULK_WRITE_RETRY_BASE_SECONDS = 0.5
+
+# Document references per getAll request when checking which documents exist
+EXISTENCE_CHECK_CHUNK_SIZE = 300
+
+# Commit errors worth retrying; anything else is a problem with the data itself
+RETRYABLE_WRITE_ERRORS = (
+    core_exceptions.Aborted,
+    core_exceptions.DeadlineExceeded,
+    core_exceptions.InternalServerError,
+    core_exceptions.ResourceExhausted,
+    core_exceptions.ServiceUnavailable,
+)
+
 
 class FirestoreManager:
-    """Manages monitor alerts storage in Firestore"""
+    """
+    Manages monitor alerts storage in Firestore
+
+    Blocking client calls run on the shared Firestore thread pool
+    (monitor.storage.firestore_pool), so they never stall the event loop.
+    """
+
+    def __init__(self, project_id: Optional[str] = None, client: Optional[firestore.Client] = None):
+        """
+        Initialize Firestore client
 
-    def __init__(self, project_id: Optional[str] = None):
-        """Initialize Firestore client"""
+        Args:
+            project_id: Google Cloud project (defaults to GOOGLE_CLOUD_PROJECT)
+            client: Existing Firestore client (or an in-memory stand-in for tests)
+        """
         self.project_id = project_id or os.getenv('GOOGLE_CLOUD_PROJECT')
-        self.db = firestore.Client(project=self.project_id)
+        self.db = client if client is not None else firestore.Client(
+            project=self.project_id)
         self.alerts_collection = 'nyc_monitor_alerts'
         self.trends_collection = 'nyc_trending_topics'
         self.monitor_runs_collection = 'monitor_runs'
+        self.checkpoints_collection = 'collector_checkpoints'
+        self.triage_cache_collection = 'triage_cache'
+        self.hn_item_cache_collection = 'hn_item_cache'
+        self.geocode_cache_collection = 'geocode_cache'
+        self.alert_counters = AlertCounters(self.db)
+        self.alert_rollups = AlertRollups(self.db)
 
     async def store_alert(self, alert: Dict, document_id: Optional[str] = None) -> str:
         """
@@ -35,66 +79,9 @@ class FirestoreManager:
             Document ID of stored alert
         """
         try:
-            # Extract event date from alert title if it follows YYYY-MM-DD format
-            event_date = self._extract_event_date(alert)
-
-            # Convert triage agent format to Firestore format
-            alert_data = {
-                # Core alert information
-                'title': alert.get('title', 'Unknown Alert'),
-                'description': alert.get('description', ''),
-                'alert_id': alert.get('id', ''),
-                'area': alert.get('area', 'Unknown'),
-                'severity': alert.get('severity', 0),
-                'category': alert.get('category', 'general'),
-                'event_type': alert.get('event_type', 'general'),
-                'keywords': alert.get('keywords', []),
-
-                # Date and time information
-                'event_date': event_date,  # NEW: Actual event date
-                'created_at': datetime.utcnow(),
-                'updated_at': datetime.utcnow(),
-
-                # Location information
-                'coordinates': alert.get('coordinates', {}),
-                'venue_address': alert.get('venue_address', ''),
-                'specific_streets': alert.get('specific_streets', []),
-                'cross_streets': alert.get('cross_streets', []),
-                'transportation_impact': alert.get('transportation_impact', ''),
-
-                # Event details
-                'estimated_attendance': alert.get('estimated_attendance', ''),
-                'crowd_impact': alert.get('crowd_impact', 'unknown'),
-
-                # Sources and metadata
-                'signals': alert.get('signals', []),
-                'source': ', '.join(alert.get('signals', ['unknown'])),
-                'url': alert.get('url', ''),
-
-                # System metadata
-                'location': 'NYC',
-                'status': 'active',
-                'monitor_system_version': '1.0',
-
-                # Legacy compatibility (for existing queries)
-                'topic': alert.get('title', 'Unknown Alert'),
-                'alert_type': alert.get('category', 'general'),
-
-                # Preserve original triage data for debugging
-                'original_alert': alert
-            }
-
-            # Store in Firestore with custom document ID if provided
-            if document_id:
-                doc_ref = self.db.collection(
-                    self.alerts_collection).document(document_id)
-            elif alert.get('id'):
-                doc_ref = self.db.collection(
-                    self.alerts_collection).document(alert['id'])
-            else:
-                doc_ref = self.db.collection(self.alerts_collection).document()
-
-            doc_ref.set(alert_data)
+            alert_data = self._alert_document(alert)
+            doc_ref = self._alert_reference(alert, document_id)
+            await run_firestore(doc_ref.set, alert_data)
 
             # Enhanced logging for verification
             logger.info(f"✅ STORED ALERT - ID: {doc_ref.id}")
@@ -113,6 +100,241 @@ class FirestoreManager:
             logger.error(f"   Alert data: {alert}")
             raise
 
+    async def store_alerts(self, alerts: List[Dict],
+                           document_ids: Optional[List[Optional[str]]] = None) -> Dict:
+        """
+        Store many monitor alerts with batched writes
+
+        Args:
+            alerts: Alert dictionaries from the triage agent
+            document_ids: Optional custom document IDs, parallel to alerts
+
+        Returns:
+            Bulk write report (see bulk_set)
+        """
+        document_ids = document_ids or [None] * len(alerts)
+        documents = [(self._alert_reference(alert, document_id).id, self._alert_document(alert))
+                     for alert, document_id in zip(alerts, document_ids)]
+
+        report = await self.bulk_set(self.alerts_collection, documents, check_existing=True)
+        logger.info(
+            f"✅ STORED {report['written']}/{len(alerts)} ALERTS in {report['batches']} batches "
+            f"({report['failed']} failed, {report['duration_seconds']:.2f}s)")
+        await self.record_alert_counts(self.alerts_collection, documents, report)
+        return report
+
+    async def record_alert_counts(self, collection: str, documents: List[Tuple[str, Dict]],
+                                  report: Dict) -> int:
+        """
+        Add newly written alerts to the hourly counter buckets and the rollups
+
+        Args:
+            collection: Counted collection the documents were written to
+            documents: (document_id, data) pairs passed to bulk_set
+            report: bulk_set report, made with check_existing (failed writes and
+                    overwrites of existing documents are not counted)
+
+        Returns:
+            Number of documents counted (0 if the counters could not be updated)
+        """
+        written = written_documents(documents, report)
+        counted = 0
+        # Counts and rollups are derived data - never fail a write over them
+        try:
+            counted = await self.alert_counters.record(collection, written)
+        except Exception as e:
+            logger.error(f"❌ Failed to update alert counters for {collection}: {e}")
+        try:
+            await self.alert_rollups.record_alerts(collection, written)
+        except Exception as e:
+            logger.error(f"❌ Failed to update alert rollups for {collection}: {e}")
+        return counted
+
+    async def bulk_set(self, collection: str, documents: List[Tuple[Optional[str], Dict]],
+                       check_existing: bool = False) -> Dict:
+        """
+        Write many documents with batched commits
+
+        Documents are grouped into batches of up to BULK_WRITE_BATCH_SIZE writes
+        and committed with at most BULK_WRITE_CONCURRENCY commits in flight.
+        Transient commit errors are retried with exponential backoff. A batch
+        rejected for any other reason is retried one document at a time, so a
+        single bad document does not fail the rest of its batch.
+
+        Args:
+            collection: Target collection name
+            documents: (document_id, data) pairs; a None ID gets an auto-generated one
+            check_existing: Look the explicit IDs up before writing and report the
+                            ones that already existed (their writes are overwrites)
+
+        Returns:
+            Report with 'written', 'failed', 'errors' (document ID -> error message),
+            'document_ids' (in input order), 'existing' (IDs overwritten, only with
+            check_existing), 'batches', 'retries' and 'duration_seconds'
+        """
+        start_time = time.monotonic()
+        collection_ref = self.db.collection(collection)
+        writes = [(collection_ref.document(document_id) if document_id else collection_ref.document(), data)
+                  for document_id, data in documents]
+        chunks = [writes[i:i + BULK_WRITE_BATCH_SIZE]
+                  for i in range(0, len(writes), BULK_WRITE_BATCH_SIZE)]
+
+        report = {
+            'written': 0,
+            'failed': 0,
+            'errors': {},
+            'document_ids': [doc_ref.id for doc_ref, _ in writes],
+            'batches': len(chunks),
+            'retries': 0,
+            'duration_seconds': 0.0
+        }
+        if check_existing:
+            report['existing'] = []
+            try:
+                report['existing'] = sorted(await self.existing_document_ids(
+                    collection, [document_id for document_id, _ in documents if document_id]))
+            except Exception as e:
+                # Only the counts depend on it - write anyway
+                logger.warning(f"⚠️ Could not check existing {collection} documents: {e}")
+        semaphore = asyncio.Semaphore(BULK_WRITE_CONCURRENCY)
+
+        async def write_chunk(chunk: List[Tuple[firestore.DocumentReference, Dict]]):
+            async with semaphore:
+                error = await self._commit_with_retry(chunk, report)
+                if error is None:
+                    report['written'] += len(chunk)
+                    return
+
+                if len(chunk) > 1 and not isinstance(error, RETRYABLE_WRITE_ERRORS):
+                    # Batches are atomic - find the bad documents by writing them one by one
+                    logger.warning(
+                        f"⚠️ Batch of {len(chunk)} writes to {collection} rejected ({error}), retrying individually")
+                    for write in chunk:
+                        single_error = await self._commit_with_retry([write], report)
+                        if single_error is None:
+                            report['written'] += 1
+                        else:
+                            self._record_write_error(report, write[0].id, single_error)
+                    return
+
+                for doc_ref, _ in chunk:
+                    self._record_write_error(report, doc_ref.id, error)
+
+        await asyncio.gather(*(write_chunk(chunk) for chunk in chunks))
+
+        report['duration_seconds'] = time.monotonic() - start_time
+        return report
+
+    async def existing_document_ids(self, collection: str, document_ids: Iterable[str]) -> Set[str]:
+        """
+        Find which of the given document IDs already exist in a collection
+
+        Looks the candidates up directly with getAll (no fields are transferred),
+        so the cost follows the number of candidates, not the collection size.
+
+        Args:
+            collection: Collection name
+            document_ids: Candidate document IDs
+
+        Returns:
+            Subset of document_ids that exist
+        """
+        collection_ref = self.db.collection(collection)
+        candidates = list(dict.fromkeys(document_ids))
+        chunks = [candidates[i:i + EXISTENCE_CHECK_CHUNK_SIZE]
+                  for i in range(0, len(candidates), EXISTENCE_CHECK_CHUNK_SIZE)]
+
+        def check_chunk(chunk: List[str]) -> List[str]:
+            references = [collection_ref.document(document_id) for document_id in chunk]
+            return [snapshot.id for snapshot in self.db.get_all(references, field_paths=[])
+                    if snapshot.exists]
+
+        results = await asyncio.gather(*(run_firestore(check_chunk, chunk) for chunk in chunks))
+        return {document_id for found in results for document_id in found}
+
+    async def _commit_with_retry(self, writes: List[Tuple[firestore.DocumentReference, Dict]],
+                                 report: Dict) -> Optional[Exception]:
+        """Commit writes as one batch, returning the final error or None on success"""
+        for attempt in range(BULK_WRITE_MAX_RETRIES + 1):
+            batch = self.db.batch()
+            for doc_ref, data in writes:
+                batch.set(doc_ref, data)
+            try:
+                await run_firestore(batch.commit)
+                return None
+            except RETRYABLE_WRITE_ERRORS as e:
+                if attempt == BULK_WRITE_MAX_RETRIES:
+                    return e
+                report['retries'] += 1
+                await asyncio.sleep(BULK_WRITE_RETRY_BASE_SECONDS * (2 ** attempt))
+            except Exception as e:
+                return e
+
+    def _record_write_error(self, report: Dict, document_id: str, error: Exception):
+        report['failed'] += 1
+        report['errors'][document_id] = str(error)
+        logger.error(f"❌ Failed to write document {document_id}: {error}")
+
+    def _alert_reference(self, alert: Dict, document_id: Optional[str] = None) -> firestore.DocumentReference:
+        """Document reference for an alert: custom ID, then the alert's own ID, then auto-generated"""
+        collection_ref = self.db.collection(self.alerts_collection)
+        if document_id:
+            return collection_ref.document(document_id)
+        if alert.get('id'):
+            return collection_ref.document(alert['id'])
+        return collection_ref.document()
+
+    def _alert_document(self, alert: Dict) -> Dict:
+        """Convert a triage agent alert to its Firestore document"""
+        # Extract event date from alert title if it follows YYYY-MM-DD format
+        event_date = self._extract_event_date(alert)
+
+        # Convert triage agent format to Firestore format
+        return {
+            # Core alert information
+            'title': alert.get('title', 'Unknown Alert'),
+            'description': alert.get('description', ''),
+            'alert_id': alert.get('id', ''),
+            'area': alert.get('area', 'Unknown'),
+            'severity': alert.get('severity', 0),
+            'category': alert.get('category', 'general'),
+            'event_type': alert.get('event_type', 'general'),
+            'keywords': alert.get('keywords', []),
+
+            # Date and time information
+            'event_date': event_date,  # NEW: Actual event date
+            'created_at': datetime.utcnow(),
+            'updated_at': datetime.utcnow(),
+
+            # Location information
+            'coordinates': alert.get('coordinates', {}),
+            'venue_address': alert.get('venue_address', ''),
+            'specific_streets': alert.get('specific_streets', []),
+            'cross_streets': alert.get('cross_streets', []),
+            'transportation_impact': alert.get('transportation_impact', ''),
+
+            # Event details
+            'estimated_attendance': alert.get('estimated_attendance', ''),
+            'crowd_impact': alert.get('crowd_impact', 'unknown'),
+
+            # Sources and metadata
+            'signals': alert.get('signals', []),
+            'source': ', '.join(alert.get('signals', ['unknown'])),
+            'url': alert.get('url', ''),
+
+            # System metadata
+            'location': 'NYC',
+            'status': 'active',
+            'monitor_system_version': '1.0',
+
+            # Legacy compatibility (for existing queries)
+            'topic': alert.get('title', 'Unknown Alert'),
+            'alert_type': alert.get('category', 'general'),
+
+            # Preserve original triage data for debugging
+            'original_alert': alert
+        }
+
     def _extract_event_date(self, alert: Dict) -> Optional[datetime]:
         """
         Extract event date from alert data
@@ -164,7 +386,7 @@ class FirestoreManager:
                      .order_by('created_at', direction=firestore.Query.DESCENDING)
                      .limit(limit))
 
-            docs = query.stream()
+            docs = await stream_query(query)
             alerts = []
             for doc in docs:
                 alert_data = doc.to_dict()
@@ -197,7 +419,7 @@ class FirestoreManager:
                      .where(filter=firestore.FieldFilter('status', '==', 'active'))
                      .order_by('severity', direction=firestore.Query.DESCENDING))
 
-            docs = query.stream()
+            docs = await stream_query(query)
             alerts = []
             for doc in docs:
                 alert_data = doc.to_dict()
@@ -221,47 +443,22 @@ class FirestoreManager:
             List of trending topic dictionaries
         """
         try:
-            # Get alerts from last 6 hours and aggregate by topic
+            # Combine the topic rollups of the last 6 hours
             cutoff_time = datetime.utcnow() - timedelta(hours=6)
+            rollup, _ = await self.alert_rollups.read_window(self.alerts_collection, cutoff_time)
 
-            query = (self.db.collection(self.alerts_collection)
-                     .where(filter=firestore.FieldFilter('created_at', '>=', cutoff_time))
-                     .where(filter=firestore.FieldFilter('status', '==', 'active')))
-
-            docs = query.stream()
-
-            # Aggregate by topic
-            topic_stats = {}
-            for doc in docs:
-                alert = doc.to_dict()
-                topic = alert['topic']
-
-                if topic not in topic_stats:
-                    topic_stats[topic] = {
-                        'topic': topic,
-                        'alert_count': 0,
-                        'avg_severity': 0,
-                        'latest_alert': None,
-                        'sources': set()
-                    }
-
-                stats = topic_stats[topic]
-                stats['alert_count'] += 1
-                stats['avg_severity'] = (
-                    stats['avg_severity'] + alert.get('severity', 0)) / 2
-                stats['sources'].add(alert['source'])
-
-                if not stats['latest_alert'] or alert['created_at'] > stats['latest_alert']:
-                    stats['latest_alert'] = alert['created_at']
-
-            # Convert to list and sort by trending score
             trending = []
-            for topic, stats in topic_stats.items():
-                # Convert set to list for JSON serialization
-                stats['sources'] = list(stats['sources'])
-                trending_score = stats['alert_count'] * stats['avg_severity']
-                stats['trending_score'] = trending_score
-                trending.append(stats)
+            for topic, stats in rollup.get('by_topic', {}).items():
+                avg_severity = average_severity(stats)
+                trending.append({
+                    'topic': topic,
+                    'alert_count': stats.get('count', 0),
+                    'avg_severity': avg_severity,
+                    'max_severity': stats.get('severity_max'),
+                    'latest_alert': latest_time(stats),
+                    'sources': list(stats.get('sources', {})),
+                    'trending_score': stats.get('count', 0) * avg_severity
+                })
 
             # Sort by trending score and return top results
             trending.sort(key=lambda x: x['trending_score'], reverse=True)
@@ -271,6 +468,51 @@ class FirestoreManager:
             logger.error(f"Error retrieving trending topics: {str(e)}")
             return []
 
+    async def get_alert_rollup_summary(self, hours_back: int = 24,
+                                       collection: Optional[str] = None) -> Dict:
+        """
+        Get alert totals per category and borough for the last N hours from the rollups
+
+        Args:
+            hours_back: Number of hours to look back (aligned to the hour)
+            collection: Alert collection to summarize (defaults to monitor alerts)
+
+        Returns:
+            Dictionary with overall, per-category and per-borough count and severity stats
+        """
+        collection = collection or self.alerts_collection
+        try:
+            cutoff_time = datetime.utcnow() - timedelta(hours=hours_back)
+            rollup, rollups_read = await self.alert_rollups.read_window(collection, cutoff_time)
+
+            def summarize(stats: Dict) -> Dict:
+                return {
+                    'count': stats.get('count', 0),
+                    'avg_severity': average_severity(stats),
+                    'min_severity': stats.get('severity_min'),
+                    'max_severity': stats.get('severity_max'),
+                    'sources': stats.get('sources', {}),
+                    'categories': stats.get('categories', {})
+                }
+
+            return {
+                'period_hours': hours_back,
+                'collection': collection,
+                'total': summarize(rollup.get('total', {})),
+                'by_category': {key: summarize(stats) for key, stats in rollup.get('by_category', {}).items()},
+                'by_borough': {key: summarize(stats) for key, stats in rollup.get('by_borough', {}).items()},
+                'rollups_read': rollups_read,
+                'last_updated': datetime.utcnow().isoformat()
+            }
+
+        except Exception as e:
+            logger.error(f"Error reading alert rollups: {str(e)}")
+            return {
+                'error': str(e),
+                'period_hours': hours_back,
+                'last_updated': datetime.utcnow().isoformat()
+            }
+
     async def mark_alert_processed(self, alert_id: str) -> bool:
         """
         Mark an alert as processed
@@ -284,7 +526,7 @@ class FirestoreManager:
         try:
             doc_ref = self.db.collection(
                 self.alerts_collection).document(alert_id)
-            doc_ref.update({
+            await run_firestore(doc_ref.update, {
                 'status': 'processed',
                 'updated_at': datetime.utcnow()
             })
@@ -311,11 +553,11 @@ class FirestoreManager:
             query = (self.db.collection(self.alerts_collection)
                      .where(filter=firestore.FieldFilter('created_at', '<', cutoff_time)))
 
-            docs = query.stream()
+            docs = await stream_query(query)
             deleted_count = 0
 
             for doc in docs:
-                doc.reference.delete()
+                await run_firestore(doc.reference.delete)
                 deleted_count += 1
 
             logger.info(f"Cleaned up {deleted_count} old alerts")
@@ -340,10 +582,17 @@ class FirestoreManager:
 
             # Add server timestamp
             run_stats['server_timestamp'] = firestore.SERVER_TIMESTAMP
+            # Queryable run time (get_recent_monitor_runs orders by it)
+            run_stats.setdefault('created_at', datetime.utcnow())
 
             # Store in monitor_runs collection
             doc_ref = self.db.collection('monitor_runs').document()
-            doc_ref.set(run_stats)
+            await run_firestore(doc_ref.set, run_stats)
+
+            try:
+                await self.alert_rollups.record_monitor_run(run_stats, run_stats['created_at'])
+            except Exception as e:
+                logger.error(f"❌ Failed to update monitor run rollups: {e}")
 
             logger.info(
                 f"✅ Monitor run statistics stored with ID: {doc_ref.id}")
@@ -353,6 +602,221 @@ class FirestoreManager:
             logger.error(f"❌ Failed to store monitor run statistics: {e}")
             raise
 
+    async def get_collector_checkpoints(self, collector_name: str) -> Dict[str, Dict]:
+        """
+        Load a collector's incremental collection checkpoints
+
+        Args:
+            collector_name: Collector source name (e.g. 'nyc_311')
+
+        Returns:
+            Checkpoints by query family, empty if none are stored
+        """
+        try:
+            doc = await run_firestore(
+                self.db.collection(self.checkpoints_collection).document(collector_name).get)
+            if not doc.exists:
+                return {}
+            return doc.to_dict().get('checkpoints', {})
+
+        except Exception as e:
+            logger.error(
+                f"Error loading {collector_name} collector checkpoints: {str(e)}")
+            return {}
+
+    async def save_collector_checkpoints(self, collector_name: str, checkpoints: Dict[str, Dict]) -> bool:
+        """
+        Persist a collector's incremental collection checkpoints
+
+        Args:
+            collector_name: Collector source name (e.g. 'nyc_311')
+            checkpoints: Checkpoints by query family
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            doc_ref = self.db.collection(
+                self.checkpoints_collection).document(collector_name)
+            await run_firestore(doc_ref.set, {
+                'checkpoints': checkpoints,
+                'updated_at': datetime.utcnow()
+            })
+            return True
+
+        except Exception as e:
+            logger.error(
+                f"Error saving {collector_name} collector checkpoints: {str(e)}")
+            return False
+
+    async def get_collector_baselines(self, collector_name: str) -> Dict[str, Dict]:
+        """
+        Load a collector's rolling spike-detection baselines
+
+        Baselines can be large, so they live in their own document next to the checkpoints.
+
+        Args:
+            collector_name: Collector source name (e.g. 'nyc_311')
+
+        Returns:
+            Baselines by query family, empty if none are stored
+        """
+        try:
+            doc = await run_firestore(
+                self.db.collection(self.checkpoints_collection).document(f"{collector_name}_baselines").get)
+            if not doc.exists:
+                return {}
+            return doc.to_dict().get('baselines', {})
+
+        except Exception as e:
+            logger.error(
+                f"Error loading {collector_name} collector baselines: {str(e)}")
+            return {}
+
+    async def save_collector_baselines(self, collector_name: str, baselines: Dict[str, Dict]) -> bool:
+        """
+        Persist a collector's rolling spike-detection baselines
+
+        Args:
+            collector_name: Collector source name (e.g. 'nyc_311')
+            baselines: Baselines by query family
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            doc_ref = self.db.collection(
+                self.checkpoints_collection).document(f"{collector_name}_baselines")
+            await run_firestore(doc_ref.set, {
+                'baselines': baselines,
+                'updated_at': datetime.utcnow()
+            })
+            return True
+
+        except Exception as e:
+            logger.error(
+                f"Error saving {collector_name} collector baselines: {str(e)}")
+            return False
+
+    async def _get_documents(self, collection: str, keys: List[str]) -> Dict[str, Dict]:
+        """Load documents by ID in batched reads, skipping the ones that do not exist"""
+        collection_ref = self.db.collection(collection)
+        chunks = [keys[i:i + EXISTENCE_CHECK_CHUNK_SIZE]
+                  for i in range(0, len(keys), EXISTENCE_CHECK_CHUNK_SIZE)]
+
+        def load_chunk(chunk: List[str]) -> Dict[str, Dict]:
+            references = [collection_ref.document(key) for key in chunk]
+            return {snapshot.id: snapshot.to_dict()
+                    for snapshot in self.db.get_all(references) if snapshot.exists}
+
+        results = await asyncio.gather(*(run_firestore(load_chunk, chunk) for chunk in chunks))
+        return {key: document for found in results for key, document in found.items()}
+
+    async def get_triage_verdicts(self, keys: List[str]) -> Dict[str, Dict]:
+        """
+        Load cached per-signal triage verdicts
+
+        Args:
+            keys: Signal cache keys (document IDs in the triage cache collection)
+
+        Returns:
+            Verdict documents by key, for the keys that are stored
+        """
+        try:
+            return await self._get_documents(self.triage_cache_collection, keys)
+
+        except Exception as e:
+            logger.error(f"Error loading triage verdicts: {str(e)}")
+            return {}
+
+    async def save_triage_verdicts(self, verdicts: Dict[str, Dict]) -> int:
+        """
+        Persist per-signal triage verdicts
+
+        Args:
+            verdicts: Verdict documents by signal cache key
+
+        Returns:
+            Number of verdicts written
+        """
+        try:
+            report = await self.bulk_set(self.triage_cache_collection, list(verdicts.items()))
+            return report['written']
+
+        except Exception as e:
+            logger.error(f"Error saving triage verdicts: {str(e)}")
+            return 0
+
+    async def get_hn_items(self, item_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Load cached HackerNews items
+
+        Args:
+            item_ids: HackerNews item IDs (document IDs in the item cache collection)
+
+        Returns:
+            Item cache documents by ID, for the IDs that are stored
+        """
+        try:
+            return await self._get_documents(self.hn_item_cache_collection, item_ids)
+
+        except Exception as e:
+            logger.error(f"Error loading cached HackerNews items: {str(e)}")
+            return {}
+
+    async def save_hn_items(self, items: Dict[str, Dict]) -> int:
+        """
+        Persist HackerNews items
+
+        Args:
+            items: Item cache documents by item ID
+
+        Returns:
+            Number of items written
+        """
+        try:
+            report = await self.bulk_set(self.hn_item_cache_collection, list(items.items()))
+            return report['written']
+
+        except Exception as e:
+            logger.error(f"Error saving cached HackerNews items: {str(e)}")
+            return 0
+
+    async def get_geocode_results(self, keys: List[str]) -> Dict[str, Dict]:
+        """
+        Load cached geocoding results
+
+        Args:
+            keys: Geocode cache keys (document IDs in the geocode cache collection)
+
+        Returns:
+            Geocode cache documents by key, for the keys that are stored
+        """
+        try:
+            return await self._get_documents(self.geocode_cache_collection, keys)
+
+        except Exception as e:
+            logger.error(f"Error loading cached geocoding results: {str(e)}")
+            return {}
+
+    async def save_geocode_results(self, results: Dict[str, Dict]) -> int:
+        """
+        Persist geocoding results
+
+        Args:
+            results: Geocode cache documents by key
+
+        Returns:
+            Number of results written
+        """
+        try:
+            report = await self.bulk_set(self.geocode_cache_collection, list(results.items()))
+            return report['written']
+
+        except Exception as e:
+            logger.error(f"Error saving cached geocoding results: {str(e)}")
+            return 0
+
     async def get_recent_monitor_runs(self, limit: int = 10) -> List[Dict]:
         """
         Get recent monitor runs for debugging and monitoring
@@ -368,7 +832,7 @@ class FirestoreManager:
                      .order_by('created_at', direction=firestore.Query.DESCENDING)
                      .limit(limit))
 
-            docs = query.stream()
+            docs = await stream_query(query)
             runs = []
             for doc in docs:
                 run_data = doc.to_dict()
@@ -394,33 +858,13 @@ class FirestoreManager:
         try:
             cutoff_time = datetime.utcnow() - timedelta(hours=hours_back)
 
-            query = (self.db.collection(self.monitor_runs_collection)
-                     .where(filter=firestore.FieldFilter('created_at', '>=', cutoff_time))
-                     .order_by('created_at', direction=firestore.Query.DESCENDING))
-
-            docs = query.stream()
-
-            total_runs = 0
-            total_signals = 0
-            total_alerts = 0
-            successful_runs = 0
-            source_totals = {}
-
-            for doc in docs:
-                run = doc.to_dict()
-                total_runs += 1
-
-                if run.get('status') == 'completed' and not run.get('errors'):
-                    successful_runs += 1
-
-                total_signals += run.get('total_signals_collected', 0)
-                total_alerts += run.get('alerts_generated', 0)
+            rollup, _ = await self.alert_rollups.read_window(MONITOR_RUNS_STREAM, cutoff_time)
 
-                # Aggregate by source
-                for source, stats in run.get('source_stats', {}).items():
-                    if source not in source_totals:
-                        source_totals[source] = 0
-                    source_totals[source] += stats.get('signals_collected', 0)
+            total_runs = rollup.get('runs', 0)
+            successful_runs = rollup.get('successful_runs', 0)
+            total_signals = rollup.get('signals_collected', 0)
+            total_alerts = rollup.get('alerts_generated', 0)
+            source_totals = rollup.get('source_signals', {})
 
             return {
                 'period_hours': hours_back,
@@ -465,7 +909,7 @@ class FirestoreManager:
             query = alerts_ref.where(filter=firestore.FieldFilter('created_at', '>=', cutoff_time)).order_by(
                 'created_at', direction=firestore.Query.DESCENDING).limit(50)
 
-            docs = query.stream()
+            docs = await stream_query(query)
             recent_alerts = []
 
             for doc in docs:
@@ -0,0 +1,87 @@
+"""
+Bounded thread pool for blocking Firestore calls.
+
+The synchronous google.cloud.firestore client blocks while a query streams or a
+write commits. Running those calls here keeps the event loop free (one slow
+query no longer stalls every other request on a FastAPI worker or every other
+collector in a monitor cycle), while FIRESTORE_MAX_WORKERS caps how many calls
+are in flight at once.
+"""
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional
+
+FIRESTORE_MAX_WORKERS = int(os.getenv('FIRESTORE_MAX_WORKERS', '8'))
+FIRESTORE_PAGE_SIZE = 500
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_firestore_executor() -> ThreadPoolExecutor:
+    """Return the process-wide Firestore thread pool, creating it on first use"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=FIRESTORE_MAX_WORKERS, thread_name_prefix='firestore')
+    return _executor
+
+
+async def run_firestore(func: Callable, *args, **kwargs) -> Any:
+    """
+    Run a blocking Firestore call on the shared pool
+
+    Args:
+        func: Blocking callable, e.g. doc_ref.set or batch.commit
+        *args, **kwargs: Arguments for func
+
+    Returns:
+        Whatever func returns
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_firestore_executor(), functools.partial(func, *args, **kwargs))
+
+
+async def stream_query(query) -> List:
+    """Run a query to completion on the shared pool and return its document snapshots"""
+    return await run_firestore(lambda: list(query.stream()))
+
+
+async def iterate_query(query, page_size: int = FIRESTORE_PAGE_SIZE) -> AsyncIterator:
+    """
+    Iterate a query's document snapshots without blocking the event loop
+
+    Documents are pulled from the underlying stream on the shared pool a page at
+    a time, so large result sets can be processed (and streamed to clients)
+    progressively.
+
+    Args:
+        query: Firestore query
+        page_size: Documents fetched per trip to the pool
+    """
+    documents = query.stream()
+    while True:
+        page = await run_firestore(_next_page, documents, page_size)
+        for document in page:
+            yield document
+        if len(page) < page_size:
+            break
+
+
+def _next_page(documents: Iterator, page_size: int) -> List:
+    page = []
+    for document in documents:
+        page.append(document)
+        if len(page) >= page_size:
+            break
+    return page
+
+
+def shutdown_firestore_executor():
+    """Shut the shared pool down (it is recreated on next use)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
@@ -248,6 +248,7 @@ NYC_311_COMPLAINT_TYPE_MAPPING = {
     "Heat/Hot Water": "heat_hot_water",
     "HEAT/HOT WATER": "heat_hot_water",
     "PLUMBING": "plumbing",
+    "SAFETY": "building_safety",
 
     # General fallback
     "Request Large Bulky Item Collection": "general_inquiry"
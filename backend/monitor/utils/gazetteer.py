@@ -0,0 +1,395 @@
+"""
+Offline NYC gazetteer for the NYC Monitor System.
+
+Resolves well-known neighborhoods, landmarks, venues, subway stations and
+Manhattan street-grid intersections locally, so most signals are geocoded
+without a Nominatim request. Place names are compiled into a single
+trie-shaped regex, so free text is scanned for every known name in one pass
+(whole words, longest match wins), and coordinates are held in a coarse lat/lng
+grid index for reverse lookups.
+
+Data lives in data/nyc_gazetteer.json next to this module.
+"""
+import json
+import logging
+import math
+import os
+import re
+import string
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from monitor.utils.keyword_matcher import trie_pattern
+
+logger = logging.getLogger(__name__)
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(
+    os.path.abspath(__file__)), 'data', 'nyc_gazetteer.json')
+
+# Confidence of an offline match by place type (mirrors NYCGeocoder._calculate_confidence ranges)
+TYPE_CONFIDENCE = {
+    'venue': 0.8,
+    'landmark': 0.8,
+    'transit': 0.8,
+    'park': 0.75,
+    'bridge': 0.75,
+    'tunnel': 0.75,
+    'neighborhood': 0.65,
+    'street': 0.5,
+    'highway': 0.5,
+    'borough': 0.4
+}
+INTERSECTION_CONFIDENCE = 0.75
+
+# Context parts that name the whole city rather than a borough
+CITY_NAMES = {'new york', 'new york city', 'nyc', 'ny', 'usa'}
+
+ORDINAL_WORDS = {
+    'first': '1st', 'second': '2nd', 'third': '3rd', 'fourth': '4th', 'fifth': '5th',
+    'sixth': '6th', 'seventh': '7th', 'eighth': '8th', 'ninth': '9th', 'tenth': '10th',
+    'eleventh': '11th', 'twelfth': '12th'
+}
+
+_INTERSECTION_SPLIT = re.compile(r'\s+(?:and|at)\s+|\s*[&+/]\s*')
+_STREET_RE = re.compile(
+    r'^(?:(?:e|w|east|west)\.?\s+)?(\d{1,3})(?:st|nd|rd|th)?\s+(?:street|st)\.?$')
+_NUMBERED_AVENUE_RE = re.compile(r'^(\d{1,2})(?:st|nd|rd|th)?\s+avenue$')
+
+
+class Place(NamedTuple):
+    """A gazetteer entry"""
+    name: str
+    lat: float
+    lng: float
+    borough: str
+    type: str
+
+
+def normalize_name(text: str) -> str:
+    """Lowercase, trim and collapse whitespace"""
+    return re.sub(r'\s+', ' ', text.strip().lower())
+
+
+def _ordinal(number: int) -> str:
+    if 10 <= number % 100 <= 20:
+        return f"{number}th"
+    return f"{number}{ {1: 'st', 2: 'nd', 3: 'rd'}.get(number % 10, 'th')}"
+
+
+class NYCGazetteer:
+    """Offline geocoding tier backed by the bundled NYC gazetteer"""
+
+    def __init__(self, path: str = GAZETTEER_PATH, cell_size: float = 0.01):
+        """
+        Load the gazetteer data file
+
+        Args:
+            path: Path to the gazetteer JSON file
+            cell_size: Size in degrees of a reverse-lookup grid cell
+        """
+        with open(path) as f:
+            data = json.load(f)
+
+        self.places: List[Place] = []
+        self._index: Dict[str, int] = {}  # every name and alias, primary names first
+        self._names_by_borough: Dict[str, List[str]] = {}
+        self._names_by_type: Dict[str, List[str]] = {}
+        self._cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+
+        for entry in data.get('places', []):
+            index = len(self.places)
+            self.places.append(Place(
+                entry['name'], entry['lat'], entry['lng'], entry['borough'], entry['type']))
+            for name in [entry['name']] + entry.get('aliases', []):
+                self._insert(normalize_name(name), index)
+            self._cells.setdefault(self._cell(entry['lat'], entry['lng']), []).append(index)
+
+        self._name_re = re.compile(
+            rf'(?<!\w)(?:{trie_pattern(self._index)})(?!\w)' if self._index else r'(?!)')
+
+        grid = data.get('manhattan_grid', {})
+        self._grid_origin = tuple(grid.get('origin', (0.0, 0.0)))
+        self._grid_origin_street = grid.get('origin_street', 0)
+        self._grid_street_step = tuple(grid.get('street_step', (0.0, 0.0)))
+        self._grid_avenue_step = tuple(grid.get('avenue_step', (0.0, 0.0)))
+        self._avenues: Dict[str, List[List[float]]] = grid.get('avenues', {})
+        self._avenue_aliases: Dict[str, str] = grid.get('avenue_aliases', {})
+
+        self.stats = {
+            'resolved': 0,
+            'resolved_intersections': 0,
+            'context_conflicts': 0,
+            'unresolved': 0
+        }
+
+        logger.info(
+            f"🗺️ Gazetteer loaded: {len(self.places)} places, {len(self._index)} names, "
+            f"{len(self._avenues)} grid avenues")
+
+    # ------------------------------------------------------------------
+    # Name index
+    # ------------------------------------------------------------------
+
+    def _insert(self, name: str, index: int):
+        if name in self._index:
+            return
+        self._index[name] = index
+        place = self.places[index]
+        self._names_by_borough.setdefault(place.borough.lower(), []).append(name)
+        self._names_by_type.setdefault(place.type.lower(), []).append(name)
+
+    def lookup(self, name: str) -> Optional[Place]:
+        """Exact (normalized) name or alias lookup"""
+        index = self._index.get(normalize_name(name))
+        return self.places[index] if index is not None else None
+
+    def find_in_text(self, text: str) -> List[Tuple[int, int, Place]]:
+        """
+        Scan free text for gazetteer names, longest match first, whole words only
+
+        Returns:
+            Non-overlapping (start, end, place) matches in text order
+        """
+        return [(match.start(), match.end(), self.places[self._index[match.group()]])
+                for match in self._name_re.finditer(text.lower())]
+
+    def location_table(self) -> Dict[str, Tuple[float, float, str, str]]:
+        """Every name and alias as name -> (lat, lng, borough, type)"""
+        table = {}
+        for name, index in self._index.items():
+            place = self.places[index]
+            table[name] = (place.lat, place.lng, place.borough, place.type)
+        return table
+
+    def names_in_borough(self, borough: str) -> List[str]:
+        """Every name and alias of places in a borough"""
+        return list(self._names_by_borough.get(borough.lower(), []))
+
+    def names_of_type(self, place_type: str) -> List[str]:
+        """Every name and alias of places of a type (landmark, neighborhood, ...)"""
+        return list(self._names_by_type.get(place_type.lower(), []))
+
+    # ------------------------------------------------------------------
+    # Reverse lookups
+    # ------------------------------------------------------------------
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self._cell_size)), int(math.floor(lng / self._cell_size))
+
+    def nearest(self, lat: float, lng: float, max_distance_km: float = 2.0,
+                types: Optional[Set[str]] = None) -> Optional[Place]:
+        """
+        Find the closest place to a coordinate
+
+        Args:
+            lat: Latitude
+            lng: Longitude
+            max_distance_km: Search radius
+            types: Only consider these place types (e.g. {'neighborhood'})
+
+        Returns:
+            Closest place within the radius, or None
+        """
+        row, col = self._cell(lat, lng)
+        # Longitude cells are narrower than latitude cells at NYC's latitude
+        reach_rows = int(math.ceil(max_distance_km / (111.0 * self._cell_size)))
+        reach_cols = int(math.ceil(max_distance_km / (84.0 * self._cell_size)))
+
+        best, best_distance = None, max_distance_km
+        for r in range(row - reach_rows, row + reach_rows + 1):
+            for c in range(col - reach_cols, col + reach_cols + 1):
+                for index in self._cells.get((r, c), ()):
+                    place = self.places[index]
+                    if types and place.type not in types:
+                        continue
+                    distance = _distance_km(lat, lng, place.lat, place.lng)
+                    if distance <= best_distance:
+                        best, best_distance = place, distance
+        return best
+
+    # ------------------------------------------------------------------
+    # Manhattan street grid
+    # ------------------------------------------------------------------
+
+    def _parse_avenue(self, text: str) -> Optional[str]:
+        words = [ORDINAL_WORDS.get(word, word) for word in text.replace('.', '').split()]
+        if words and words[0] == 'the':
+            words = words[1:]
+        if words and words[-1] in ('ave', 'av'):
+            words[-1] = 'avenue'
+        name = ' '.join(words)
+
+        numbered = _NUMBERED_AVENUE_RE.match(name)
+        if numbered:
+            name = f"{_ordinal(int(numbered.group(1)))} avenue"
+
+        name = self._avenue_aliases.get(name, name)
+        return name if name in self._avenues else None
+
+    def _avenue_units(self, avenue: str, street: int) -> Optional[float]:
+        """Interpolate an avenue's crosstown position at a given street"""
+        profile = self._avenues[avenue]
+        if not profile[0][0] <= street <= profile[-1][0]:
+            return None
+        for (street_a, units_a), (street_b, units_b) in zip(profile, profile[1:]):
+            if street_a <= street <= street_b:
+                if street_b == street_a:
+                    return units_a
+                return units_a + (units_b - units_a) * (street - street_a) / (street_b - street_a)
+        return profile[-1][1]
+
+    def resolve_intersection(self, text: str, borough: Optional[str] = None) -> Optional[Dict]:
+        """
+        Resolve a Manhattan grid intersection such as "5th avenue and 42nd street"
+
+        Args:
+            text: Intersection text without context
+            borough: Borough named in the query context, if any. The grid model
+                     only describes Manhattan, so any other borough is not resolved.
+
+        Returns:
+            Geocoding result dict, or None if the text is not a grid intersection
+        """
+        if borough not in (None, 'Manhattan'):
+            return None
+
+        parts = _INTERSECTION_SPLIT.split(normalize_name(text))
+        if len(parts) != 2:
+            return None
+
+        street, avenue = None, None
+        for part in parts:
+            street_match = _STREET_RE.match(part.strip())
+            if street_match:
+                street = int(street_match.group(1))
+            else:
+                avenue = self._parse_avenue(part.strip()) or avenue
+
+        if street is None or avenue is None:
+            return None
+
+        units = self._avenue_units(avenue, street)
+        if units is None:
+            return None
+
+        offset = street - self._grid_origin_street
+        lat = self._grid_origin[0] + offset * \
+            self._grid_street_step[0] + units * self._grid_avenue_step[0]
+        lng = self._grid_origin[1] + offset * \
+            self._grid_street_step[1] + units * self._grid_avenue_step[1]
+
+        neighborhood = self.nearest(lat, lng, types={'neighborhood'})
+        area = f"{string.capwords(neighborhood.name)}, " if neighborhood else ''
+        return self._result(
+            lat, lng,
+            f"{string.capwords(avenue)} & {_ordinal(street).capitalize()} Street, {area}Manhattan, New York, NY",
+            INTERSECTION_CONFIDENCE)
+
+    # ------------------------------------------------------------------
+    # Geocoding entry points
+    # ------------------------------------------------------------------
+
+    def context_borough(self, context: List[str]) -> Optional[str]:
+        """
+        Borough implied by the context parts of a query ("Park Slope", "Brooklyn")
+
+        Returns:
+            The first borough named or implied by a known place, or None
+        """
+        for part in context:
+            name = normalize_name(part)
+            if name.startswith('the '):
+                name = name[4:]
+            if name in CITY_NAMES:
+                continue
+            place = self.lookup(name)
+            if place:
+                return place.borough
+        return None
+
+    def resolve(self, query: str, query_type: str = 'general') -> Optional[Dict]:
+        """
+        Resolve a geocoding query offline
+
+        A borough named in the context ("3rd Avenue and 23rd Street, Brooklyn")
+        must agree with the match; conflicting matches are left to the network.
+
+        Args:
+            query: Query string, optionally with context ("Times Square, New York, NY")
+            query_type: intersection, venue, neighborhood, address or general
+
+        Returns:
+            Geocoding result dict (same shape as NYCGeocoder results), or None
+        """
+        name, *context = query.split(',')
+        name = normalize_name(name)
+        if name.startswith('the '):
+            name = name[4:]
+        borough = self.context_borough(context)
+
+        result = None
+        if query_type == 'intersection' or _INTERSECTION_SPLIT.search(name):
+            result = self.resolve_intersection(name, borough)
+            if result:
+                self.stats['resolved_intersections'] += 1
+
+        if result is None and query_type != 'address':
+            place = self.lookup(name)
+            if place and borough and place.borough != borough:
+                self.stats['context_conflicts'] += 1
+            elif place:
+                result = self._place_result(place)
+
+        self.stats['resolved' if result else 'unresolved'] += 1
+        return result
+
+    def locate_text(self, text: str) -> Optional[Dict]:
+        """
+        Resolve the most specific place mentioned anywhere in free text
+
+        Returns:
+            Geocoding result dict, or None if no known place is mentioned
+        """
+        matches = self.find_in_text(text)
+        if not matches:
+            return None
+        _, _, place = max(matches, key=lambda match: (
+            TYPE_CONFIDENCE.get(match[2].type, 0.5), match[1] - match[0]))
+        return self._place_result(place)
+
+    def _place_result(self, place: Place) -> Dict:
+        if place.type == 'borough':
+            formatted_address = f"{place.borough}, New York, NY"
+        else:
+            formatted_address = f"{string.capwords(place.name)}, {place.borough}, New York, NY"
+        return self._result(place.lat, place.lng, formatted_address,
+                            TYPE_CONFIDENCE.get(place.type, 0.5))
+
+    @staticmethod
+    def _result(lat: float, lng: float, formatted_address: str, confidence: float) -> Dict:
+        return {
+            'lat': lat,
+            'lng': lng,
+            'formatted_address': formatted_address,
+            'confidence': confidence,
+            'source': 'gazetteer',
+            'success': True
+        }
+
+
+def _distance_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Equirectangular distance, accurate to well under 1% across the city"""
+    x = math.radians(lng2 - lng1) * math.cos(math.radians((lat1 + lat2) / 2))
+    y = math.radians(lat2 - lat1)
+    return 6371.0 * math.hypot(x, y)
+
+
+_gazetteer: Optional[NYCGazetteer] = None
+
+
+def get_gazetteer() -> NYCGazetteer:
+    """Return the process-wide gazetteer, loading the data file on first use"""
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = NYCGazetteer()
+    return _gazetteer
@@ -5,20 +5,43 @@ Uses free Nominatim (OpenStreetMap) service to convert addresses and neighborhoo
 import asyncio
 import aiohttp
 import logging
-from typing import Optional, Dict, Tuple, List
+from typing import Optional, Dict, Tuple, List, Hashable
+from collections import deque
 from urllib.parse import quote
-import time
+import os
+
+from monitor.utils.geocode_cache import GeocodeCache, get_geocode_cache, normalize_query
+from monitor.utils.gazetteer import get_gazetteer
+from monitor.utils.rate_limiter import TokenBucket
 
 logger = logging.getLogger(__name__)
 
+# Nominatim usage policy: max 1 request per second and an identifying User-Agent
+NOMINATIM_REQUESTS_PER_SECOND = float(
+    os.getenv('NOMINATIM_REQUESTS_PER_SECOND', '1.0'))
+GEOCODE_USER_AGENT = os.getenv('GEOCODE_USER_AGENT', 'nyc-monitor/1.0')
+
+# Process-wide geocoding client state, shared by every NYCGeocoder and collector
+_nominatim_limiter = TokenBucket(rate=NOMINATIM_REQUESTS_PER_SECOND)
+_http_session: Optional[aiohttp.ClientSession] = None
+_http_session_loop: Optional[asyncio.AbstractEventLoop] = None
+_geocoder: Optional['NYCGeocoder'] = None
+
 
 class NYCGeocoder:
     """Geocoder for NYC addresses and neighborhoods using free Nominatim service"""
 
-    def __init__(self):
+    def __init__(self, cache: Optional[GeocodeCache] = None, limiter: Optional[TokenBucket] = None):
+        """
+        Initialize the geocoder
+
+        Args:
+            cache: Result cache to use (defaults to the process-wide geocode cache)
+            limiter: Rate limiter to use (defaults to the process-wide Nominatim limiter)
+        """
         self.base_url = "https://nominatim.openstreetmap.org/search"
-        self.rate_limit_delay = 1.0  # Nominatim requires 1 request per second
-        self.last_request_time = 0
+        # Nominatim requires 1 request per second - enforced across all geocoders
+        self.limiter = limiter if limiter is not None else _nominatim_limiter
         self.timeout = 10  # seconds
 
         # NYC bounds for better results
@@ -29,6 +52,16 @@ class NYCGeocoder:
             'west': -74.2591   # Staten Island
         }
 
+        self.cache = cache if cache is not None else get_geocode_cache()
+
+        # Offline tier - resolve well-known places locally before any network call
+        self.offline_first = os.getenv(
+            'GEOCODE_OFFLINE_FIRST', 'true').lower() != 'false'
+        self.gazetteer = get_gazetteer() if self.offline_first else None
+
+        # Network queries currently running, keyed on (normalized query, query_type)
+        self._in_flight: Dict[Tuple[str, str], asyncio.Future] = {}
+
     async def geocode_address(self, address: str, neighborhood: Optional[str] = None) -> Dict:
         """
         Geocode a specific address in NYC
@@ -128,7 +161,7 @@ class NYCGeocoder:
 
     async def _geocode_query(self, query: str, query_type: str = "general") -> Dict:
         """
-        Internal method to perform geocoding query with rate limiting
+        Internal method to perform geocoding query with caching and rate limiting
 
         Args:
             query: Address/location query string
@@ -137,13 +170,60 @@ class NYCGeocoder:
         Returns:
             Dict with geocoding results
         """
-        # Rate limiting - Nominatim requires max 1 request per second
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.rate_limit_delay:
-            await asyncio.sleep(self.rate_limit_delay - time_since_last)
+        if self.gazetteer:
+            offline = self.gazetteer.resolve(query, query_type)
+            if offline:
+                logger.debug(f"Resolved {query_type} offline: {query}")
+                return offline
+
+        cached = self.cache.get(query, query_type)
+        if cached is not None:
+            logger.debug(f"Geocode cache hit for {query_type}: {query}")
+            return cached
+
+        # Coalesce identical queries already in flight (from any collector)
+        key = (normalize_query(query), query_type)
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            logger.debug(f"Joining in-flight geocode for {query_type}: {query}")
+            return dict(await asyncio.shield(in_flight))
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        result = self._empty_result()
+        try:
+            # Earlier cycles may have stored this query in Firestore
+            if await self.cache.load([(query, query_type)]):
+                stored = self.cache.get(query, query_type)
+                if stored is not None:
+                    logger.debug(f"Geocode cache hit (stored) for {query_type}: {query}")
+                    result = stored
+                    return result
+
+            result, cacheable = await self._fetch_from_nominatim(query, query_type)
+
+            # Only definitive answers are cached; timeouts and API errors are retried next time
+            if cacheable:
+                self.cache.set(query, query_type, result)
+
+            return result
+        finally:
+            del self._in_flight[key]
+            future.set_result(result)
+
+    async def _fetch_from_nominatim(self, query: str, query_type: str) -> Tuple[Dict, bool]:
+        """
+        Query Nominatim with rate limiting
 
-        self.last_request_time = time.time()
+        Args:
+            query: Address/location query string
+            query_type: Type of query for logging
+
+        Returns:
+            Tuple of (geocoding result, whether the result is safe to cache)
+        """
+        # Rate limiting - Nominatim requires max 1 request per second
+        await self.limiter.acquire()
 
         try:
             # Build Nominatim query parameters
@@ -162,43 +242,58 @@ class NYCGeocoder:
 
             logger.debug(f"Geocoding {query_type}: {query}")
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=self.timeout)) as response:
-                    if response.status == 200:
-                        data = await response.json()
-
-                        if data and len(data) > 0:
-                            result = data[0]
-                            lat = float(result.get('lat', 0))
-                            lng = float(result.get('lon', 0))
-
-                            # Validate coordinates are within NYC bounds
-                            if self._is_in_nyc_bounds(lat, lng):
-                                return {
-                                    'lat': lat,
-                                    'lng': lng,
-                                    'formatted_address': result.get('display_name', query),
-                                    'confidence': self._calculate_confidence(result, query_type),
-                                    'source': 'nominatim',
-                                    'success': True
-                                }
-                            else:
-                                logger.warning(
-                                    f"Geocoded location outside NYC bounds: {lat}, {lng}")
-
-                        logger.warning(f"No geocoding results for: {query}")
-                        return self._empty_result()
-                    else:
-                        logger.error(
-                            f"Geocoding API error {response.status} for: {query}")
-                        return self._empty_result()
+            session = await get_http_session()
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=self.timeout)) as response:
+                if response.status == 200:
+                    data = await response.json()
+
+                    if data and len(data) > 0:
+                        result = data[0]
+                        lat = float(result.get('lat', 0))
+                        lng = float(result.get('lon', 0))
+
+                        # Validate coordinates are within NYC bounds
+                        if self._is_in_nyc_bounds(lat, lng):
+                            return {
+                                'lat': lat,
+                                'lng': lng,
+                                'formatted_address': result.get('display_name', query),
+                                'confidence': self._calculate_confidence(result, query_type),
+                                'source': 'nominatim',
+                                'success': True
+                            }, True
+                        else:
+                            logger.warning(
+                                f"Geocoded location outside NYC bounds: {lat}, {lng}")
+
+                    logger.warning(f"No geocoding results for: {query}")
+                    return self._empty_result(), True
+                else:
+                    logger.error(
+                        f"Geocoding API error {response.status} for: {query}")
+                    return self._empty_result(), False
 
         except asyncio.TimeoutError:
             logger.error(f"Geocoding timeout for: {query}")
-            return self._empty_result()
+            return self._empty_result(), False
         except Exception as e:
             logger.error(f"Geocoding error for '{query}': {e}")
-            return self._empty_result()
+            return self._empty_result(), False
+
+    def locate_offline(self, location_text: str) -> Optional[Dict]:
+        """
+        Resolve the most specific place mentioned in free text from the bundled
+        gazetteer only (no network)
+
+        Args:
+            location_text: Original location text
+
+        Returns:
+            Geocoding result dict, or None if no known place is mentioned
+        """
+        if not self.gazetteer:
+            return None
+        return self.gazetteer.locate_text(location_text)
 
     def _is_in_nyc_bounds(self, lat: float, lng: float) -> bool:
         """Check if coordinates are within NYC bounds"""
@@ -241,6 +336,86 @@ class NYCGeocoder:
         }
 
 
+async def get_http_session() -> aiohttp.ClientSession:
+    """
+    Return the pooled HTTP session used for geocoding requests
+
+    The session keeps connections alive and caches DNS lookups, so repeated
+    requests skip the TCP/TLS handshake. A new session is created if the
+    previous one was closed or belongs to a different event loop; a session
+    left on another loop is closed first.
+    """
+    global _http_session, _http_session_loop
+
+    loop = asyncio.get_running_loop()
+    if _http_session is None or _http_session.closed or _http_session_loop is not loop:
+        await _close_stale_session(_http_session, _http_session_loop)
+        connector = aiohttp.TCPConnector(
+            limit=int(os.getenv('GEOCODE_MAX_CONNECTIONS', '4')),
+            ttl_dns_cache=300,
+            keepalive_timeout=60
+        )
+        _http_session = aiohttp.ClientSession(
+            connector=connector,
+            headers={'User-Agent': GEOCODE_USER_AGENT}
+        )
+        _http_session_loop = loop
+        logger.debug("Created pooled geocoding HTTP session")
+
+    return _http_session
+
+
+async def _close_stale_session(session: Optional[aiohttp.ClientSession],
+                               loop: Optional[asyncio.AbstractEventLoop]):
+    """
+    Close a pooled session that belongs to another event loop
+
+    If its loop is still running (in another thread) the close is scheduled
+    there; otherwise that loop has finished and the session is closed here.
+    """
+    if session is None or session.closed:
+        return
+    try:
+        if loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+        else:
+            await session.close()
+        logger.debug("Closed geocoding HTTP session of a previous event loop")
+    except Exception as e:
+        logger.warning(f"⚠️ Could not close previous geocoding HTTP session: {e}")
+
+
+def get_nominatim_limiter() -> TokenBucket:
+    """Return the process-wide Nominatim rate limiter"""
+    return _nominatim_limiter
+
+
+def get_geocoder() -> 'NYCGeocoder':
+    """Return the process-wide geocoder"""
+    global _geocoder
+    if _geocoder is None:
+        _geocoder = NYCGeocoder()
+    return _geocoder
+
+
+async def close_geocoding_client():
+    """Shutdown hook: persist new cache entries, close the pooled HTTP session and log geocoding stats"""
+    global _http_session, _http_session_loop
+
+    saved = await get_geocode_cache().save()
+    if saved:
+        logger.info(f"🗺️ Saved {saved} geocoding results to the cache")
+
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+        logger.info("🗺️ Geocoding HTTP session closed")
+    _http_session = None
+    _http_session_loop = None
+
+    logger.info(f"🗺️ Geocode cache stats: {get_geocode_cache().get_stats()}")
+    logger.info(f"🗺️ Nominatim limiter stats: {_nominatim_limiter.stats}")
+
+
 # Convenience functions for common use cases
 async def geocode_nyc_location(location_text: str, context: Optional[str] = None) -> Dict:
     """
@@ -253,26 +428,17 @@ async def geocode_nyc_location(location_text: str, context: Optional[str] = None
     Returns:
         Geocoding result dict
     """
-    geocoder = NYCGeocoder()
+    geocoder = get_geocoder()
 
     # Preprocess the location text to extract likely location information
     processed_queries = _extract_location_queries(location_text)
 
-    # Try each extracted query in order of likelihood
+    # Try each extracted query in order of likelihood (each one offline first,
+    # so a vaguer place resolved offline never beats a more specific candidate)
     for query, query_type in processed_queries:
         try:
             logger.debug(f"Trying to geocode: '{query}' as {query_type}")
-
-            if query_type == 'intersection':
-                parts = query.replace(' & ', ' and ').split(' and ')
-                if len(parts) == 2:
-                    result = await geocoder.geocode_intersection(parts[0].strip(), parts[1].strip(), context)
-            elif query_type == 'venue':
-                result = await geocoder.geocode_venue(query, context)
-            elif query_type == 'address':
-                result = await geocoder.geocode_address(query, context)
-            else:  # neighborhood or general
-                result = await geocoder.geocode_neighborhood(query, context)
+            result = await _geocode_candidate(geocoder, query, query_type, context)
 
             # If successful, return the result
             if result.get('success'):
@@ -284,6 +450,13 @@ async def geocode_nyc_location(location_text: str, context: Optional[str] = None
             logger.debug(f"Failed to geocode '{query}': {e}")
             continue
 
+    # Then the most specific known place mentioned anywhere in the text
+    offline_result = geocoder.locate_offline(location_text)
+    if offline_result:
+        logger.debug(
+            f"Resolved offline '{location_text}' -> {offline_result.get('formatted_address')}")
+        return offline_result
+
     # If all specific queries fail, try the original text as-is
     try:
         logger.debug(
@@ -299,6 +472,162 @@ async def geocode_nyc_location(location_text: str, context: Optional[str] = None
     return geocoder._empty_result()
 
 
+# Batch scheduling order: the most specific query types go through the limiter first
+GEOCODE_QUERY_PRIORITY = {
+    'intersection': 0,
+    'venue': 1,
+    'address': 2,
+    'neighborhood': 3,
+    'general': 4
+}
+
+
+async def geocode_many(locations: Dict[Hashable, Tuple[str, Optional[str]]]) -> Dict[Hashable, Dict]:
+    """
+    Geocode every location of a collection cycle in one batch
+
+    Each location is resolved like geocode_nyc_location (its candidate queries
+    in order, each offline first, then the place the text mentions, then the
+    original text), but candidates are processed in rounds across all
+    locations: identical queries are sent once, and each round's network
+    queries are scheduled through the shared limiter with intersections and
+    venues first.
+
+    Args:
+        locations: Caller key (e.g. signal/post id) -> (location_text, context borough)
+
+    Returns:
+        Caller key -> geocoding result dict
+    """
+    geocoder = get_geocoder()
+    results: Dict[Hashable, Dict] = {}
+    pending: Dict[Hashable, deque] = {}
+    stats = {'locations': len(locations), 'offline': 0,
+             'network_queries': 0, 'shared_queries': 0}
+
+    for key, (location_text, context) in locations.items():
+        if not location_text:
+            results[key] = geocoder._empty_result()
+            continue
+
+        # Candidate queries in order of likelihood, then the place the text
+        # mentions (offline only), original text last
+        candidates = [(query, query_type, context)
+                      for query, query_type in _extract_location_queries(location_text)]
+        candidates.append((location_text, 'text', context))
+        candidates.append((location_text, 'neighborhood', context))
+        pending[key] = deque(candidates)
+
+    # Results of every query asked during this batch, so none is asked twice
+    answered: Dict[Tuple, Dict] = {}
+
+    while pending:
+        round_queries: Dict[Tuple, Tuple[str, str, Optional[str]]] = {}
+
+        for key in list(pending):
+            candidates = pending[key]
+            while candidates:
+                candidate_key = _candidate_key(candidates[0])
+                if candidate_key not in answered:
+                    # Offline first: a candidate the gazetteer knows needs no round
+                    offline_result = _resolve_candidate_offline(geocoder, *candidates[0])
+                    if offline_result:
+                        answered[candidate_key] = offline_result
+                        continue
+                    if candidate_key in round_queries:
+                        stats['shared_queries'] += 1
+                    round_queries.setdefault(candidate_key, candidates[0])
+                    break
+                if answered[candidate_key].get('success'):
+                    results[key] = answered[candidate_key]
+                    if results[key].get('source') == 'gazetteer':
+                        stats['offline'] += 1
+                    del pending[key]
+                    break
+                candidates.popleft()
+            else:
+                results[key] = geocoder._empty_result()
+                del pending[key]
+
+        if not round_queries:
+            break
+
+        scheduled = sorted(round_queries.items(),
+                           key=lambda item: GEOCODE_QUERY_PRIORITY.get(item[1][1], len(GEOCODE_QUERY_PRIORITY)))
+        stats['network_queries'] += len(scheduled)
+
+        # Tasks reserve limiter slots in creation order, i.e. in priority order
+        outcomes = await asyncio.gather(
+            *[_geocode_candidate(geocoder, *candidate) for _, candidate in scheduled],
+            return_exceptions=True)
+
+        for (candidate_key, candidate), outcome in zip(scheduled, outcomes):
+            if isinstance(outcome, Exception):
+                logger.debug(f"Failed to geocode '{candidate[0]}': {outcome}")
+                outcome = geocoder._empty_result()
+            answered[candidate_key] = outcome
+
+    await geocoder.cache.save()
+
+    resolved = sum(1 for result in results.values() if result.get('success'))
+    logger.info(
+        f"🗺️ Batch geocoded {resolved}/{stats['locations']} locations "
+        f"({stats['offline']} offline, {stats['network_queries']} network queries, "
+        f"{stats['shared_queries']} shared)")
+
+    return results
+
+
+def _candidate_key(candidate: Tuple[str, str, Optional[str]]) -> Tuple[str, str, str]:
+    query, query_type, context = candidate
+    return normalize_query(query), query_type, normalize_query(context or '')
+
+
+def _candidate_query(query: str, query_type: str, context: Optional[str] = None) -> Optional[str]:
+    """Query string the geocoder method for a candidate asks (None if the candidate is unusable)"""
+    if query_type == 'intersection':
+        parts = query.replace(' & ', ' and ').split(' and ')
+        if len(parts) != 2:
+            return None
+        query = f"{parts[0].strip()} and {parts[1].strip()}"
+    elif query_type == 'address' and ('new york' in query.lower() or 'nyc' in query.lower()):
+        return query
+    if context:
+        return f"{query}, {context}, New York, NY"
+    return f"{query}, New York, NY"
+
+
+def _resolve_candidate_offline(geocoder: NYCGeocoder, query: str, query_type: str,
+                               context: Optional[str] = None) -> Optional[Dict]:
+    """Resolve one candidate from the gazetteer only, None if that needs the network"""
+    if not geocoder.gazetteer:
+        return None
+    if query_type == 'text':
+        return geocoder.locate_offline(query) or geocoder._empty_result()
+    candidate_query = _candidate_query(query, query_type, context)
+    if candidate_query is None:
+        return geocoder._empty_result()
+    return geocoder.gazetteer.resolve(candidate_query, query_type)
+
+
+async def _geocode_candidate(geocoder: NYCGeocoder, query: str, query_type: str,
+                             context: Optional[str] = None) -> Dict:
+    """Geocode one extracted (query, query_type) candidate with the matching geocoder method"""
+    if query_type == 'intersection':
+        parts = query.replace(' & ', ' and ').split(' and ')
+        if len(parts) != 2:
+            return geocoder._empty_result()
+        return await geocoder.geocode_intersection(parts[0].strip(), parts[1].strip(), context)
+    elif query_type == 'venue':
+        return await geocoder.geocode_venue(query, context)
+    elif query_type == 'address':
+        return await geocoder.geocode_address(query, context)
+    elif query_type == 'text':
+        return geocoder.locate_offline(query) or geocoder._empty_result()
+    else:  # neighborhood or general
+        return await geocoder.geocode_neighborhood(query, context)
+
+
 def _extract_location_queries(text: str) -> List[Tuple[str, str]]:
     """
     Extract potential location queries from text with their likely types
@@ -0,0 +1,231 @@
+"""
+Geocoding result cache for NYC Monitor System.
+
+In-memory LRU in front of Firestore so identical queries (e.g. "Times Square,
+New York, NY") are geocoded once across monitor cycles. Results are persisted
+in Firestore (like the triage verdict and HackerNews item caches) because every
+Cloud Run job execution starts with an empty /tmp. Failed lookups are cached
+too, with a shorter TTL, so hopeless queries don't burn the Nominatim rate
+limit every cycle. The 'expires_at' field can be used as the collection's
+Firestore TTL field so expired entries are deleted server-side.
+"""
+import hashlib
+import logging
+import os
+import re
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+GEOCODE_CACHE_TTL_SECONDS = float(
+    os.getenv('GEOCODE_CACHE_TTL_SECONDS', str(30 * 24 * 3600)))
+GEOCODE_CACHE_NEGATIVE_TTL_SECONDS = float(
+    os.getenv('GEOCODE_CACHE_NEGATIVE_TTL_SECONDS', str(6 * 3600)))
+GEOCODE_CACHE_MEMORY_ENTRIES = int(
+    os.getenv('GEOCODE_CACHE_MEMORY_ENTRIES', '4096'))
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a geocoding query so trivially different strings share a cache entry"""
+    query = re.sub(r'\s*,\s*', ', ', query.strip().lower())
+    return re.sub(r'\s+', ' ', query)
+
+
+def geocode_cache_key(query: str, query_type: str) -> str:
+    """Firestore document ID of a (query, query_type) entry"""
+    digest = hashlib.sha1(
+        f"{query_type}\x1f{normalize_query(query)}".encode('utf-8'))
+    return digest.hexdigest()[:20]
+
+
+def _as_utc_naive(value: datetime) -> datetime:
+    """Firestore returns timezone-aware timestamps; compare everything as naive UTC"""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class GeocodeCache:
+    """Geocoding results keyed by (query, query_type) with a TTL, backed by Firestore"""
+
+    def __init__(self, storage=None,
+                 max_memory_entries: Optional[int] = None,
+                 ttl_seconds: Optional[float] = None,
+                 negative_ttl_seconds: Optional[float] = None):
+        """
+        Initialize the cache
+
+        Args:
+            storage: FirestoreManager used to load and persist results.
+                     None keeps the cache in memory only.
+            max_memory_entries: Size of the in-memory LRU
+            ttl_seconds: Lifetime of successful lookups
+            negative_ttl_seconds: Lifetime of failed lookups
+        """
+        self.storage = storage
+        self.max_memory_entries = (GEOCODE_CACHE_MEMORY_ENTRIES if max_memory_entries is None
+                                   else max_memory_entries)
+        self.ttl_seconds = GEOCODE_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.negative_ttl_seconds = (GEOCODE_CACHE_NEGATIVE_TTL_SECONDS if negative_ttl_seconds is None
+                                     else negative_ttl_seconds)
+
+        # document key -> (expires_at, result)
+        self._memory: 'OrderedDict[str, Tuple[datetime, Dict]]' = OrderedDict()
+        # Keys already looked up in Firestore, so a stored miss is read once per process
+        self._looked_up: Set[str] = set()
+        self._pending: Dict[str, Dict] = {}
+
+        self.stats = {
+            'hits': 0,
+            'negative_hits': 0,
+            'misses': 0,
+            'expired': 0,
+            'loaded': 0,
+            'writes': 0,
+            'evictions': 0
+        }
+
+    async def load(self, queries: Iterable[Tuple[str, str]]) -> int:
+        """
+        Fetch stored results for the given queries into memory
+
+        Args:
+            queries: (query, query_type) pairs about to be looked up
+
+        Returns:
+            Number of results loaded
+        """
+        missing = [key for key in dict.fromkeys(geocode_cache_key(query, query_type)
+                                                for query, query_type in queries)
+                   if key not in self._memory and key not in self._looked_up]
+        if self.storage is None or not missing:
+            return 0
+
+        self._looked_up.update(missing)
+        stored = await self.storage.get_geocode_results(missing)
+        for key, document in stored.items():
+            expires_at = document.get('expires_at')
+            if isinstance(expires_at, datetime) and isinstance(document.get('result'), dict):
+                self._remember(key, _as_utc_naive(expires_at), document['result'])
+        self.stats['loaded'] += len(stored)
+        return len(stored)
+
+    def get(self, query: str, query_type: str) -> Optional[Dict]:
+        """
+        Look up a cached result
+
+        Args:
+            query: Geocoding query string
+            query_type: Query type (address, venue, intersection, neighborhood, ...)
+
+        Returns:
+            Copy of the cached result dict, or None on a miss
+        """
+        key = geocode_cache_key(query, query_type)
+        entry = self._memory.get(key)
+        if entry is not None and entry[0] <= datetime.utcnow():
+            del self._memory[key]
+            self.stats['expired'] += 1
+            entry = None
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+
+        self._memory.move_to_end(key)
+        self.stats['hits'] += 1
+        if not entry[1].get('success'):
+            self.stats['negative_hits'] += 1
+        return dict(entry[1])
+
+    def set(self, query: str, query_type: str, result: Dict):
+        """
+        Store a geocoding result (persisted on the next save()). Failed
+        lookups get the shorter negative TTL.
+
+        Args:
+            query: Geocoding query string
+            query_type: Query type
+            result: Geocoding result dict
+        """
+        key = geocode_cache_key(query, query_type)
+        now = datetime.utcnow()
+        ttl = self.ttl_seconds if result.get('success') else self.negative_ttl_seconds
+        expires_at = now + timedelta(seconds=ttl)
+
+        self._remember(key, expires_at, dict(result))
+        self._pending[key] = {
+            'query': normalize_query(query),
+            'query_type': query_type,
+            'result': dict(result),
+            'created_at': now,
+            'expires_at': expires_at
+        }
+
+    def _remember(self, key: str, expires_at: datetime, result: Dict):
+        """Insert into the memory LRU, evicting the least recently used entry if full"""
+        self._memory[key] = (expires_at, result)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    async def save(self) -> int:
+        """
+        Persist results recorded since the last save
+
+        Returns:
+            Number of results written
+        """
+        pending, self._pending = self._pending, {}
+        if self.storage is None or not pending:
+            return 0
+
+        written = await self.storage.save_geocode_results(pending)
+        self.stats['writes'] += written
+        return written
+
+    def get_stats(self) -> Dict:
+        """Return hit/miss counters, the hit rate and the current size"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'lookups': lookups,
+            'hit_rate': self.stats['hits'] / lookups if lookups else 0.0,
+            'memory_entries': len(self._memory),
+            'persistent': self.storage is not None
+        }
+
+    def clear(self):
+        """Drop every entry held in memory (stored results are left to their TTL)"""
+        self._memory.clear()
+        self._looked_up.clear()
+        self._pending.clear()
+
+
+_geocode_cache: Optional[GeocodeCache] = None
+
+
+def get_geocode_cache() -> GeocodeCache:
+    """Return the process-wide geocode cache, creating a memory-only one on first use"""
+    global _geocode_cache
+    if _geocode_cache is None:
+        _geocode_cache = GeocodeCache()
+    return _geocode_cache
+
+
+def configure_geocode_cache(storage) -> GeocodeCache:
+    """
+    Back the process-wide geocode cache with Firestore
+
+    Args:
+        storage: FirestoreManager used to load and persist results
+
+    Returns:
+        The process-wide geocode cache
+    """
+    cache = get_geocode_cache()
+    cache.storage = storage
+    cache._looked_up.clear()
+    return cache
@@ -0,0 +1,158 @@
+"""
+HackerNews item cache for NYC Monitor System.
+
+Story titles, text and timestamps do not change once posted, so consecutive
+collection cycles only need fresh scores and comment counts for stories they
+have already seen. Item JSON is kept in a bounded in-memory LRU and persisted
+in Firestore (like the triage verdict cache) because every monitor cycle runs
+in a fresh process. The 'expires_at' field can be used as the collection's
+Firestore TTL field so expired entries are deleted server-side.
+"""
+import logging
+import os
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+HN_ITEM_CACHE_TTL_SECONDS = float(
+    os.getenv('HN_ITEM_CACHE_TTL_SECONDS', str(6 * 3600)))
+HN_ITEM_CACHE_MEMORY_ENTRIES = int(
+    os.getenv('HN_ITEM_CACHE_MEMORY_ENTRIES', '2048'))
+
+
+def _as_utc_naive(value: datetime) -> datetime:
+    """Firestore returns timezone-aware timestamps; compare everything as naive UTC"""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class HNItemCache:
+    """HackerNews item JSON keyed by item ID with a TTL, backed by Firestore"""
+
+    def __init__(self, storage=None, ttl_seconds: Optional[float] = None,
+                 max_memory_entries: Optional[int] = None):
+        """
+        Initialize the cache
+
+        Args:
+            storage: FirestoreManager used to load and persist items.
+                     None keeps the cache in memory only.
+            ttl_seconds: Lifetime of a cached item
+            max_memory_entries: Size of the in-memory LRU
+        """
+        self.storage = storage
+        self.ttl_seconds = HN_ITEM_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.max_memory_entries = (HN_ITEM_CACHE_MEMORY_ENTRIES if max_memory_entries is None
+                                   else max_memory_entries)
+
+        # item id -> (expires_at, item)
+        self._entries: 'OrderedDict[int, Tuple[datetime, Dict]]' = OrderedDict()
+        self._pending: Dict[str, Dict] = {}
+
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'expired': 0,
+            'loaded': 0,
+            'writes': 0,
+            'evictions': 0
+        }
+
+    async def load(self, item_ids: Iterable[int]) -> int:
+        """
+        Fetch stored items for the given IDs into memory
+
+        Args:
+            item_ids: HackerNews item IDs about to be looked up
+
+        Returns:
+            Number of items loaded
+        """
+        missing = [str(item_id) for item_id in dict.fromkeys(item_ids)
+                   if item_id not in self._entries]
+        if self.storage is None or not missing:
+            return 0
+
+        stored = await self.storage.get_hn_items(missing)
+        for key, document in stored.items():
+            expires_at = document.get('expires_at')
+            if isinstance(expires_at, datetime) and isinstance(document.get('item'), dict):
+                self._remember(int(key), _as_utc_naive(expires_at), document['item'])
+        self.stats['loaded'] += len(stored)
+        return len(stored)
+
+    def get(self, item_id: int) -> Optional[Dict]:
+        """
+        Look up a cached item
+
+        Args:
+            item_id: HackerNews item ID
+
+        Returns:
+            Copy of the cached item JSON, or None on a miss
+        """
+        entry = self._entries.get(item_id)
+        if entry is not None and entry[0] <= datetime.utcnow():
+            del self._entries[item_id]
+            self.stats['expired'] += 1
+            entry = None
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+
+        self._entries.move_to_end(item_id)
+        self.stats['hits'] += 1
+        return dict(entry[1])
+
+    def put(self, item_id: int, item: Dict):
+        """
+        Record an item's JSON (persisted on the next save())
+
+        Args:
+            item_id: HackerNews item ID
+            item: Item JSON as returned by the API
+        """
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.ttl_seconds)
+        self._remember(item_id, expires_at, dict(item))
+        self._pending[str(item_id)] = {
+            'item': item,
+            'created_at': now,
+            'expires_at': expires_at
+        }
+
+    def _remember(self, item_id: int, expires_at: datetime, item: Dict):
+        """Insert into the memory LRU, evicting the least recently used entry if full"""
+        self._entries[item_id] = (expires_at, item)
+        self._entries.move_to_end(item_id)
+        while len(self._entries) > self.max_memory_entries:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    async def save(self) -> int:
+        """
+        Persist items recorded since the last save
+
+        Returns:
+            Number of items written
+        """
+        pending, self._pending = self._pending, {}
+        if self.storage is None or not pending:
+            return 0
+
+        written = await self.storage.save_hn_items(pending)
+        self.stats['writes'] += written
+        return written
+
+    def get_stats(self) -> Dict:
+        """Return hit/miss counters, the hit rate and the current size"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'hit_rate': self.stats['hits'] / lookups if lookups else 0.0,
+            'memory_entries': len(self._entries),
+            'persistent': self.storage is not None
+        }
@@ -0,0 +1,96 @@
+"""
+Precompiled multi-keyword matcher for the NYC Monitor system.
+
+Compiles a keyword set into a single trie-shaped regular expression so that
+keyword hits (with their position and category) are found in one pass over
+the text, instead of one substring test or regex search per keyword.
+"""
+import re
+from typing import Dict, Iterable, List, NamedTuple
+
+
+class KeywordHit(NamedTuple):
+    """A single keyword occurrence in a text"""
+    keyword: str
+    start: int
+    end: int
+    category: str
+
+
+def trie_pattern(words: Iterable[str]) -> str:
+    """
+    Build a regex alternation shaped like a trie of the given words.
+
+    Shared prefixes are factored out ("fire|flooding" -> "f(?:ire|looding)"),
+    so the regex engine rejects a position after a single character test instead
+    of trying every keyword. Longer continuations are tried first, so a match
+    at a given position is always the longest keyword starting there.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(
+            branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Find a categorized keyword set in a single scan"""
+
+    def __init__(self, keyword_categories: Dict[str, List[str]], boundary_max_length: int = 0):
+        """
+        Compile the keyword set
+
+        Args:
+            keyword_categories: Mapping of category name -> keywords in that category.
+                                A keyword listed under several categories keeps the first.
+            boundary_max_length: Keywords of this length or shorter only match as whole
+                                 words (e.g. 'nyc', 'lic'); longer keywords match as
+                                 plain substrings. 0 disables word-boundary matching.
+        """
+        self.categories: Dict[str, str] = {}
+        for category, keywords in keyword_categories.items():
+            for keyword in keywords:
+                self.categories.setdefault(keyword.lower(), category)
+
+        self.keywords: List[str] = list(self.categories)
+        bounded = [kw for kw in self.keywords if len(kw) <= boundary_max_length]
+        plain = [kw for kw in self.keywords if len(kw) > boundary_max_length]
+
+        branches = []
+        if plain:
+            branches.append(trie_pattern(plain))
+        if bounded:
+            branches.append(rf'\b(?:{trie_pattern(bounded)})\b')
+        self._pattern = re.compile('|'.join(branches) or r'(?!)')
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def find_all(self, text: str) -> List[KeywordHit]:
+        """
+        Return the keyword occurrences in the text as whole phrases, in order
+
+        Matches don't overlap and the longest keyword starting at a position
+        wins, so a keyword inside a longer one ('fire' in 'fire hydrant') is
+        not reported on its own.
+        """
+        if not text:
+            return []
+        return [KeywordHit(match.group(), match.start(), match.end(), self.categories[match.group()])
+                for match in self._pattern.finditer(text.lower())]
+
+    def contains_any(self, text: str) -> bool:
+        """Check whether any keyword occurs in the text (stops at the first hit)"""
+        return bool(text) and self._pattern.search(text.lower()) is not None
@@ -0,0 +1,180 @@
+"""
+Location specificity scoring for the NYC Monitor system.
+
+Decides whether a post mentions a location precisely enough (street address,
+intersection, named venue, station) to be actionable. All patterns are
+compiled once at import; each text gets a single anchor scan with named groups,
+and only the pattern families whose anchor words occur are evaluated.
+"""
+import re
+from typing import Dict, List
+
+# 1. Specific street addresses and intersections (+3 per matching pattern)
+STREET_PATTERNS = [
+    # "123 Main Street"
+    r'\b\d+\s+\w+\s+(street|st|avenue|ave|road|rd|boulevard|blvd|place|pl|drive|dr)\b',
+    # "Main St and 5th Ave"
+    r'\b\w+\s+(street|st|avenue|ave)\s+(and|&|at|\+)\s+\w+\s+(street|st|avenue|ave)\b',
+    # "5th Ave between 42nd and 45th"
+    r'\b\w+\s+(street|st|avenue|ave)\s+between\s+\w+\s+and\s+\w+\b',
+    # Major avenues with cross streets
+    r'\b(broadway|5th avenue|madison avenue|park avenue|lexington avenue|third avenue|second avenue|first avenue)\s+(and|at|between)\s+\w+\b',
+]
+
+# 2. Named venues and landmarks (+2 per matching pattern)
+VENUE_PATTERNS = [
+    r'\b(madison square garden|msg|central park|prospect park|brooklyn bridge|manhattan bridge|times square|union square|washington square park)\b',
+    r'\b(yankee stadium|citi field|barclays center|lincoln center|grand central|penn station)\b',
+    r'\b(world trade center|wtc|freedom tower|high line|chelsea market|south street seaport)\b',
+    r'\b(\w+\s+museum|\w+\s+theater|\w+\s+hotel|\w+\s+center|\w+\s+plaza|\w+\s+square)\b',
+]
+
+# 3. Cross-street references (+2 per matching pattern)
+CROSS_STREET_PATTERNS = [
+    # "42nd St and 5th Ave"
+    r'\b(\d+)(st|nd|rd|th)\s+(street|st)\s+(and|&|at)\s+(\w+\s+(avenue|ave))\b',
+    # "Main St and Park Ave"
+    r'\b(\w+\s+(street|st))\s+(and|&|at)\s+(\w+\s+(avenue|ave))\b',
+]
+
+# 4. Subway station references (+1 per matching pattern)
+SUBWAY_PATTERNS = [
+    r'\b(\w+\s+\w+)\s+station\b',  # "Union Square station"
+    # "42nd St station"
+    r'\b(\d+)(st|nd|rd|th)\s+(st\s+)?(station|subway)\b',
+]
+
+# 5. Vague location references (-2 per matching pattern)
+VAGUE_PATTERNS = [
+    r'\b(throughout|across|various|multiple|different)\s+(areas|locations|places|neighborhoods)\b',
+    r'\b(all over|around|near|somewhere in)\s+(manhattan|brooklyn|queens|bronx|staten island)\b',
+    # "downtown" without specific area
+    r'\b(downtown|uptown|midtown)\b(?!\s+(manhattan|area))',
+]
+
+# Whole words at least one of which must occur for a family's patterns to match.
+# Street and cross-street patterns share the same anchors.
+FAMILY_ANCHORS = {
+    'street': [
+        'street', 'st', 'avenue', 'ave', 'road', 'rd', 'boulevard', 'blvd',
+        'place', 'pl', 'drive', 'dr', 'broadway',
+    ],
+    'venue': [
+        'madison', 'msg', 'central', 'prospect', 'brooklyn', 'manhattan', 'times',
+        'union', 'washington', 'yankee', 'citi', 'barclays', 'lincoln', 'grand',
+        'penn', 'world', 'wtc', 'freedom', 'high', 'chelsea', 'south',
+        'museum', 'theater', 'hotel', 'center', 'plaza', 'square',
+    ],
+    'subway': ['station', 'subway'],
+    'vague': [
+        'throughout', 'across', 'various', 'multiple', 'different',
+        'all', 'around', 'near', 'somewhere', 'downtown', 'uptown', 'midtown',
+    ],
+}
+
+
+def _compile(patterns: List[str]) -> List[re.Pattern]:
+    return [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+
+
+class LocationSpecificityScanner:
+    """Score the location specificity of a post's title and content"""
+
+    def __init__(self):
+        self.street_patterns = _compile(STREET_PATTERNS)
+        self.venue_patterns = _compile(VENUE_PATTERNS)
+        self.cross_street_patterns = _compile(CROSS_STREET_PATTERNS)
+        self.subway_patterns = _compile(SUBWAY_PATTERNS)
+        self.vague_patterns = _compile(VAGUE_PATTERNS)
+
+        # One alternation with a named group per family; anchor words are
+        # whole words and disjoint between families, so a single finditer()
+        # reports every family that needs evaluating.
+        seen = set()
+        for family, words in FAMILY_ANCHORS.items():
+            overlap = seen.intersection(words)
+            if overlap:
+                raise ValueError(
+                    f"Anchor words shared between families: {sorted(overlap)}")
+            seen.update(words)
+
+        self.anchor_pattern = re.compile('|'.join(
+            rf"(?P<{family}>\b(?:{'|'.join(map(re.escape, words))})\b)"
+            for family, words in FAMILY_ANCHORS.items()
+        ), re.IGNORECASE)
+
+    def assess(self, title: str, content: str) -> Dict:
+        """
+        Assess whether content has sufficient location specificity for actionable alerts
+
+        Args:
+            title: Post title
+            content: Post body
+
+        Returns:
+            Dict with specificity assessment including specific streets, venues, etc.
+        """
+        full_text = f"{title} {content}".lower()
+
+        specificity_score = 0
+        specific_streets = []
+        named_venues = []
+        cross_streets = []
+
+        families = {match.lastgroup for match in self.anchor_pattern.finditer(full_text)}
+
+        if 'street' in families:
+            for pattern in self.street_patterns:
+                matches = pattern.findall(full_text)
+                if matches:
+                    specific_streets.extend([match[0] if isinstance(
+                        match, tuple) else match for match in matches])
+                    specificity_score += 3
+
+        if 'venue' in families:
+            for pattern in self.venue_patterns:
+                matches = pattern.findall(full_text)
+                if matches:
+                    named_venues.extend(matches)
+                    specificity_score += 2
+
+        if 'street' in families:
+            for pattern in self.cross_street_patterns:
+                matches = pattern.findall(full_text)
+                if matches:
+                    cross_streets.extend(
+                        [f"{match[0]}{match[1]} {match[2]} & {match[4]}" for match in matches])
+                    specificity_score += 2
+
+        if 'subway' in families:
+            for pattern in self.subway_patterns:
+                if pattern.search(full_text):
+                    specificity_score += 1
+
+        if 'vague' in families:
+            for pattern in self.vague_patterns:
+                if pattern.search(full_text):
+                    specificity_score -= 2
+
+        # Determine if location is specific enough
+        is_specific = (
+            specificity_score >= 2 or  # Has street addresses or multiple venue references
+            len(specific_streets) > 0 or  # Has specific street addresses
+            len(cross_streets) > 0 or  # Has intersection references
+            # Has named venues with some specificity
+            (len(named_venues) > 0 and specificity_score >= 1)
+        )
+
+        return {
+            'is_specific': is_specific,
+            'specificity_score': specificity_score,
+            'specific_streets': specific_streets,
+            'named_venues': named_venues,
+            'cross_streets': cross_streets,
+            'has_intersections': len(cross_streets) > 0,
+            'has_venues': len(named_venues) > 0
+        }
+
+
+# Shared scanner, compiled once at import and used by every collector
+LOCATION_SPECIFICITY_SCANNER = LocationSpecificityScanner()
@@ -0,0 +1,193 @@
+"""
+Near-duplicate alert detection for NYC Monitor System.
+
+Recent alerts are indexed two ways: by MinHash signatures of their character
+shingles, banded for LSH so a lookup only compares against alerts sharing a
+band, and by a coarse lat/lng grid per event type. An alert is a duplicate when
+its text is similar enough to an indexed alert. The bar is lowered for alerts
+of the same event type close by, and raised for a different event type, a
+distant location, or different house/street numbers.
+"""
+import math
+import os
+import random
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+NEAR_DUP_NUM_PERM = 32
+NEAR_DUP_BANDS = 16  # 2 rows per band: candidates from ~0.25 Jaccard similarity
+SHINGLE_SIZE = 3
+
+# Shingle Jaccard similarity needed to call two alerts the same event
+NEAR_DUP_TEXT_THRESHOLD = float(os.getenv('NEAR_DUP_TEXT_THRESHOLD', '0.6'))
+# ... when they share an event type (and location is unknown)
+NEAR_DUP_SAME_TYPE_THRESHOLD = 0.45
+# ... when they share an event type and are within NEAR_DUP_RADIUS_METERS
+NEAR_DUP_NEARBY_THRESHOLD = float(os.getenv('NEAR_DUP_NEARBY_THRESHOLD', '0.3'))
+# ... when their event types differ, they are far apart, or their numbers differ
+NEAR_DUP_STRICT_THRESHOLD = 0.85
+NEAR_DUP_RADIUS_METERS = float(os.getenv('NEAR_DUP_RADIUS_METERS', '500'))
+FAR_APART_METERS = 5 * NEAR_DUP_RADIUS_METERS
+
+GENERIC_EVENT_TYPES = {'', 'general', 'general_inquiry', 'unknown'}
+
+METERS_PER_DEGREE_LAT = 111320.0
+# Longitude degrees shrink with latitude; NYC is at about 40.7 N
+METERS_PER_DEGREE_LNG = METERS_PER_DEGREE_LAT * math.cos(math.radians(40.7))
+
+# One random 32-bit mask per MinHash function: h_i(x) = crc32(x) XOR mask_i
+_rng = random.Random(1729)
+_MASKS = [_rng.getrandbits(32) for _ in range(NEAR_DUP_NUM_PERM)]
+_ROWS_PER_BAND = NEAR_DUP_NUM_PERM // NEAR_DUP_BANDS
+
+
+class DuplicateMatch(NamedTuple):
+    """An indexed alert that a looked-up alert duplicates"""
+    alert: Dict
+    similarity: float
+    distance_meters: Optional[float]
+
+
+def alert_text(alert: Dict) -> str:
+    """Normalized text an alert is compared on (title and location fields)"""
+    parts = [alert.get('title', ''), alert.get('area', ''), alert.get('venue_address', '')]
+    parts.extend(alert.get('specific_streets') or [])
+    text = ' '.join(str(part) for part in parts if part)
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', text.lower()).split())
+
+
+def shingles(text: str) -> Set[str]:
+    """Character shingles of a normalized text"""
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def _numbers(text: str) -> Set[str]:
+    return set(re.findall(r'\d+', text))
+
+
+def minhash(shingle_set: Set[str]) -> List[int]:
+    """MinHash signature of a shingle set"""
+    hashes = [zlib.crc32(shingle.encode('utf-8')) for shingle in shingle_set]
+    return [min(map(mask.__xor__, hashes)) for mask in _MASKS]
+
+
+def _coordinates(alert: Dict) -> Optional[Tuple[float, float]]:
+    coordinates = alert.get('coordinates') or {}
+    try:
+        lat, lng = float(coordinates['lat']), float(coordinates['lng'])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return (lat, lng) if lat and lng else None
+
+
+def _event_type(alert: Dict) -> str:
+    return str(alert.get('event_type') or '').strip().lower()
+
+
+def _distance_meters(a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    """Equirectangular distance, accurate to well under 1% at city scale"""
+    dy = (a[0] - b[0]) * METERS_PER_DEGREE_LAT
+    dx = (a[1] - b[1]) * METERS_PER_DEGREE_LNG
+    return math.hypot(dx, dy)
+
+
+def _grid_cell(point: Tuple[float, float]) -> Tuple[int, int]:
+    return (int(math.floor(point[0] * METERS_PER_DEGREE_LAT / NEAR_DUP_RADIUS_METERS)),
+            int(math.floor(point[1] * METERS_PER_DEGREE_LNG / NEAR_DUP_RADIUS_METERS)))
+
+
+class NearDuplicateIndex:
+    """In-memory index of alerts for near-duplicate lookups"""
+
+    def __init__(self, alerts: Iterable[Dict] = ()):
+        """
+        Build the index
+
+        Args:
+            alerts: Alerts to index (e.g. recent alerts from Firestore)
+        """
+        # Per indexed alert: (alert, shingles, numbers, coordinates, event type)
+        self._entries: List[Tuple[Dict, Set[str], Set[str], Optional[Tuple[float, float]], str]] = []
+        self._bands: Dict[Tuple[int, Tuple[int, ...]], List[int]] = defaultdict(list)
+        self._grid: Dict[Tuple[str, int, int], List[int]] = defaultdict(list)
+        for alert in alerts:
+            self.add(alert)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, alert: Dict):
+        """Index an alert"""
+        text = alert_text(alert)
+        shingle_set = shingles(text)
+        point = _coordinates(alert)
+        event_type = _event_type(alert)
+        index = len(self._entries)
+        self._entries.append((alert, shingle_set, _numbers(text), point, event_type))
+
+        if shingle_set:
+            for band in self._band_keys(shingle_set):
+                self._bands[band].append(index)
+        if point and event_type not in GENERIC_EVENT_TYPES:
+            self._grid[(event_type, *_grid_cell(point))].append(index)
+
+    def find(self, alert: Dict) -> Optional[DuplicateMatch]:
+        """
+        Find the indexed alert this alert most likely duplicates
+
+        Args:
+            alert: Alert to look up
+
+        Returns:
+            Best DuplicateMatch, or None if the alert is new
+        """
+        text = alert_text(alert)
+        shingle_set = shingles(text)
+        numbers = _numbers(text)
+        point = _coordinates(alert)
+        event_type = _event_type(alert)
+
+        candidates: Set[int] = set()
+        if shingle_set:
+            for band in self._band_keys(shingle_set):
+                candidates.update(self._bands.get(band, ()))
+        if point and event_type not in GENERIC_EVENT_TYPES:
+            row, col = _grid_cell(point)
+            for d_row in (-1, 0, 1):
+                for d_col in (-1, 0, 1):
+                    candidates.update(self._grid.get(
+                        (event_type, row + d_row, col + d_col), ()))
+
+        best = None
+        for index in candidates:
+            other, other_shingles, other_numbers, other_point, other_type = self._entries[index]
+            union = len(shingle_set | other_shingles)
+            similarity = len(shingle_set & other_shingles) / union if union else 0.0
+            distance = _distance_meters(point, other_point) if point and other_point else None
+
+            same_type = event_type == other_type and event_type not in GENERIC_EVENT_TYPES
+            types_differ = (event_type != other_type and event_type not in GENERIC_EVENT_TYPES
+                            and other_type not in GENERIC_EVENT_TYPES)
+            # "Fire - 123 Main St" and "Fire - 456 Main St" are different places
+            numbers_differ = numbers and other_numbers and not numbers & other_numbers
+            if types_differ or numbers_differ or (distance is not None and distance > FAR_APART_METERS):
+                threshold = NEAR_DUP_STRICT_THRESHOLD
+            elif same_type and distance is not None and distance <= NEAR_DUP_RADIUS_METERS:
+                threshold = NEAR_DUP_NEARBY_THRESHOLD
+            elif same_type and distance is None:
+                threshold = NEAR_DUP_SAME_TYPE_THRESHOLD
+            else:
+                threshold = NEAR_DUP_TEXT_THRESHOLD
+
+            if similarity >= threshold and (best is None or similarity > best.similarity):
+                best = DuplicateMatch(other, similarity, distance)
+        return best
+
+    def _band_keys(self, shingle_set: Set[str]) -> List[Tuple[int, Tuple[int, ...]]]:
+        signature = minhash(shingle_set)
+        return [(band, tuple(signature[band * _ROWS_PER_BAND:(band + 1) * _ROWS_PER_BAND]))
+                for band in range(NEAR_DUP_BANDS)]
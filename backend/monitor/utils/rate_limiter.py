@@ -0,0 +1,63 @@
+"""
+Async token-bucket rate limiter for the NYC Monitor System.
+
+One limiter instance is shared by every caller of a rate-limited service
+(e.g. Nominatim's 1 request/second policy), so concurrent collectors stay
+within the limit together instead of each keeping its own timer.
+"""
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Token bucket that callers await before each request"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Initialize the limiter
+
+        Args:
+            rate: Tokens added per second (sustained requests per second)
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+        self.stats = {
+            'acquired': 0,
+            'waited': 0,
+            'total_wait_seconds': 0.0
+        }
+
+    def _reserve(self) -> float:
+        """
+        Take one token, returning how long the caller must wait for it.
+
+        Runs without awaiting, so reservations are atomic within the event loop.
+        The token count goes negative while callers are queued; each new caller
+        waits behind everyone who reserved before it.
+        """
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens +
+                           (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    async def acquire(self):
+        """Wait until a request is allowed"""
+        wait = self._reserve()
+        self.stats['acquired'] += 1
+        if wait > 0:
+            self.stats['waited'] += 1
+            self.stats['total_wait_seconds'] += wait
+            await asyncio.sleep(wait)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
@@ -0,0 +1,242 @@
+"""
+Server-side clustering of map alerts by zoom level.
+
+Alerts are binned into a Web Mercator grid CLUSTER_CELLS_PER_TILE cells across
+each z/x/y map tile, so a cluster covers roughly 256 / CLUSTER_CELLS_PER_TILE
+screen pixels at any zoom. Each cell becomes one cluster (count, centroid,
+dominant category, highest priority). Alerts are bucketed once per alert set
+into INDEX_ZOOM tiles, and each z/x/y tile is clustered from its buckets on
+first request and cached, so panning or zooming only computes tiles not seen
+before. A response is bounded by the number of cells on screen, not by the
+number of alerts.
+"""
+import math
+import os
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+CLUSTER_CELLS_PER_TILE_BITS = 4  # 16 x 16 cells per 256 px tile
+CLUSTER_CELLS_PER_TILE = 1 << CLUSTER_CELLS_PER_TILE_BITS
+CLUSTER_MAX_ZOOM = 20
+# Most tiles one viewport may cover (about two 4K screens of 256 px tiles)
+CLUSTER_MAX_TILES = 512
+# Clustered tiles kept in memory
+CLUSTER_CACHE_TILES = int(os.getenv('CLUSTER_CACHE_TILES', '4096'))
+# Zoom level of the spatial index buckets (about 2 km across in NYC)
+INDEX_ZOOM = 14
+
+MAX_MERCATOR_LATITUDE = 85.05112878
+_RADIANS_PER_DEGREE = math.pi / 180.0
+_INV_4PI = 1.0 / (4 * math.pi)
+_LAST_POSITION = 1.0 - 1e-12
+
+PRIORITY_NAMES = ['low', 'medium', 'high', 'critical']
+PRIORITY_RANK = {name: rank for rank, name in enumerate(PRIORITY_NAMES)}
+
+
+class BoundingBox(NamedTuple):
+    """Viewport in degrees"""
+    west: float
+    south: float
+    east: float
+    north: float
+
+
+def parse_bbox(value: str) -> Optional[BoundingBox]:
+    """
+    Parse a 'west,south,east,north' bounding box
+
+    Returns:
+        BoundingBox, or None if the value is malformed or out of range
+    """
+    try:
+        west, south, east, north = (float(part) for part in value.split(','))
+    except (AttributeError, ValueError):
+        return None
+    if not (-180 <= west <= east <= 180 and -90 <= south <= north <= 90):
+        return None
+    return BoundingBox(west, south, east, north)
+
+
+def _world_xy(lat: float, lng: float) -> Tuple[float, float]:
+    """Web Mercator position in [0, 1) x [0, 1), origin at the top-left"""
+    if lat > MAX_MERCATOR_LATITUDE:
+        lat = MAX_MERCATOR_LATITUDE
+    elif lat < -MAX_MERCATOR_LATITUDE:
+        lat = -MAX_MERCATOR_LATITUDE
+    x = (lng + 180.0) / 360.0
+    sin_lat = math.sin(lat * _RADIANS_PER_DEGREE)
+    y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) * _INV_4PI
+    return min(max(x, 0.0), _LAST_POSITION), min(max(y, 0.0), _LAST_POSITION)
+
+
+# Per-cell running aggregate: [count, lat sum, lng sum, priority rank, category counts, last alert]
+_COUNT, _LAT_SUM, _LNG_SUM, _RANK, _CATEGORIES, _ALERT = range(6)
+
+
+def _to_cluster(cell: List) -> Dict:
+    count = cell[_COUNT]
+    categories = cell[_CATEGORIES]
+    rank = cell[_RANK]
+    cluster = {
+        'lat': round(cell[_LAT_SUM] / count, 6),
+        'lng': round(cell[_LNG_SUM] / count, 6),
+        'count': count,
+        'category': max(categories, key=categories.get),
+        'priority': PRIORITY_NAMES[rank] if rank >= 0 else None,
+    }
+    if count == 1:
+        # A lone alert can be opened directly from the map
+        cluster['id'] = cell[_ALERT].get('id')
+    else:
+        cluster['categories'] = categories
+    return cluster
+
+
+def index_alerts(alerts: List[Dict]) -> Dict[Tuple[int, int], List[Tuple]]:
+    """
+    Index the alerts that have coordinates by their INDEX_ZOOM tile
+
+    Returns:
+        (tile x, tile y) at INDEX_ZOOM -> (world x, world y, lat, lng, alert) points
+    """
+    scale = 1 << INDEX_ZOOM
+    index: Dict[Tuple[int, int], List[Tuple]] = {}
+    for alert in alerts:
+        coordinates = alert.get('coordinates') or {}
+        try:
+            lat, lng = float(coordinates['lat']), float(coordinates['lng'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        x, y = _world_xy(lat, lng)
+        index.setdefault((int(x * scale), int(y * scale)), []).append(
+            (x, y, lat, lng, alert))
+    return index
+
+
+def tile_points(index: Dict[Tuple[int, int], List[Tuple]], zoom: int, tile_x: int, tile_y: int) -> List[Tuple]:
+    """Points of an index that fall inside one z/x/y tile"""
+    if zoom >= INDEX_ZOOM:
+        shift = zoom - INDEX_ZOOM
+        scale = 1 << zoom
+        return [point for point in index.get((tile_x >> shift, tile_y >> shift), ())
+                if int(point[0] * scale) == tile_x and int(point[1] * scale) == tile_y]
+
+    shift = INDEX_ZOOM - zoom
+    points = []
+    for (bucket_x, bucket_y), bucket in index.items():
+        if bucket_x >> shift == tile_x and bucket_y >> shift == tile_y:
+            points.extend(bucket)
+    return points
+
+
+def cluster_tile(points: List[Tuple], zoom: int) -> List[Dict]:
+    """
+    Cluster the points of one tile on its CLUSTER_CELLS_PER_TILE grid
+
+    Args:
+        points: Points inside the tile (see tile_points)
+        zoom: Zoom level of the tile
+
+    Returns:
+        One cluster per non-empty cell
+    """
+    scale = 1 << (zoom + CLUSTER_CELLS_PER_TILE_BITS)
+    cells: Dict[Tuple[int, int], List] = {}
+    for x, y, lat, lng, alert in points:
+        key = (int(x * scale), int(y * scale))
+        category = alert.get('category', 'general')
+        rank = PRIORITY_RANK.get(alert.get('priority'), -1)
+
+        cell = cells.get(key)
+        if cell is None:
+            cells[key] = [1, lat, lng, rank, {category: 1}, alert]
+            continue
+        cell[_COUNT] += 1
+        cell[_LAT_SUM] += lat
+        cell[_LNG_SUM] += lng
+        if rank > cell[_RANK]:
+            cell[_RANK] = rank
+        categories = cell[_CATEGORIES]
+        categories[category] = categories.get(category, 0) + 1
+
+    return [_to_cluster(cell) for cell in cells.values()]
+
+
+def tiles_in_bbox(bbox: BoundingBox, zoom: int) -> Tuple[range, range]:
+    """Tile x and y ranges covering a bounding box at a zoom level"""
+    tiles = 1 << zoom
+    left, top = _world_xy(bbox.north, bbox.west)
+    right, bottom = _world_xy(bbox.south, bbox.east)
+    return (range(int(left * tiles), int(right * tiles) + 1),
+            range(int(top * tiles), int(bottom * tiles) + 1))
+
+
+class ClusterCache:
+    """LRU of clustered tiles, keyed by the version of the alert set they came from"""
+
+    def __init__(self, max_tiles: int = CLUSTER_CACHE_TILES, max_indexes: int = 8):
+        self.max_tiles = max_tiles
+        self.max_indexes = max_indexes
+        # (version, hours) -> (alerts, spatial index), shared by all zoom levels
+        self._indexes: 'OrderedDict[Tuple, Tuple[List[Dict], Dict]]' = OrderedDict()
+        # (version, hours, zoom, x, y) -> clusters
+        self._tiles: 'OrderedDict[Tuple, List[Dict]]' = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'index_builds': 0}
+
+    def clusters(self, version: Hashable, hours: int, zoom: int, bbox: BoundingBox,
+                 load_alerts: Callable[[], List[Dict]]) -> List[Dict]:
+        """
+        Clusters of the tiles covering a viewport
+
+        Args:
+            version: Identifies the alert set (changes whenever it changes)
+            hours: Window the alerts were selected with
+            zoom: Map zoom level
+            bbox: Viewport
+            load_alerts: Returns the alert set (only called when it is not indexed yet)
+
+        Returns:
+            Clusters of every tile intersecting the viewport
+        """
+        x_range, y_range = tiles_in_bbox(bbox, zoom)
+        clusters = []
+        for tile_x in x_range:
+            for tile_y in y_range:
+                key = (version, hours, zoom, tile_x, tile_y)
+                tile = self._tiles.get(key)
+                if tile is None:
+                    self.stats['misses'] += 1
+                    index = self._index(version, hours, load_alerts)
+                    tile = self._tiles[key] = cluster_tile(
+                        tile_points(index, zoom, tile_x, tile_y), zoom)
+                    while len(self._tiles) > self.max_tiles:
+                        self._tiles.popitem(last=False)
+                else:
+                    self.stats['hits'] += 1
+                    self._tiles.move_to_end(key)
+                clusters.extend(tile)
+        return clusters
+
+    def _index(self, version: Hashable, hours: int, load_alerts: Callable[[], List[Dict]]) -> Dict:
+        key = (version, hours)
+        entry = self._indexes.get(key)
+        if entry is None:
+            alerts = load_alerts()
+            # Holding the alert list keeps an id()-based version unique while it is cached
+            entry = self._indexes[key] = (alerts, index_alerts(alerts))
+            self.stats['index_builds'] += 1
+            while len(self._indexes) > self.max_indexes:
+                self._indexes.popitem(last=False)
+        else:
+            self._indexes.move_to_end(key)
+        return entry[1]
+
+    def get_stats(self) -> Dict:
+        """Return hit/miss counters and cache sizes"""
+        return {**self.stats, 'tiles': len(self._tiles), 'indexes': len(self._indexes)}
+
+    def clear(self):
+        """Drop every cached index and tile"""
+        self._indexes.clear()
+        self._tiles.clear()
@@ -0,0 +1,121 @@
+"""
+Columnar encoding of the minimal map alerts.
+
+Instead of one object per alert (repeating 'coordinates', 'lat', 'lng',
+'priority', 'category' keys 50,000 times), the compact format sends parallel
+arrays: ids, lat/lng rounded to float32 precision, epoch-second timestamps,
+and small-int codes for source, priority and category with one dictionary per
+coded column. Clients opt in with ?format=columnar or an Accept header of
+COLUMNAR_MEDIA_TYPE.
+"""
+import json
+from typing import Dict, List, Optional
+
+from monitor.types.alert_categories import get_main_categories
+
+from .alert_map_view import epoch_seconds
+
+COLUMNAR_FORMAT = 'columnar'
+OBJECT_FORMAT = 'objects'
+COLUMNAR_MEDIA_TYPE = 'application/vnd.nyc-monitor.alerts.columnar+json'
+
+# float32 carries ~7 significant digits: 5 decimals of a NYC lat/lng (~1 m)
+COORDINATE_DECIMALS = 5
+
+# Stable code order for the dictionary-encoded columns; unseen values are appended
+PRIORITY_VALUES = ['low', 'medium', 'high', 'critical']
+SOURCE_VALUES = ['311', 'reddit', 'hackernews', 'twitter', 'monitor']
+
+
+def wants_columnar(format: Optional[str], accept: Optional[str]) -> bool:
+    """
+    Whether the client asked for the columnar format
+
+    Args:
+        format: Value of the 'format' query parameter, if any
+        accept: Accept header, if any
+
+    Returns:
+        True for ?format=columnar or an Accept header naming COLUMNAR_MEDIA_TYPE
+    """
+    if format:
+        return format == COLUMNAR_FORMAT
+    return bool(accept) and COLUMNAR_MEDIA_TYPE in accept
+
+
+def encode_columnar(alerts: List[Dict]) -> Dict:
+    """
+    Encode minimal map alerts as parallel columns
+
+    Args:
+        alerts: Minimal map alerts (id, source, priority, timestamp, coordinates, category)
+
+    Returns:
+        Dict with 'format', 'count', 'dictionaries' (code -> value per coded
+        column) and 'columns' (id, lat, lng, timestamp, source, priority, category)
+    """
+    dictionaries = {
+        'source': list(SOURCE_VALUES),
+        'priority': list(PRIORITY_VALUES),
+        'category': get_main_categories(),
+    }
+    codes = {column: {value: code for code, value in enumerate(values)}
+             for column, values in dictionaries.items()}
+
+    def code_of(column: str, value) -> int:
+        column_codes = codes[column]
+        code = column_codes.get(value)
+        if code is None:
+            code = column_codes[value] = len(dictionaries[column])
+            dictionaries[column].append(value)
+        return code
+
+    # 311 timestamps repeat a lot (many complaints are filed at whole hours)
+    epochs: Dict[str, Optional[int]] = {}
+
+    ids, lats, lngs, timestamps = [], [], [], []
+    sources, priorities, categories = [], [], []
+    for alert in alerts:
+        coordinates = alert.get('coordinates') or {}
+        timestamp = alert.get('timestamp')
+        epoch = epochs.get(timestamp, False) if isinstance(timestamp, str) else False
+        if epoch is False:
+            seconds = epoch_seconds(timestamp)
+            epoch = int(seconds) if seconds is not None else None
+            if isinstance(timestamp, str):
+                epochs[timestamp] = epoch
+
+        ids.append(alert.get('id'))
+        lats.append(_round_coordinate(coordinates.get('lat')))
+        lngs.append(_round_coordinate(coordinates.get('lng')))
+        timestamps.append(epoch)
+        sources.append(code_of('source', alert.get('source')))
+        priorities.append(code_of('priority', alert.get('priority')))
+        categories.append(code_of('category', alert.get('category')))
+
+    return {
+        'format': COLUMNAR_FORMAT,
+        'count': len(ids),
+        'dictionaries': dictionaries,
+        'columns': {
+            'id': ids,
+            'lat': lats,
+            'lng': lngs,
+            'timestamp': timestamps,
+            'source': sources,
+            'priority': priorities,
+            'category': categories,
+        }
+    }
+
+
+def dumps_compact(payload: Dict) -> str:
+    """Serialize a response body without whitespace (payloads are plain JSON types)"""
+    return json.dumps(payload, separators=(',', ':'), default=str)
+
+
+def _round_coordinate(value) -> Optional[float]:
+    try:
+        return round(float(value), COORDINATE_DECIMALS)
+    except (TypeError, ValueError):
+        return None
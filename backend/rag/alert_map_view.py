@@ -0,0 +1,333 @@
+"""
+Resident materialized view of the minimal alert objects drawn on the map.
+
+Each alert collection is loaded once (the last ALERT_MAP_VIEW_HOURS) into a
+time-sorted in-memory array, in the background at startup (see warm()) so no
+request waits for the full load; until it finishes, requests are answered from
+Firestore as before. After that, only documents written since the
+collection's high-watermark ('created_at', the write time) are read, at most
+every ALERT_MAP_VIEW_REFRESH_SECONDS. Any limit/hours request inside the view
+window is answered by slicing the arrays, with no Firestore reads.
+"""
+import asyncio
+import bisect
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from google.cloud import firestore
+from monitor.storage.firestore_pool import iterate_query
+
+logger = logging.getLogger(__name__)
+
+ALERT_MAP_VIEW_HOURS = int(os.getenv('ALERT_MAP_VIEW_HOURS', '168'))
+ALERT_MAP_VIEW_REFRESH_SECONDS = float(
+    os.getenv('ALERT_MAP_VIEW_REFRESH_SECONDS', '30'))
+# Most alerts held per collection; the oldest are dropped beyond this
+ALERT_MAP_VIEW_MAX_ALERTS = int(
+    os.getenv('ALERT_MAP_VIEW_MAX_ALERTS', '50000'))
+# Delta reads start this long before the watermark, so a batch that committed
+# after a later one is still picked up (re-read documents are upserted by id)
+ALERT_MAP_VIEW_OVERLAP_SECONDS = 120
+
+# Write-time field every collection is delta-refreshed on
+WATERMARK_FIELD = 'created_at'
+
+
+class MapViewSource(NamedTuple):
+    """How one Firestore collection is materialized"""
+    collection: str
+    # Field the hours window is applied to and alerts are sorted by
+    time_field: str
+    # Fields selected from each document
+    fields: List[str]
+    # (document id, document data) -> (epoch seconds, minimal map alert), None to skip
+    to_map_alert: Callable[[str, Dict], Optional[Tuple[float, Dict]]]
+
+
+def epoch_seconds(value) -> Optional[float]:
+    """Epoch seconds of a Firestore timestamp or ISO string (naive values are UTC)"""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class _SortedAlerts:
+    """Alerts of one collection sorted by time, oldest first"""
+
+    def __init__(self):
+        self.keys: List[float] = []
+        self.alerts: List[Dict] = []
+        self._key_by_id: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self.alerts)
+
+    def upsert_many(self, entries: Iterable[Tuple[float, Dict]]):
+        """Insert alerts, replacing any already held under the same id"""
+        latest: Dict[str, Tuple[float, Dict]] = {}
+        for key, alert in entries:
+            latest[alert['id']] = (key, alert)
+        if not latest:
+            return
+
+        replaced = any(alert_id in self._key_by_id for alert_id in latest)
+        if replaced or len(latest) > 64:
+            # Rebuild: cheaper than many O(n) list insertions
+            merged = [(key, alert) for key, alert in zip(self.keys, self.alerts)
+                      if alert['id'] not in latest]
+            merged.extend(latest.values())
+            merged.sort(key=lambda item: item[0])
+            self.keys = [key for key, _ in merged]
+            self.alerts = [alert for _, alert in merged]
+        else:
+            for key, alert in latest.values():
+                index = bisect.bisect_right(self.keys, key)
+                self.keys.insert(index, key)
+                self.alerts.insert(index, alert)
+
+        for alert_id, (key, _) in latest.items():
+            self._key_by_id[alert_id] = key
+
+    def evict(self, cutoff: float, max_alerts: int) -> int:
+        """Drop alerts older than cutoff and the oldest beyond max_alerts"""
+        start = bisect.bisect_left(self.keys, cutoff)
+        start = max(start, len(self.keys) - max_alerts)
+        if start <= 0:
+            return 0
+        for alert in self.alerts[:start]:
+            self._key_by_id.pop(alert['id'], None)
+        del self.keys[:start]
+        del self.alerts[:start]
+        return start
+
+    def newest(self, cutoff: float, limit: int) -> List[Dict]:
+        """Up to limit alerts at or after cutoff, newest first"""
+        start = max(bisect.bisect_left(self.keys, cutoff), len(self.alerts) - limit)
+        return self.alerts[start:][::-1]
+
+
+class AlertMapView:
+    """In-process materialized view of map alerts, kept fresh by watermark deltas"""
+
+    def __init__(self, get_db: Callable, sources: Dict[str, MapViewSource],
+                 hours: int = ALERT_MAP_VIEW_HOURS,
+                 refresh_seconds: float = ALERT_MAP_VIEW_REFRESH_SECONDS,
+                 max_alerts: int = ALERT_MAP_VIEW_MAX_ALERTS):
+        """
+        Initialize the (empty) view; warm() loads it
+
+        Args:
+            get_db: Returns the shared Firestore client
+            sources: View name -> collection definition
+            hours: Window held in memory
+            refresh_seconds: Minimum interval between delta reads
+            max_alerts: Most alerts held per source
+        """
+        self.get_db = get_db
+        self.sources = sources
+        self.hours = hours
+        self.refresh_seconds = refresh_seconds
+        self.max_alerts = max_alerts
+
+        self._alerts = {name: _SortedAlerts() for name in sources}
+        self._watermarks: Dict[str, Optional[datetime]] = {
+            name: None for name in sources}
+        self._lock = asyncio.Lock()
+        self._warm_task: Optional[asyncio.Task] = None
+        self.loaded_at: Optional[float] = None
+        self.refreshed_at: Optional[float] = None
+        # Bumped whenever the held alerts change, for caches derived from the view
+        self.version = 0
+
+        self.stats = {
+            'full_loads': 0,
+            'delta_refreshes': 0,
+            'documents_read': 0,
+            'evicted': 0,
+            'refresh_errors': 0
+        }
+
+    def covers(self, hours: int) -> bool:
+        """
+        Whether a request for this many hours can be answered from the view
+
+        False until the view is loaded; the load is (re)started in the
+        background if it is not running, e.g. after reset() or a failed load.
+        """
+        if self.loaded_at is None:
+            self.warm()
+            return False
+        return hours <= self.hours
+
+    def warm(self) -> asyncio.Task:
+        """
+        Load the view in the background unless it is loaded or already loading
+
+        Must be called from a running event loop (e.g. at app startup).
+
+        Returns:
+            The loading task
+        """
+        if self._warm_task is None or (self._warm_task.done() and self.loaded_at is None):
+            self._warm_task = asyncio.get_running_loop().create_task(self.ensure_fresh())
+            self._warm_task.add_done_callback(self._log_warm_failure)
+        return self._warm_task
+
+    @staticmethod
+    def _log_warm_failure(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"❌ Alert map view load failed: {task.exception()}")
+
+    async def ensure_fresh(self) -> bool:
+        """
+        Load the view or apply a delta refresh if it is due
+
+        Concurrent callers share one refresh.
+
+        Returns:
+            True if Firestore was read during this call
+        """
+        if self._is_fresh():
+            return False
+        async with self._lock:
+            if self._is_fresh():
+                return False
+            await self._refresh()
+            return True
+
+    def _is_fresh(self) -> bool:
+        return (self.refreshed_at is not None
+                and time.time() - self.refreshed_at < self.refresh_seconds)
+
+    async def _refresh(self):
+        """Read new documents of every source and evict expired alerts"""
+        full_load = self.loaded_at is None
+        held = self._alerts  # reset() swaps in fresh arrays; results for the old ones are dropped
+        started = time.time()
+        window_start = datetime.utcnow() - timedelta(hours=self.hours)
+
+        for name, source in self.sources.items():
+            watermark = self._watermarks[name]
+            collection = self.get_db().collection(source.collection)
+            if watermark is None:
+                query = (collection
+                         .where(filter=firestore.FieldFilter(source.time_field, '>=', window_start))
+                         .order_by(source.time_field, direction=firestore.Query.DESCENDING)
+                         .limit(self.max_alerts))
+            else:
+                since = watermark - timedelta(seconds=ALERT_MAP_VIEW_OVERLAP_SECONDS)
+                query = collection.where(
+                    filter=firestore.FieldFilter(WATERMARK_FIELD, '>', since))
+            query = query.select(list(dict.fromkeys(source.fields + [WATERMARK_FIELD])))
+
+            entries = []
+            newest_write = watermark
+            try:
+                async for doc in iterate_query(query):
+                    data = doc.to_dict()
+                    self.stats['documents_read'] += 1
+                    written = _as_utc_naive(data.get(WATERMARK_FIELD))
+                    if written and (newest_write is None or written > newest_write):
+                        newest_write = written
+                    try:
+                        entry = source.to_map_alert(doc.id, data)
+                    except Exception as e:
+                        logger.warning(
+                            f"Error materializing {source.collection} doc {doc.id}: {e}")
+                        continue
+                    if entry is not None:
+                        entries.append(entry)
+            except Exception as e:
+                # Keep what is held; the same delta is retried on the next refresh
+                self.stats['refresh_errors'] += 1
+                logger.error(
+                    f"❌ Alert map view refresh of {source.collection} failed: {e}")
+                continue
+
+            if held is not self._alerts:
+                return
+            held[name].upsert_many(entries)
+            if entries:
+                self.version += 1
+            # Never ahead of this host's clock, in case a writer's clock runs fast
+            read_at = datetime.utcfromtimestamp(started)
+            self._watermarks[name] = min(newest_write, read_at) if newest_write else (
+                read_at if full_load else watermark)
+
+        if held is not self._alerts:
+            return
+        cutoff = window_start.replace(tzinfo=timezone.utc).timestamp()
+        for alerts in held.values():
+            evicted = alerts.evict(cutoff, self.max_alerts)
+            if evicted:
+                self.stats['evicted'] += evicted
+                self.version += 1
+
+        if full_load:
+            self.loaded_at = started
+            self.stats['full_loads'] += 1
+        else:
+            self.stats['delta_refreshes'] += 1
+        self.refreshed_at = time.time()
+        logger.info(
+            f"🗺️ Alert map view {'loaded' if full_load else 'refreshed'} in {self.refreshed_at - started:.3f}s: "
+            f"{ {name: len(alerts) for name, alerts in self._alerts.items()} }")
+
+    def recent(self, name: str, hours: int, limit: int) -> List[Dict]:
+        """
+        Newest alerts of a source within the last `hours`
+
+        Args:
+            name: Source name the view was built with
+            hours: Hours to look back (at most the view window)
+            limit: Maximum alerts returned
+
+        Returns:
+            Minimal map alerts, newest first
+        """
+        if limit <= 0:
+            return []
+        cutoff = time.time() - hours * 3600
+        return self._alerts[name].newest(cutoff, limit)
+
+    def get_stats(self) -> Dict:
+        """Return sizes, watermarks and refresh counters"""
+        now = time.time()
+        return {
+            **self.stats,
+            'window_hours': self.hours,
+            'refresh_seconds': self.refresh_seconds,
+            'version': self.version,
+            'alerts': {name: len(alerts) for name, alerts in self._alerts.items()},
+            'watermarks': {name: watermark.isoformat() if watermark else None
+                           for name, watermark in self._watermarks.items()},
+            'loaded_age_seconds': round(now - self.loaded_at, 2) if self.loaded_at else None,
+            'refresh_age_seconds': round(now - self.refreshed_at, 2) if self.refreshed_at else None
+        }
+
+    def reset(self):
+        """Drop everything held; the next request starts reloading the view"""
+        self._alerts = {name: _SortedAlerts() for name in self.sources}
+        self._watermarks = {name: None for name in self.sources}
+        self.loaded_at = None
+        self.refreshed_at = None
+        self.version += 1
+
+
+def _as_utc_naive(value) -> Optional[datetime]:
+    """Firestore returns timezone-aware timestamps; keep watermarks as naive UTC"""
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
@@ -1,7 +1,14 @@
 from monitor.types.alert_categories import get_categories_summary, ALERT_TYPES, categorize_311_complaint, get_alert_type_info, normalize_category, get_main_categories
-from fastapi import APIRouter, HTTPException, Query, Depends
+from monitor.storage.alert_counters import AlertCounters, severity_priority
+from monitor.storage.firestore_pool import iterate_query, run_firestore, stream_query
+from fastapi import APIRouter, HTTPException, Query, Depends, Header, Response
 from sse_starlette.sse import EventSourceResponse
 from google.cloud import firestore
+from ..alert_columns import (COLUMNAR_FORMAT, COLUMNAR_MEDIA_TYPE, OBJECT_FORMAT,
+                             dumps_compact, encode_columnar, wants_columnar)
+from ..alert_clusters import (CLUSTER_MAX_TILES, CLUSTER_MAX_ZOOM, ClusterCache,
+                              parse_bbox, tiles_in_bbox)
+from ..alert_map_view import AlertMapView, MapViewSource, epoch_seconds
 from ..config import get_config
 from ..auth import verify_session
 from ..exceptions import AlertError, DatabaseError
@@ -28,9 +35,142 @@ _cache = {}
 CACHE_TTL_SECONDS = 300  # 5 minutes
 
 
+_db: Optional[firestore.Client] = None
+
+
 def get_db():
-    """Get Firestore client instance"""
-    return firestore.Client(project=get_config().GOOGLE_CLOUD_PROJECT)
+    """
+    Get the shared Firestore client instance.
+
+    Blocking calls on it must go through run_firestore / stream_query /
+    iterate_query so they run on the Firestore thread pool, not the event loop.
+    """
+    global _db
+    if _db is None:
+        _db = firestore.Client(project=get_config().GOOGLE_CLOUD_PROJECT)
+    return _db
+
+
+_alert_counters = None
+
+
+def get_alert_counters() -> AlertCounters:
+    """Get the shared reader of the hourly alert counter buckets"""
+    global _alert_counters
+    if _alert_counters is None:
+        _alert_counters = AlertCounters(get_db())
+    return _alert_counters
+
+
+async def _count_alerts(cutoff_time: datetime) -> Dict[str, Dict]:
+    """
+    Count both collections from cutoff_time onwards
+
+    Returns:
+        Collection name -> counts (see AlertCounters.count), or {'error': ...} if counting failed
+    """
+    counters = get_alert_counters()
+    collections = ['nyc_monitor_alerts', 'nyc_311_signals']
+    results = await asyncio.gather(
+        *(counters.count(collection, cutoff_time) for collection in collections),
+        return_exceptions=True)
+
+    counts = {}
+    for collection, result in zip(collections, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error counting {collection}: {result}")
+            result = {'error': str(result)}
+        counts[collection] = result
+    return counts
+
+
+def _monitor_map_alert(doc_id: str, data: Dict) -> Optional[tuple]:
+    """Minimal map object of a monitor alert document, keyed by its created_at time"""
+    time_key = epoch_seconds(data.get('created_at'))
+    if time_key is None:
+        return None
+
+    original_alert = data.get('original_alert') or {}
+
+    # Extract the real source from the nested structure
+    real_source = 'monitor'  # Default fallback
+    signals = (original_alert.get('original_alert_data') or {}).get('signals', [])
+    if signals and len(signals) > 0:
+        # First signal is the true source (reddit, twitter, etc.)
+        real_source = signals[0]
+
+    # ULTRA-MINIMAL transformation - only essential fields for map display
+    return time_key, {
+        'id': doc_id,
+        'source': real_source,
+        'priority': _get_priority_from_severity(data.get('severity', 5)),
+        'timestamp': _extract_monitor_timestamp(data),
+        'coordinates': {
+            # Empire State Building
+            'lat': original_alert.get('latitude', 40.748817),
+            'lng': original_alert.get('longitude', -73.985428)
+        },
+        'category': normalize_category(data.get('category', 'general')),
+    }
+
+
+def _signal_map_alert(doc_id: str, data: Dict) -> Optional[tuple]:
+    """Minimal map object of a 311 signal document, keyed by its signal_timestamp"""
+    time_key = epoch_seconds(data.get('signal_timestamp'))
+    if time_key is None:
+        return None
+
+    # Use calculated severity from rule-based triage, fallback to emergency logic
+    severity = data.get('severity')
+    if severity is None:
+        # Fallback for old records without severity
+        severity = 7 if data.get('is_emergency', False) else 3
+
+    # Get the main category (may be stored in DB or need to calculate)
+    category = data.get('category')
+    if not category:
+        # Calculate from event_type if available, otherwise from complaint_type
+        event_type = data.get('event_type') or categorize_311_complaint(
+            data.get('complaint_type', ''))
+        category = get_alert_type_info(event_type).category.value
+
+    # ULTRA-MINIMAL transformation - only essential fields for map display
+    return time_key, {
+        'id': doc_id,
+        'source': '311',
+        'priority': _get_priority_from_severity(severity),
+        'timestamp': _extract_311_timestamp(data),
+        'coordinates': {
+            # Empire State Building
+            'lat': data.get('latitude', 40.748817),
+            'lng': data.get('longitude', -73.985428)
+        },
+        'category': normalize_category(category),
+    }
+
+
+# Resident view of the minimal map objects behind /recent
+alert_map_view = AlertMapView(get_db, {
+    'monitor': MapViewSource(
+        collection='nyc_monitor_alerts',
+        time_field='created_at',
+        fields=['created_at', 'severity', 'category',
+                'original_alert.latitude', 'original_alert.longitude',
+                'original_alert.timestamp', 'original_alert.event_date_str',
+                'original_alert.time_created', 'original_alert.created_at',
+                'original_alert.date_created', 'original_alert.event_date',
+                'original_alert.original_alert_data.signals'],
+        to_map_alert=_monitor_map_alert),
+    '311': MapViewSource(
+        collection='nyc_311_signals',
+        time_field='signal_timestamp',
+        fields=['signal_timestamp', 'created_at', 'complaint_type', 'latitude', 'longitude',
+                'is_emergency', 'category', 'severity', 'event_type'],
+        to_map_alert=_signal_map_alert),
+})
+
+# Per-zoom clustered tiles behind /clusters
+cluster_cache = ClusterCache()
 
 
 def get_cache_key(limit: int, hours: int) -> str:
@@ -160,6 +300,7 @@ async def stream_alerts(
                        description="Hours to look back (max 6 months)"),
     chunk_size: int = Query(1000, ge=200, le=5000,
                             description="Number of alerts per chunk"),
+    format: Optional[str] = Query(None, description="Chunk encoding: 'objects' (default) or 'columnar'"),
     user=Depends(verify_session)
 ):
     """
@@ -173,6 +314,8 @@ async def stream_alerts(
 
     Returns alerts in chunks to provide immediate feedback and better UX.
     Each chunk contains a portion of the total alerts with progress information.
+    With format=columnar each chunk's 'alerts' is a columnar block (see
+    rag/alert_columns.py) instead of a list of objects.
 
     **Requires authentication**: Valid Google OAuth token
     """
@@ -183,9 +326,17 @@ async def stream_alerts(
     if chunk_size < 200 or chunk_size > 5000:
         raise AlertError("Chunk size must be between 200 and 5000")
 
+    if format not in (None, OBJECT_FORMAT, COLUMNAR_FORMAT):
+        raise AlertError(
+            f"Format must be '{OBJECT_FORMAT}' or '{COLUMNAR_FORMAT}'")
+    columnar = format == COLUMNAR_FORMAT
+
     logger.info(
         f"🔒 Authenticated user {user.get('email')} starting streaming alerts (hours={hours}, chunk_size={chunk_size})")
 
+    def chunk_alerts(alerts: List[Dict]):
+        return encode_columnar(alerts) if columnar else alerts
+
     async def generate_alert_stream():
         db = None
         try:
@@ -196,19 +347,18 @@ async def stream_alerts(
             # Send initial metadata
             yield f"data: {json.dumps({'type': 'start', 'hours': hours, 'chunk_size': chunk_size, 'cutoff_time': cutoff_time.isoformat()})}\n\n"
 
-            # Skip expensive count queries - use approximate estimates
-            try:
-                logger.info("🔢 Using estimated counts for faster startup...")
-                # Use approximate estimates based on typical data volumes
-                estimated_total = 50000
-
-                # Send estimated count metadata early
-                yield f"data: {json.dumps({'type': 'count', 'monitor_total': 1000, 'signals_total': 49000, 'estimated_total': estimated_total, 'estimated': True})}\n\n"
-
-            except Exception as count_error:
-                logger.warning(f"Error with estimates: {count_error}")
+            # Exact totals from the hourly counter buckets (a few dozen small reads)
+            counts = await _count_alerts(cutoff_time)
+            monitor_counts = counts['nyc_monitor_alerts']
+            signals_counts = counts['nyc_311_signals']
+            if 'error' in monitor_counts or 'error' in signals_counts:
                 # Send unknown count so frontend knows counting failed
-                yield f"data: {json.dumps({'type': 'count', 'estimated_total': -1, 'count_error': str(count_error)})}\n\n"
+                count_error = monitor_counts.get('error') or signals_counts.get('error')
+                yield f"data: {json.dumps({'type': 'count', 'estimated_total': -1, 'count_error': count_error})}\n\n"
+            else:
+                logger.info(
+                    f"🔢 Counted {monitor_counts['total']} monitor alerts and {signals_counts['total']} 311 signals")
+                yield f"data: {json.dumps({'type': 'count', 'monitor_total': monitor_counts['total'], 'signals_total': signals_counts['total'], 'estimated_total': monitor_counts['total'] + signals_counts['total'], 'estimated': False, 'breakdown': counts})}\n\n"
 
             total_alerts = []
             chunk_num = 0
@@ -223,7 +373,7 @@ async def stream_alerts(
                 monitor_alerts = []
                 try:
                     # Convert stream to list to avoid iterator issues
-                    docs = list(monitor_query.stream())
+                    docs = await stream_query(monitor_query)
                     for doc in docs:
                         try:
                             data = doc.to_dict()
@@ -265,7 +415,7 @@ async def stream_alerts(
                 if monitor_alerts:
                     chunk_num += 1
                     total_alerts.extend(monitor_alerts)
-                    yield f"data: {json.dumps({'type': 'chunk', 'chunk': chunk_num, 'alerts': monitor_alerts, 'source': 'monitor', 'total_so_far': len(total_alerts), 'alerts_in_chunk': len(monitor_alerts)})}\n\n"
+                    yield f"data: {json.dumps({'type': 'chunk', 'chunk': chunk_num, 'alerts': chunk_alerts(monitor_alerts), 'source': 'monitor', 'total_so_far': len(total_alerts), 'alerts_in_chunk': len(monitor_alerts)})}\n\n"
 
             except Exception as e:
                 logger.error(f"Monitor streaming error: {e}")
@@ -288,7 +438,7 @@ async def stream_alerts(
 
                 try:
                     # Process documents in a single pass without intermediate storage
-                    for doc in signals_query.stream():
+                    async for doc in iterate_query(signals_query):
                         try:
                             if docs_processed >= max_docs_to_process:
                                 logger.warning(
@@ -334,7 +484,7 @@ async def stream_alerts(
                             if len(signals_batch) >= chunk_size:
                                 chunk_num += 1
                                 total_alerts.extend(signals_batch)
-                                yield f"data: {json.dumps({'type': 'chunk', 'chunk': chunk_num, 'alerts': signals_batch, 'source': '311', 'total_so_far': len(total_alerts), 'signals_processed': signals_processed, 'alerts_in_chunk': len(signals_batch)})}\n\n"
+                                yield f"data: {json.dumps({'type': 'chunk', 'chunk': chunk_num, 'alerts': chunk_alerts(signals_batch), 'source': '311', 'total_so_far': len(total_alerts), 'signals_processed': signals_processed, 'alerts_in_chunk': len(signals_batch)})}\n\n"
                                 signals_batch = []
 
                         except Exception as doc_error:
@@ -350,7 +500,7 @@ async def stream_alerts(
                 if signals_batch:
                     chunk_num += 1
                     total_alerts.extend(signals_batch)
-                    yield f"data: {json.dumps({'type': 'chunk', 'chunk': chunk_num, 'alerts': signals_batch, 'source': '311', 'total_so_far': len(total_alerts), 'signals_processed': signals_processed, 'alerts_in_chunk': len(signals_batch)})}\n\n"
+                    yield f"data: {json.dumps({'type': 'chunk', 'chunk': chunk_num, 'alerts': chunk_alerts(signals_batch), 'source': '311', 'total_so_far': len(total_alerts), 'signals_processed': signals_processed, 'alerts_in_chunk': len(signals_batch)})}\n\n"
 
             except Exception as e:
                 logger.error(f"311 streaming error: {e}")
@@ -395,22 +545,26 @@ async def get_recent_alerts(
                        description="Number of alerts to return"),
     hours: int = Query(24, ge=1, le=4320,
                        description="Hours to look back (max 6 months)"),
+    format: Optional[str] = Query(None, description="Payload encoding: 'objects' (default) or 'columnar'"),
+    accept: Optional[str] = Header(None),
     user=Depends(verify_session)
 ):
     """
     Get recent alerts with ULTRA-MINIMAL data - optimized for map display
 
     Returns only essential fields:
-    - Core: id, title, description, source, priority, status, timestamp
-    - Location: coordinates, neighborhood, borough, category  
-    - Investigation: reportUrl, traceId, investigationId (if present)
+    - Core: id, source, priority, timestamp
+    - Location: coordinates, category
 
     Optimizations:
     - Ultra-minimal field selection (90%+ payload reduction)
-    - NO unnecessary metadata or nested objects
-    - NO deduplication (raw speed over duplicate removal)
-    - NO sorting (database order for maximum performance)
-    - In-memory caching (5 min TTL)
+    - Windows up to ALERT_MAP_VIEW_HOURS are served from a resident
+      materialized view (time-sorted, newest first) that only reads documents
+      written since its last refresh
+    - Longer windows query Firestore directly, cached in memory (5 min TTL)
+    - Opt-in columnar payload (format=columnar or an Accept header of
+      application/vnd.nyc-monitor.alerts.columnar+json): parallel arrays with
+      dictionary-encoded source/priority/category, several times smaller
 
     **Requires authentication**: Valid Google OAuth token
     """
@@ -421,9 +575,40 @@ async def get_recent_alerts(
     if hours < 1 or hours > 4320:
         raise AlertError("Hours must be between 1 and 4320 (6 months)")
 
+    if format not in (None, OBJECT_FORMAT, COLUMNAR_FORMAT):
+        raise AlertError(
+            f"Format must be '{OBJECT_FORMAT}' or '{COLUMNAR_FORMAT}'")
+
     logger.info(
         f"🔒 Authenticated user {user.get('email')} accessing recent alerts")
 
+    # Allocate limits
+    monitor_limit = min(600, int(limit * 0.3))  # 30% for monitor
+    signals_limit = limit - monitor_limit   # 70% for 311
+
+    if alert_map_view.covers(hours):
+        result = await _get_recent_alerts_from_view(hours, monitor_limit, signals_limit, user)
+    else:
+        result = await _get_recent_alerts_from_firestore(limit, hours, monitor_limit, signals_limit, user)
+
+    if wants_columnar(format, accept):
+        return _columnar_response(result)
+    return result
+
+
+def _columnar_response(result: Dict) -> Response:
+    """Serialize a /recent result with its alerts encoded as columns"""
+    start_time = time.perf_counter()
+    body = {**result, 'alerts': encode_columnar(result['alerts'])}
+    content = dumps_compact(body)
+    logger.info(
+        f"📦 Columnar payload: {result['count']} alerts, {len(content)} bytes in {time.perf_counter() - start_time:.3f}s")
+    return Response(content=content, media_type=COLUMNAR_MEDIA_TYPE)
+
+
+async def _get_recent_alerts_from_firestore(limit: int, hours: int, monitor_limit: int,
+                                            signals_limit: int, user) -> Dict:
+    """Answer /recent by querying Firestore directly (windows longer than the map view)"""
     # Check cache first
     cache_key = f"minimal:{limit}:{hours}"
 
@@ -442,10 +627,6 @@ async def get_recent_alerts(
     db = get_db()
     cutoff_time = datetime.utcnow() - timedelta(hours=hours)
 
-    # Allocate limits
-    monitor_limit = min(600, int(limit * 0.3))  # 30% for monitor
-    signals_limit = limit - monitor_limit   # 70% for 311
-
     logger.info(
         f"🚀 MINIMAL FETCH: {monitor_limit} monitor + {signals_limit} 311")
 
@@ -460,41 +641,10 @@ async def get_recent_alerts(
                          .where(filter=firestore.FieldFilter('created_at', '>=', cutoff_time))
                          .limit(monitor_limit))
 
-        for doc in monitor_query.stream():
-            data = doc.to_dict()
-
-            # Extract the real source from the nested structure
-            real_source = 'monitor'  # Default fallback
-            try:
-                original_alert = data.get('original_alert', {})
-                if original_alert:
-                    original_alert_data = original_alert.get(
-                        'original_alert_data', {})
-                    if original_alert_data:
-                        signals = original_alert_data.get('signals', [])
-                        if signals and len(signals) > 0:
-                            # First signal is the true source (reddit, twitter, etc.)
-                            real_source = signals[0]
-            except Exception as e:
-                logger.warning(
-                    f"Could not extract source for alert {doc.id}: {e}")
-
-            # ULTRA-MINIMAL transformation - only essential fields for map display
-            alert = {
-                'id': doc.id,
-                'source': real_source,
-                'priority': _get_priority_from_severity(data.get('severity', 5)),
-                'timestamp': _extract_monitor_timestamp(data),
-                'coordinates': {
-                    # Empire State Building
-                    'lat': data.get('original_alert', {}).get('latitude', 40.748817),
-                    'lng': data.get('original_alert', {}).get('longitude', -73.985428)
-                },
-                'category': normalize_category(data.get('category', 'general')),
-            }
-            all_alerts.append(alert)
-            # logger.info(
-            #     f"✅ Alert {doc.id} has priority: {alert.get('priority')}")
+        for doc in await stream_query(monitor_query):
+            entry = _monitor_map_alert(doc.id, doc.to_dict())
+            if entry is not None:
+                all_alerts.append(entry[1])
 
         monitor_time = (datetime.utcnow() - monitor_start).total_seconds()
         query_stats['monitor'] = {
@@ -515,47 +665,15 @@ async def get_recent_alerts(
         signals_ref = db.collection('nyc_311_signals')
         signals_query = (signals_ref
                          .where(filter=firestore.FieldFilter('signal_timestamp', '>=', cutoff_time))
-                         .select(['signal_timestamp', 'complaint_type', 'descriptor', 'latitude', 'longitude', 'is_emergency', 'category', 'full_signal_data', 'incident_zip', 'borough', 'status', 'severity', 'event_type'])
+                         .select(alert_map_view.sources['311'].fields)
                          .limit(signals_limit))
 
         signals_count = 0
-        for doc in signals_query.stream():
-            data = doc.to_dict()
-
-            # Use calculated severity from rule-based triage, fallback to emergency logic
-            severity = data.get('severity')
-            if severity is None:
-                # Fallback for old records without severity
-                severity = 7 if data.get('is_emergency', False) else 3
-
-            # Get categorization (may be stored in DB or need to calculate)
-            complaint_type = data.get('complaint_type', '')
-
-            # Get the main category (simplified approach) - ORIGINAL OPTIMIZED LOGIC
-            category = data.get('category')
-            if not category:
-                # Calculate from event_type if available, otherwise from complaint_type
-                event_type = data.get(
-                    'event_type') or categorize_311_complaint(complaint_type)
-                alert_type_info = get_alert_type_info(event_type)
-                category = alert_type_info.category.value
-
-            # ULTRA-MINIMAL transformation - only essential fields for map display
-            alert = {
-                'id': doc.id,
-                'source': '311',
-                'priority': _get_priority_from_severity(severity),
-                'timestamp': _extract_311_timestamp(data),
-                'coordinates': {
-                    # Empire State Building
-                    'lat': data.get('latitude', 40.748817),
-                    'lng': data.get('longitude', -73.985428)
-                },
-                'category': normalize_category(category),
-            }
-
-            all_alerts.append(alert)
-            signals_count += 1
+        for doc in await stream_query(signals_query):
+            entry = _signal_map_alert(doc.id, doc.to_dict())
+            if entry is not None:
+                all_alerts.append(entry[1])
+                signals_count += 1
 
         signals_time = (datetime.utcnow() - signals_start).total_seconds()
         query_stats['311'] = {
@@ -595,6 +713,125 @@ async def get_recent_alerts(
     return result
 
 
+async def _get_recent_alerts_from_view(hours: int, monitor_limit: int, signals_limit: int, user) -> Dict:
+    """Answer /recent by slicing the resident alert map view"""
+    start_time = time.perf_counter()
+    refreshed = await alert_map_view.ensure_fresh()
+    refresh_time = time.perf_counter() - start_time
+
+    monitor_alerts = alert_map_view.recent('monitor', hours, monitor_limit)
+    signal_alerts = alert_map_view.recent('311', hours, signals_limit)
+    all_alerts = monitor_alerts + signal_alerts
+
+    total_time = time.perf_counter() - start_time
+    view_stats = alert_map_view.get_stats()
+
+    logger.info(
+        f"🎯 MAP VIEW: {len(all_alerts)} alerts in {total_time:.3f}s "
+        f"({'refreshed' if refreshed else 'no Firestore reads'})")
+
+    return {
+        'alerts': all_alerts,
+        'count': len(all_alerts),
+        'performance': {
+            'total_time_seconds': round(total_time, 3),
+            'alerts_per_second': round(len(all_alerts) / total_time if total_time > 0 else 0, 1),
+            'query_breakdown': {
+                'monitor': {
+                    'count': len(monitor_alerts),
+                    'sources_found': list(set(a['source'] for a in monitor_alerts))
+                },
+                '311': {'count': len(signal_alerts)},
+                'refresh_time_seconds': round(refresh_time, 3)
+            },
+            'optimizations': ['materialized_view', 'delta_refresh', 'time_sorted_slice', 'ultra_minimal_fields'],
+            'cached': not refreshed,
+            'cache_age_seconds': view_stats['refresh_age_seconds'],
+            'cache_ttl_seconds': alert_map_view.refresh_seconds,
+            'view': view_stats,
+            'accessed_by': user.get('email')  # Track who accessed the data
+        }
+    }
+
+
+@alerts_router.get('/clusters')
+async def get_alert_clusters(
+    bbox: str = Query(..., description="Viewport as west,south,east,north in degrees"),
+    zoom: int = Query(12, ge=0, le=CLUSTER_MAX_ZOOM, description="Map zoom level"),
+    hours: int = Query(24, ge=1, le=4320,
+                       description="Hours to look back (max 6 months)"),
+    user=Depends(verify_session)
+):
+    """
+    Get pre-aggregated alert clusters for a map viewport
+
+    Alerts are binned on a zoom-dependent grid (16 x 16 cells per map tile);
+    each non-empty cell in the viewport's tiles is returned as one cluster with
+    its count, centroid, dominant category and highest priority. Single-alert
+    clusters carry the alert id. Each tile is clustered once and cached, so the
+    response size is bounded by the screen, not by the number of alerts.
+
+    **Requires authentication**: Valid Google OAuth token
+    """
+    # Input validation
+    viewport = parse_bbox(bbox)
+    if viewport is None:
+        raise AlertError(
+            "bbox must be west,south,east,north with valid longitudes and latitudes")
+
+    if zoom < 0 or zoom > CLUSTER_MAX_ZOOM:
+        raise AlertError(f"Zoom must be between 0 and {CLUSTER_MAX_ZOOM}")
+
+    if hours < 1 or hours > 4320:
+        raise AlertError("Hours must be between 1 and 4320 (6 months)")
+
+    x_range, y_range = tiles_in_bbox(viewport, zoom)
+    if len(x_range) * len(y_range) > CLUSTER_MAX_TILES:
+        raise AlertError(
+            f"bbox covers more than {CLUSTER_MAX_TILES} tiles at zoom {zoom}; zoom out or shrink it")
+
+    logger.info(
+        f"🔒 Authenticated user {user.get('email')} accessing alert clusters (zoom={zoom}, hours={hours})")
+
+    start_time = time.perf_counter()
+    if alert_map_view.covers(hours):
+        await alert_map_view.ensure_fresh()
+        # The minute bucket moves the hours window along even when nothing new arrived
+        version = ('view', alert_map_view.version, int(time.time() // 60))
+        max_alerts = alert_map_view.max_alerts
+
+        def load_alerts():
+            return (alert_map_view.recent('monitor', hours, max_alerts) +
+                    alert_map_view.recent('311', hours, max_alerts))
+    else:
+        result = await _get_recent_alerts_from_firestore(
+            50000, hours, 600, 50000 - 600, user)
+        # Changes whenever the /recent cache entry is refreshed; unlike the id()
+        # of its alert list it is never reused once the entry is dropped
+        recent_entry = _cache.get(f"minimal:{50000}:{hours}") or {}
+        version = ('firestore', recent_entry.get('timestamp', time.time()))
+
+        def load_alerts():
+            return result['alerts']
+
+    clusters = cluster_cache.clusters(version, hours, zoom, viewport, load_alerts)
+    total_time = time.perf_counter() - start_time
+
+    return {
+        'clusters': clusters,
+        'count': len(clusters),
+        'total_alerts': sum(cluster['count'] for cluster in clusters),
+        'zoom': zoom,
+        'bbox': viewport._asdict(),
+        'hours': hours,
+        'performance': {
+            'total_time_seconds': round(total_time, 3),
+            'cluster_cache': cluster_cache.get_stats(),
+            'accessed_by': user.get('email')
+        }
+    }
+
+
 @alerts_router.get('/get/{alert_id}')
 async def get_single_alert(alert_id: str, user=Depends(verify_session)):
     """
@@ -616,8 +853,8 @@ async def get_single_alert(alert_id: str, user=Depends(verify_session)):
 
     # Try monitor collection first
     try:
-        monitor_doc = db.collection(
-            'nyc_monitor_alerts').document(alert_id).get()
+        monitor_doc = await run_firestore(db.collection(
+            'nyc_monitor_alerts').document(alert_id).get)
         if monitor_doc.exists:
             alert_data = monitor_doc.to_dict()
             alert_data['id'] = monitor_doc.id
@@ -635,8 +872,8 @@ async def get_single_alert(alert_id: str, user=Depends(verify_session)):
 
     # Try 311 collection
     try:
-        signals_doc = db.collection(
-            'nyc_311_signals').document(alert_id).get()
+        signals_doc = await run_firestore(db.collection(
+            'nyc_311_signals').document(alert_id).get)
         if signals_doc.exists:
             signal_data = signals_doc.to_dict()
 
@@ -659,7 +896,7 @@ async def get_single_alert(alert_id: str, user=Depends(verify_session)):
         signals_ref = db.collection('nyc_311_signals')
         query = signals_ref.where(filter=firestore.FieldFilter(
             'unique_key', '==', alert_id)).limit(1)
-        docs = list(query.stream())
+        docs = await stream_query(query)
 
         if docs:
             doc = docs[0]
@@ -686,14 +923,7 @@ async def get_single_alert(alert_id: str, user=Depends(verify_session)):
 
 def _get_priority_from_severity(severity: int) -> str:
     """Convert severity number to priority string"""
-    if severity >= 8:
-        return 'critical'
-    elif severity >= 6:
-        return 'high'
-    elif severity >= 4:
-        return 'medium'
-    else:
-        return 'low'
+    return severity_priority(severity)
 
 
 def _normalize_311_alert_status(status: str) -> str:
@@ -847,6 +1077,7 @@ async def get_cache_info(user=Depends(verify_session)):
         'cache_ttl_seconds': CACHE_TTL_SECONDS,
         'entries': cache_info,
         'total_entries': len(_cache),
+        'alert_map_view': alert_map_view.get_stats(),
         'accessed_by': user.get('email')
     }
 
@@ -863,6 +1094,8 @@ async def clear_cache(user=Depends(verify_session)):
 
     cleared_count = len(_cache)
     _cache.clear()
+    alert_map_view.reset()
+    cluster_cache.clear()
     return {
         'message': f"Cleared {cleared_count} cache entries",
         'cache_size': len(_cache),
@@ -888,37 +1121,27 @@ async def get_alert_stats(
     logger.info(
         f"🔒 Authenticated user {user.get('email')} accessing alert stats")
 
-    db = get_db()
     cutoff_time = datetime.utcnow() - timedelta(hours=hours)
+    counts = await _count_alerts(cutoff_time)
 
     stats = {
-        'monitor_alerts': 0,
-        'nyc_311_signals': 0,
-        'total': 0
+        'monitor_alerts': counts['nyc_monitor_alerts'].get('total', 0),
+        'nyc_311_signals': counts['nyc_311_signals'].get('total', 0),
     }
-
-    # Count monitor alerts
-    try:
-        monitor_ref = db.collection('nyc_monitor_alerts')
-        monitor_docs = monitor_ref.where(
-            filter=firestore.FieldFilter('created_at', '>=', cutoff_time)).stream()
-        stats['monitor_alerts'] = sum(1 for _ in monitor_docs)
-    except Exception as e:
-        logger.error(f"Error counting monitor alerts: {e}")
-
-    # Count 311 signals
-    try:
-        signals_ref = db.collection('nyc_311_signals')
-        signals_docs = signals_ref.where(
-            filter=firestore.FieldFilter('signal_timestamp', '>=', cutoff_time)).stream()
-        stats['nyc_311_signals'] = sum(1 for _ in signals_docs)
-    except Exception as e:
-        logger.error(f"Error counting 311 signals: {e}")
-
     stats['total'] = stats['monitor_alerts'] + stats['nyc_311_signals']
 
+    # Combined breakdowns (only when both collections were counted from buckets)
+    if all(result.get('method') == 'buckets' for result in counts.values()):
+        for field in ('by_source', 'by_category', 'by_priority'):
+            combined = {}
+            for result in counts.values():
+                for value, count in result[field].items():
+                    combined[value] = combined.get(value, 0) + count
+            stats[field] = combined
+
     return {
         'stats': stats,
+        'collections': counts,
         'timeframe': f"Last {hours} hours",
         'generated_at': datetime.utcnow().isoformat(),
         'accessed_by': user.get('email')
@@ -982,7 +1205,8 @@ async def get_agent_trace(trace_id: str, user=Depends(verify_session)):
     db = get_db()
 
     # Fetch trace document
-    trace_doc = db.collection('agent_traces').document(trace_id).get()
+    trace_doc = await run_firestore(
+        db.collection('agent_traces').document(trace_id).get)
 
     if not trace_doc.exists:
         raise AlertError(
@@ -1104,7 +1328,7 @@ async def get_alerts_with_reports(
         monitor_count = 0
         total_resolved = 0
 
-        for doc in resolved_query.stream():
+        for doc in await stream_query(resolved_query):
             data = doc.to_dict()
             total_resolved += 1
 
@@ -1183,7 +1407,7 @@ async def get_alerts_with_reports(
         signals_count = 0
         total_311_resolved = 0
 
-        for doc in resolved_311_query.stream():
+        for doc in await stream_query(resolved_311_query):
             data = doc.to_dict()
             total_311_resolved += 1
 
@@ -1,5 +1,6 @@
 from .auth import verify_session
 from .endpoints import chat_router, investigation_router, auth_router, admin_router, alerts_router
+from .endpoints.alerts_endpoints import alert_map_view
 from .config import initialize_config, get_config
 from .exceptions import (
     APIError,
@@ -17,6 +18,7 @@ from google.auth.transport import requests as grequests
 import os
 from dotenv import load_dotenv
 import logging
+from contextlib import asynccontextmanager
 from datetime import datetime
 
 # Only load .env file in development (not in production containers)
@@ -56,11 +58,20 @@ if config.RAG_CORPUS:
 else:
     logger.warning("RAG_CORPUS not found in environment!")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the alert map view in the background instead of in the first request
+    alert_map_view.warm()
+    yield
+
+
 app = FastAPI(
     title="NYC Monitor Backend",
     description="Backend service for NYC Monitor application",
     version="0.1.0",
-    root_path="/api"
+    root_path="/api",
+    lifespan=lifespan
 )
 
 # Configure all middleware in one place
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the shared NYC relevance matcher used by all collectors.
+
+Compares the precompiled KeywordMatcher against the previous per-identifier
+substring / regex loop on the 311 sample signals plus a few synthetic posts,
+and checks that both produce the same NYC relevance results.
+
+Usage:
+    python scripts/benchmark_keyword_matcher.py [iterations]
+"""
+import glob
+import json
+import os
+import re
+import sys
+import time
+
+# Add backend to path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+from monitor.collectors.base_collector import BaseCollector  # noqa: E402
+
+
+class _BenchmarkCollector(BaseCollector):
+    """Minimal concrete collector so the shared helpers can be called"""
+
+    async def collect_signals(self):
+        return []
+
+
+SYNTHETIC_POSTS = [
+    ("Water main break on 5th Avenue", "Traffic accident near Times Square, police on scene and road closure in effect"),
+    ("Pride parade this weekend", "Huge street festival in the West Village, expect a large crowd and street closure"),
+    ("Anyone else hear that?", "Loud music from the building next door again, third night in a row"),
+    ("Hackathon at Cornell Tech", "Tech meetup and startup event on Roosevelt Island, pizza provided"),
+    ("Best bagels?", "Looking for recommendations, just moved here from Chicago"),
+    ("Subway delay on the L", "MTA says signal problems at Bedford Av, use the alternate route via the G"),
+    ("Knicks game tonight at MSG", "Madison Square Garden area will be packed, avoid Penn Station"),
+    ("Zip code question", "Is 11211 considered Williamsburg or Greenpoint? My lease says 10012"),
+]
+
+
+LEGACY_NYC_IDENTIFIERS = [identifier for identifiers in BaseCollector.NYC_IDENTIFIER_CATEGORIES.values()
+                          for identifier in identifiers]
+
+
+def legacy_is_nyc_relevant(title, content):
+    """Previous implementation: one regex search or substring test per identifier"""
+    full_text = f"{title} {content}".lower()
+    for identifier in LEGACY_NYC_IDENTIFIERS:
+        if len(identifier) <= 3:
+            if re.search(rf'\b{re.escape(identifier)}\b', full_text, re.IGNORECASE):
+                return True
+        elif identifier in full_text:
+            return True
+    return False
+
+
+def load_corpus():
+    """Load (title, content) pairs from the bundled 311 samples plus synthetic posts"""
+    corpus = list(SYNTHETIC_POSTS)
+    for path in sorted(glob.glob(os.path.join(backend_dir, 'nyc_311_sample_signals_*.json'))):
+        with open(path) as f:
+            data = json.load(f)
+        for signal in data.get('sample_signals', []):
+            corpus.append((signal.get('title', ''), signal.get('content', '')))
+    return corpus
+
+
+def time_it(func, corpus, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for title, content in corpus:
+            func(title, content)
+    elapsed = time.perf_counter() - start
+    return elapsed / (iterations * len(corpus)) * 1e6
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    collector = _BenchmarkCollector('benchmark')
+    corpus = load_corpus()
+
+    print("🧪 KEYWORD MATCHER BENCHMARK")
+    print("=" * 60)
+    print(f"📄 Corpus: {len(corpus)} texts, {iterations} iterations")
+
+    # Parity checks against the previous implementation
+    mismatches = 0
+    for title, content in corpus:
+        if collector._is_nyc_relevant(title, content) != legacy_is_nyc_relevant(title, content):
+            mismatches += 1
+            print(f"❌ Relevance mismatch: {title[:60]}")
+    print(f"✅ Parity: {len(corpus) - mismatches}/{len(corpus)} checks match")
+
+    results = [
+        ("nyc relevance (legacy loop)", time_it(legacy_is_nyc_relevant, corpus, iterations)),
+        ("nyc relevance (matcher)", time_it(collector._is_nyc_relevant, corpus, iterations)),
+    ]
+    print("\n⏱️  Per-text latency:")
+    for name, micros in results:
+        print(f"   {name:<30} {micros:8.2f} µs")
+
+    return mismatches == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -220,6 +220,37 @@ async def test_geocoder():
     return results
 
 
+def test_offline_gazetteer():
+    """Well-known places and grid intersections resolve without any network call"""
+    from monitor.utils.gazetteer import get_gazetteer
+
+    print("\n🗺️ Testing offline gazetteer tier")
+    gazetteer = get_gazetteer()
+
+    cases = [
+        ('Times Square, New York, NY', 'venue', 'Manhattan'),
+        ('Williamsburg, Brooklyn, New York, NY', 'neighborhood', 'Brooklyn'),
+        ('union square station', 'neighborhood', 'Manhattan'),
+        ('5th avenue and 42nd street', 'intersection', 'Midtown'),
+        ('8th ave & w 42nd st', 'intersection', 'Manhattan'),
+    ]
+    for query, query_type, expected in cases:
+        result = gazetteer.resolve(query, query_type)
+        print(f"   {query} -> {result and result['formatted_address']}")
+        assert result and result['source'] == 'gazetteer'
+        assert expected in result['formatted_address']
+        assert is_valid_nyc_coordinates(result['lat'], result['lng'])
+
+    # 5th Ave & 42nd St is at roughly 40.7532, -73.9814
+    intersection = gazetteer.resolve('5th avenue and 42nd street', 'intersection')
+    assert abs(intersection['lat'] - 40.7532) < 0.002
+    assert abs(intersection['lng'] + 73.9814) < 0.002
+
+    # Unknown places and non-grid streets are left to Nominatim
+    assert gazetteer.resolve('123 Main Street', 'address') is None
+    assert gazetteer.resolve('madison avenue and 10th street', 'intersection') is None
+
+
 def is_valid_nyc_coordinates(lat: float, lng: float) -> bool:
     """Check if coordinates are within reasonable NYC bounds"""
     # NYC approximate bounds
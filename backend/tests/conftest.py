@@ -4,9 +4,13 @@ Pytest configuration and shared fixtures for RAG backend tests.
 
 import pytest
 import os
+import uuid
 from unittest.mock import Mock, patch
 from typing import Dict, Any
 
+from google.api_core import exceptions as core_exceptions
+from google.cloud.firestore_v1 import transforms
+
 from fastapi.testclient import TestClient
 
 
@@ -133,3 +137,168 @@ def mock_state_manager():
         mock_state.is_complete = True
         mock_manager.get_investigation.return_value = mock_state
         yield mock_manager
+
+
+class FakeSnapshot:
+    """Document snapshot of the in-memory Firestore"""
+
+    def __init__(self, reference, data):
+        self.reference = reference
+        self.id = reference.id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+
+class FakeDocumentReference:
+    """Document reference of the in-memory Firestore"""
+
+    def __init__(self, db, path):
+        self.db = db
+        self.path = path
+        self.id = path[-1]
+
+    def collection(self, name):
+        return FakeQuery(self.db, self.path + (name,))
+
+    def get(self):
+        return FakeSnapshot(self, self.db.documents.get(self.path))
+
+    def set(self, data, merge=False):
+        self.db._apply(self.path, data, merge)
+
+    def create(self, data):
+        if self.path in self.db.documents:
+            raise core_exceptions.AlreadyExists(f"Document already exists: {'/'.join(self.path)}")
+        self.db._apply(self.path, data, False)
+
+
+class FakeAggregation:
+    def __init__(self, value):
+        self.value = value
+
+
+class FakeQuery:
+    """Collection reference / query of the in-memory Firestore (field filters only)"""
+
+    OPERATORS = {
+        '==': lambda a, b: a == b,
+        '<': lambda a, b: a < b,
+        '<=': lambda a, b: a <= b,
+        '>': lambda a, b: a > b,
+        '>=': lambda a, b: a >= b,
+    }
+
+    def __init__(self, db, path, filters=(), order=None, max_results=None):
+        self.db = db
+        self.path = path
+        self.filters = filters
+        self.order = order
+        self.max_results = max_results
+
+    def document(self, document_id=None):
+        return FakeDocumentReference(self.db, self.path + (document_id or uuid.uuid4().hex[:20],))
+
+    def where(self, filter):
+        return FakeQuery(self.db, self.path, self.filters + (filter,), self.order, self.max_results)
+
+    def order_by(self, field_path, direction='ASCENDING'):
+        return FakeQuery(self.db, self.path, self.filters, (field_path, direction), self.max_results)
+
+    def limit(self, count):
+        return FakeQuery(self.db, self.path, self.filters, self.order, count)
+
+    def select(self, field_paths):
+        return self
+
+    def stream(self):
+        self.db.queries.append(self)
+        matches = [(path, data) for path, data in sorted(self.db.documents.items())
+                   if path[:-1] == self.path and all(
+                       f.field_path in data and self.OPERATORS[f.op_string](data[f.field_path], f.value)
+                       for f in self.filters)]
+        if self.order is not None:
+            field_path, direction = self.order
+            matches.sort(key=lambda match: match[1][field_path], reverse=direction == 'DESCENDING')
+        for path, data in matches[:self.max_results]:
+            yield FakeSnapshot(FakeDocumentReference(self.db, path), data)
+
+    def count(self, alias=None):
+        query = self
+        return Mock(get=lambda: [[FakeAggregation(sum(1 for _ in query.stream()))]])
+
+
+class FakeBatch:
+    """Write batch of the in-memory Firestore, failing as configured on the client"""
+
+    def __init__(self, db):
+        self.db = db
+        self.writes = []
+
+    def set(self, reference, data, merge=False):
+        self.writes.append((reference.path, data, merge))
+
+    def commit(self):
+        self.db.commits += 1
+        if self.db.commit_errors:
+            raise self.db.commit_errors.pop(0)
+        rejected = [path[-1] for path, _, _ in self.writes if path[-1] in self.db.rejected_ids]
+        if rejected:
+            raise core_exceptions.InvalidArgument(f"Rejected document {rejected[0]}")
+        for path, data, merge in self.writes:
+            self.db._apply(path, data, merge)
+
+
+class FakeFirestore:
+    """
+    In-memory stand-in for firestore.Client
+
+    Supports document and subcollection references, field filter queries,
+    count() aggregations, getAll, batches with Increment/Minimum/Maximum
+    transforms, and injected commit failures:
+    commit_errors are raised by the next commits in order, and a batch
+    containing one of rejected_ids is rejected.
+    """
+
+    def __init__(self):
+        self.documents = {}
+        self.commit_errors = []
+        self.rejected_ids = set()
+        self.commits = 0
+        self.queries = []
+
+    def collection(self, name):
+        return FakeQuery(self, (name,))
+
+    def batch(self):
+        return FakeBatch(self)
+
+    def get_all(self, references, field_paths=None):
+        return [reference.get() for reference in references]
+
+    def _apply(self, path, data, merge):
+        current = dict(self.documents.get(path) or {}) if merge else {}
+        self.documents[path] = self._merge(current, data)
+
+    @classmethod
+    def _merge(cls, current, data):
+        for key, value in data.items():
+            if isinstance(value, dict):
+                current[key] = cls._merge(dict(current.get(key) or {}), value)
+            elif isinstance(value, transforms.Increment):
+                current[key] = current.get(key, 0) + value.value
+            elif isinstance(value, transforms.Maximum):
+                current[key] = value.value if current.get(key) is None else max(current[key], value.value)
+            elif isinstance(value, transforms.Minimum):
+                current[key] = value.value if current.get(key) is None else min(current[key], value.value)
+            else:
+                current[key] = value
+        return current
+
+
+@pytest.fixture
+def fake_firestore():
+    """An empty in-memory Firestore client"""
+    return FakeFirestore()
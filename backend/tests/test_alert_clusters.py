@@ -0,0 +1,109 @@
+"""
+Unit tests for the server-side map clustering.
+Clusters alerts around Manhattan at several zoom levels and checks the tile
+cache against changing alert sets.
+"""
+
+from rag.alert_clusters import BoundingBox, ClusterCache, cluster_tile, index_alerts, parse_bbox, tile_points
+
+MANHATTAN = BoundingBox(-74.03, 40.69, -73.90, 40.88)
+
+
+def map_alert(alert_id: str, lat: float, lng: float, priority: str = 'low', category: str = 'infrastructure') -> dict:
+    """A minimal map alert"""
+    return {'id': alert_id, 'coordinates': {'lat': lat, 'lng': lng},
+            'priority': priority, 'category': category}
+
+
+ALERTS = [
+    map_alert('a', 40.7580, -73.9855, 'medium'),
+    map_alert('b', 40.7581, -73.9856, 'critical', 'safety'),
+    map_alert('c', 40.7582, -73.9854),
+    map_alert('d', 40.7061, -74.0087),
+    {'id': 'no-coordinates', 'coordinates': {}, 'priority': 'high', 'category': 'safety'},
+]
+
+
+class TestClustering:
+    """Test cases for clustering one tile."""
+
+    def test_nearby_alerts_form_one_cluster(self):
+        """Alerts a few metres apart share a cell; the cluster summarizes them."""
+        clusters = ClusterCache().clusters('v1', 24, 12, MANHATTAN, lambda: ALERTS)
+
+        by_count = sorted(clusters, key=lambda cluster: cluster['count'])
+        assert [cluster['count'] for cluster in by_count] == [1, 3]
+        lone, group = by_count
+        assert lone['id'] == 'd'
+        assert group['priority'] == 'critical'
+        assert group['category'] == 'infrastructure'
+        assert group['categories'] == {'infrastructure': 2, 'safety': 1}
+        assert abs(group['lat'] - 40.7581) < 1e-4
+
+    def test_alerts_without_coordinates_are_skipped(self):
+        """Alerts that cannot be placed are left out of the index."""
+        index = index_alerts(ALERTS)
+
+        assert sum(len(points) for points in index.values()) == 4
+
+    def test_every_alert_is_in_exactly_one_tile(self):
+        """Counts over the tiles covering a viewport add up at any zoom."""
+        for zoom in (3, 10, 14, 18):
+            clusters = ClusterCache().clusters('v1', 24, zoom, MANHATTAN, lambda: ALERTS)
+            assert sum(cluster['count'] for cluster in clusters) == 4
+
+    def test_high_zoom_tile_points_come_from_one_bucket(self):
+        """Above the index zoom, a tile takes its points from its parent bucket only."""
+        index = index_alerts(ALERTS)
+        scale = 1 << 18
+        x, y = next(point[:2] for points in index.values() for point in points
+                    if point[4]['id'] == 'd')
+
+        points = tile_points(index, 18, int(x * scale), int(y * scale))
+
+        assert [point[4]['id'] for point in points] == ['d']
+        assert cluster_tile(points, 18)[0]['id'] == 'd'
+
+    def test_parse_bbox(self):
+        """Malformed or out-of-range viewports are rejected."""
+        assert parse_bbox('-74.03,40.69,-73.90,40.88') == MANHATTAN
+        assert parse_bbox('-74,40,-73') is None
+        assert parse_bbox('-73,40,-74,41') is None
+
+
+class TestClusterCache:
+    """Test cases for caching tiles per alert set version."""
+
+    def test_tiles_are_reused_for_the_same_version(self):
+        """Panning back over seen tiles does not reload or re-cluster."""
+        cache = ClusterCache()
+        loads = []
+
+        def load():
+            loads.append(1)
+            return ALERTS
+
+        first = cache.clusters('v1', 24, 12, MANHATTAN, load)
+        second = cache.clusters('v1', 24, 12, MANHATTAN, load)
+
+        assert first == second
+        assert len(loads) == 1
+        assert cache.stats['hits'] == cache.stats['misses']
+
+    def test_new_version_reclusters(self):
+        """A changed alert set builds a new index."""
+        cache = ClusterCache()
+        cache.clusters('v1', 24, 12, MANHATTAN, lambda: ALERTS)
+
+        clusters = cache.clusters('v2', 24, 12, MANHATTAN, lambda: ALERTS[:1])
+
+        assert [cluster['count'] for cluster in clusters] == [1]
+        assert cache.stats['index_builds'] == 2
+
+    def test_tile_cache_is_bounded(self):
+        """The least recently used tiles are dropped beyond max_tiles."""
+        cache = ClusterCache(max_tiles=2)
+
+        cache.clusters('v1', 24, 14, MANHATTAN, lambda: ALERTS)
+
+        assert cache.get_stats()['tiles'] == 2
@@ -0,0 +1,79 @@
+"""
+Unit tests for the columnar map alert encoding.
+Encodes minimal map alerts and checks that every alert can be rebuilt from the
+columns and dictionaries.
+"""
+
+import json
+
+from rag.alert_columns import (COLUMNAR_MEDIA_TYPE, dumps_compact, encode_columnar,
+                               wants_columnar)
+
+ALERTS = [
+    {'id': 'm1', 'source': 'reddit', 'priority': 'high', 'category': 'safety',
+     'timestamp': '2026-10-16T09:30:00Z', 'coordinates': {'lat': 40.7580123456, 'lng': -73.9855987654}},
+    {'id': '311-1', 'source': '311', 'priority': 'low', 'category': 'housing',
+     'timestamp': '2026-10-16T09:00:00', 'coordinates': {'lat': 40.6782, 'lng': -73.9442}},
+    {'id': '311-2', 'source': '311', 'priority': 'low', 'category': 'housing',
+     'timestamp': '2026-10-16T09:00:00', 'coordinates': {'lat': None, 'lng': None}},
+    {'id': 'x1', 'source': 'bluesky', 'priority': 'medium', 'category': 'weather',
+     'timestamp': 'not a time', 'coordinates': {}},
+]
+
+
+def decode(payload: dict) -> list:
+    """Rebuild (id, source, priority, category, lat, lng, timestamp) rows"""
+    columns, dictionaries = payload['columns'], payload['dictionaries']
+    return [(columns['id'][i],
+             dictionaries['source'][columns['source'][i]],
+             dictionaries['priority'][columns['priority'][i]],
+             dictionaries['category'][columns['category'][i]],
+             columns['lat'][i], columns['lng'][i], columns['timestamp'][i])
+            for i in range(payload['count'])]
+
+
+class TestEncodeColumnar:
+    """Test cases for the columnar encoding."""
+
+    def test_round_trip(self):
+        """Every alert is rebuilt from its codes, rounded to the stated precision."""
+        rows = decode(encode_columnar(ALERTS))
+
+        assert rows[0] == ('m1', 'reddit', 'high', 'safety', 40.75801, -73.9856, 1792143000)
+        assert rows[1] == ('311-1', '311', 'low', 'housing', 40.6782, -73.9442, 1792141200)
+        assert rows[2][4:] == (None, None, 1792141200)
+
+    def test_unknown_values_are_appended_to_the_dictionaries(self):
+        """Values outside the stable code lists get new codes after them."""
+        payload = encode_columnar(ALERTS)
+
+        assert payload['dictionaries']['source'][-1] == 'bluesky'
+        assert payload['dictionaries']['category'][-1] == 'weather'
+        assert decode(payload)[3][:4] == ('x1', 'bluesky', 'medium', 'weather')
+        assert decode(payload)[3][6] is None
+
+    def test_codes_are_stable_across_responses(self):
+        """Known values keep their codes whatever else is in the response."""
+        alone = encode_columnar(ALERTS[1:2])
+        mixed = encode_columnar(ALERTS)
+
+        assert alone['columns']['source'][0] == mixed['columns']['source'][1]
+        assert alone['columns']['category'][0] == mixed['columns']['category'][1]
+
+    def test_compact_payload_is_plain_json(self):
+        """The encoded payload serializes without whitespace and parses back."""
+        body = dumps_compact(encode_columnar(ALERTS))
+
+        assert ' ' not in body
+        assert json.loads(body)['count'] == 4
+
+
+class TestWantsColumnar:
+    """Test cases for format negotiation."""
+
+    def test_query_parameter_wins_over_accept(self):
+        """?format decides when given; otherwise the Accept header does."""
+        assert wants_columnar('columnar', None)
+        assert not wants_columnar('objects', COLUMNAR_MEDIA_TYPE)
+        assert wants_columnar(None, f'{COLUMNAR_MEDIA_TYPE}, application/json')
+        assert not wants_columnar(None, 'application/json')
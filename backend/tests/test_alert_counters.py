@@ -0,0 +1,119 @@
+"""
+Unit tests for the hourly alert counter buckets.
+Writes 311 signals through FirestoreManager into a fake Firestore and checks
+that only created documents are counted and that windows are not rounded to
+the hour.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from monitor.storage.alert_counters import AlertCounters, ceil_hour, written_documents
+from monitor.storage.firestore_manager import FirestoreManager
+
+SIGNALS = 'nyc_311_signals'
+COUNTING_SINCE = datetime(2026, 10, 16, 0)
+
+
+def signal_document(signal_timestamp: datetime, severity: int = 7) -> dict:
+    """A 311 signal document as NYC311Job stores it"""
+    return {'signal_timestamp': signal_timestamp, 'severity': severity,
+            'category': 'infrastructure', 'complaint_type': 'Water System', 'borough': 'BROOKLYN'}
+
+
+@pytest.fixture
+def manager(fake_firestore):
+    """FirestoreManager over the fake, with counting started at COUNTING_SINCE"""
+    fake_firestore.collection('alert_counters').document(SIGNALS).set(
+        {'collection': SIGNALS, 'counting_since': COUNTING_SINCE})
+    return FirestoreManager(project_id='test-project', client=fake_firestore)
+
+
+async def store(manager: FirestoreManager, documents):
+    report = await manager.bulk_set(SIGNALS, documents, check_existing=True)
+    await manager.record_alert_counts(SIGNALS, documents, report)
+    return report
+
+
+class TestCreatedDocumentsOnly:
+    """Test cases for counting writes that created a document."""
+
+    @pytest.mark.asyncio
+    async def test_rewriting_a_document_does_not_count_it_again(self, manager):
+        """The second write of the same IDs is an overwrite, not a new signal."""
+        documents = [('1', signal_document(datetime(2026, 10, 16, 9, 10))),
+                     ('2', signal_document(datetime(2026, 10, 16, 9, 20)))]
+
+        first = await store(manager, documents)
+        second = await store(manager, documents + [('3', signal_document(datetime(2026, 10, 16, 9, 30)))])
+
+        assert first['existing'] == []
+        assert second['existing'] == ['1', '2']
+        counts = await manager.alert_counters.count(SIGNALS, datetime(2026, 10, 16, 9))
+        assert counts['total'] == 3
+
+    @pytest.mark.asyncio
+    async def test_rollups_skip_overwrites_too(self, manager):
+        """The hourly rollup sees each signal once as well."""
+        documents = [('1', signal_document(datetime(2026, 10, 16, 9, 10)))]
+
+        await store(manager, documents)
+        await store(manager, documents)
+
+        rollup = manager.db.documents[('rollups', SIGNALS, 'hour', '2026101609')]
+        assert rollup['total']['count'] == 1
+
+    def test_failed_and_repeated_ids_are_left_out(self):
+        """Failed writes are dropped and an ID written twice in one call counts once."""
+        documents = [('1', {'severity': 3}), ('2', {'severity': 4}),
+                     ('1', {'severity': 5}), ('4', {'severity': 6})]
+        report = {'errors': {'2': 'rejected'}, 'existing': ['4']}
+
+        assert written_documents(documents, report) == [{'severity': 5}]
+
+
+class TestCountWindow:
+    """Test cases for counting a window that starts mid-hour."""
+
+    @pytest.mark.asyncio
+    async def test_partial_first_hour_is_trimmed(self, manager):
+        """Signals before `since` in its hour are not counted."""
+        await store(manager, [('1', signal_document(datetime(2026, 10, 16, 9, 5), severity=3)),
+                              ('2', signal_document(datetime(2026, 10, 16, 9, 40))),
+                              ('3', signal_document(datetime(2026, 10, 16, 10, 15)))])
+
+        counts = await manager.alert_counters.count(SIGNALS, datetime(2026, 10, 16, 9, 30))
+
+        assert counts['method'] == 'buckets'
+        assert counts['total'] == 2
+        assert counts['by_priority'] == {'high': 2}
+        assert counts['buckets_read'] == 1
+        assert counts['counted_since'] == '2026-10-16T09:30:00'
+
+    @pytest.mark.asyncio
+    async def test_window_before_counting_started_uses_aggregation(self, manager):
+        """Hours before the first bucket are counted with count()."""
+        manager.db.collection(SIGNALS).document('0').set(
+            signal_document(datetime(2026, 10, 15, 23, 50)))
+
+        counts = await AlertCounters(manager.db).count(SIGNALS, datetime(2026, 10, 15, 22, 30))
+
+        assert counts == {'total': 1, 'counted_since': '2026-10-15T22:30:00', 'method': 'aggregation'}
+
+    @pytest.mark.asyncio
+    async def test_partial_hour_before_counting_started_is_read_from_documents(self, manager):
+        """Only whole hours need buckets: the edge before the first one is read directly."""
+        manager.db.collection(SIGNALS).document('0').set(
+            signal_document(datetime(2026, 10, 15, 23, 50)))
+
+        counts = await AlertCounters(manager.db).count(SIGNALS, datetime(2026, 10, 15, 23, 30))
+
+        assert counts['method'] == 'buckets'
+        assert counts['total'] == 1
+
+    def test_ceil_hour(self):
+        """Times on the hour stay put, anything later moves to the next hour."""
+        assert ceil_hour(datetime(2026, 10, 16, 9)) == datetime(2026, 10, 16, 9)
+        assert ceil_hour(datetime(2026, 10, 16, 9, 0, 1)) == datetime(2026, 10, 16, 10)
+        assert ceil_hour(datetime(2026, 10, 16, 23, 59)) == datetime(2026, 10, 16) + timedelta(days=1)
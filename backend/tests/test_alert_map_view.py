@@ -0,0 +1,133 @@
+"""
+Unit tests for the resident alert map view.
+Loads the view from a fake Firestore and checks background warming and the
+watermark delta refreshes.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from rag.alert_map_view import AlertMapView, MapViewSource, epoch_seconds
+
+SIGNALS = 'nyc_311_signals'
+
+
+def map_alert(doc_id, data):
+    """Minimal map object keyed by the signal time"""
+    return epoch_seconds(data['signal_timestamp']), {'id': doc_id, 'title': data['title']}
+
+
+def add_signal(db, doc_id: str, minutes_ago: float, title: str = 'Water main break'):
+    """Write a signal at a time in the past (written just now)"""
+    db.collection(SIGNALS).document(doc_id).set({
+        'signal_timestamp': datetime.utcnow() - timedelta(minutes=minutes_ago),
+        'created_at': datetime.utcnow(),
+        'title': title,
+    })
+
+
+@pytest.fixture
+def view(fake_firestore):
+    """A view of the 311 collection over the fake Firestore"""
+    source = MapViewSource(SIGNALS, 'signal_timestamp', ['signal_timestamp', 'title'], map_alert)
+    return AlertMapView(lambda: fake_firestore, {'311': source}, hours=24, refresh_seconds=0)
+
+
+class TestWarming:
+    """Test cases for loading the view outside of requests."""
+
+    @pytest.mark.asyncio
+    async def test_requests_do_not_wait_for_the_load(self, view, fake_firestore):
+        """Until the background load finishes, requests are sent to Firestore."""
+        add_signal(fake_firestore, '1', 10)
+
+        assert view.covers(24) is False
+        await view.warm()
+
+        assert view.covers(24) is True
+        assert [alert['id'] for alert in view.recent('311', 24, 10)] == ['1']
+        assert view.stats['full_loads'] == 1
+
+    @pytest.mark.asyncio
+    async def test_warm_starts_one_load(self, view):
+        """Repeated warm() calls while loading share a single load."""
+        first = view.warm()
+
+        assert view.warm() is first
+        await first
+        assert view.warm() is first
+
+    @pytest.mark.asyncio
+    async def test_reset_reloads_in_the_background(self, view, fake_firestore):
+        """After reset() the next request starts a new background load."""
+        add_signal(fake_firestore, '1', 10)
+        await view.warm()
+        view.reset()
+
+        assert view.covers(24) is False
+        await view._warm_task
+
+        assert view.stats['full_loads'] == 2
+        assert view.covers(24) is True
+
+
+class TestDeltaRefresh:
+    """Test cases for refreshing the loaded view from its watermark."""
+
+    @pytest.mark.asyncio
+    async def test_only_new_writes_are_read(self, view, fake_firestore):
+        """After the load, a refresh queries by write time from the watermark."""
+        add_signal(fake_firestore, '1', 30)
+        await view.warm()
+        add_signal(fake_firestore, '2', 5)
+
+        assert await view.ensure_fresh() is True
+
+        assert [alert['id'] for alert in view.recent('311', 24, 10)] == ['2', '1']
+        delta_query = fake_firestore.queries[-1]
+        assert [(f.field_path, f.op_string) for f in delta_query.filters] == [('created_at', '>')]
+        assert view.stats['delta_refreshes'] == 1
+
+    @pytest.mark.asyncio
+    async def test_rewritten_alerts_replace_the_held_copy(self, view, fake_firestore):
+        """A document re-read by the overlap or rewritten is upserted by id."""
+        add_signal(fake_firestore, '1', 30)
+        await view.warm()
+        version = view.version
+        add_signal(fake_firestore, '1', 30, title='Water main break (repaired)')
+
+        await view.ensure_fresh()
+
+        assert [alert['title'] for alert in view.recent('311', 24, 10)] == ['Water main break (repaired)']
+        assert view.version > version
+
+    @pytest.mark.asyncio
+    async def test_alerts_older_than_the_window_are_evicted(self, view, fake_firestore):
+        """Alerts that slide out of the window are dropped on refresh."""
+        add_signal(fake_firestore, 'old', 24 * 60 - 1 / 60)
+        add_signal(fake_firestore, 'new', 5)
+        await view.warm()
+
+        view.hours = 1
+        await view.ensure_fresh()
+
+        assert [alert['id'] for alert in view.recent('311', 24, 10)] == ['new']
+        assert view.stats['evicted'] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_delta_keeps_the_watermark(self, view, fake_firestore):
+        """A failed refresh keeps what is held and retries the same delta."""
+        add_signal(fake_firestore, '1', 30)
+        await view.warm()
+        watermark = view._watermarks['311']
+        add_signal(fake_firestore, '2', 5)
+
+        with patch('rag.alert_map_view.iterate_query', side_effect=RuntimeError('unavailable')):
+            await view.ensure_fresh()
+
+        assert view._watermarks['311'] == watermark
+        assert view.stats['refresh_errors'] == 1
+        await view.ensure_fresh()
+        assert [alert['id'] for alert in view.recent('311', 24, 10)] == ['2', '1']
@@ -0,0 +1,100 @@
+"""
+Unit tests for the alert rollups.
+Builds the rollup field transforms for real alert documents and checks the
+batched writes the Firestore client would send.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from google.auth.credentials import AnonymousCredentials
+from google.cloud import firestore
+
+from monitor.storage import alert_rollups
+from monitor.storage.alert_rollups import (AlertRollups, _add_to_stats, _new_stats,
+                                           _stats_transforms, latest_time, merge_rollup)
+from monitor.storage.firestore_manager import FirestoreManager
+
+
+@pytest.fixture
+def db():
+    """Firestore client that never goes to the network (writes are captured)"""
+    return firestore.Client(project='test-project', credentials=AnonymousCredentials())
+
+
+@pytest.fixture
+def monitor_alert_document(db):
+    """A monitor alert document as FirestoreManager.store_alerts writes it"""
+    manager = FirestoreManager(project_id='test-project', client=db)
+    document = manager._alert_document({
+        'id': 'a1',
+        'title': 'Water main break on Atlantic Ave',
+        'category': 'infrastructure',
+        'severity': 7,
+        'borough': 'Brooklyn',
+        'original_alert_data': {'signals': ['reddit']},
+    })
+    document['created_at'] = datetime(2026, 10, 16, 14, 30)
+    return document
+
+
+class TestRollupTransforms:
+    """Test cases for building rollup field transforms."""
+
+    def test_stats_transforms_accept_a_real_alert(self, monitor_alert_document):
+        """Every Minimum/Maximum gets a number, including the latest time."""
+        stats = _new_stats()
+        _add_to_stats(stats, 7.0, monitor_alert_document['created_at'], 'reddit', 'infrastructure')
+
+        transforms = _stats_transforms(stats)
+
+        assert transforms['count'].value == 1
+        assert transforms['severity_max'].value == 7.0
+        assert isinstance(transforms['latest_epoch'].value, float)
+        assert latest_time(stats) == datetime(2026, 10, 16, 14, 30)
+
+    @pytest.mark.asyncio
+    async def test_record_alerts_writes_hourly_and_daily_rollups(self, db, monitor_alert_document):
+        """record_alerts builds one hourly and one daily write for one alert."""
+        committed = []
+
+        async def capture(func, *args, **kwargs):
+            committed.append(func.__self__)
+
+        with patch.object(alert_rollups, 'run_firestore', capture):
+            rolled_up = await AlertRollups(db).record_alerts(
+                'nyc_monitor_alerts', [monitor_alert_document])
+
+        assert rolled_up == 1
+        assert len(committed) == 1
+        paths = sorted(write.update.name.rsplit('/', 3)[-2] + '/' + write.update.name.rsplit('/', 1)[-1]
+                       for write in committed[0]._write_pbs if write.update.name)
+        assert paths == ['day/20261016', 'hour/2026101614']
+
+        transform_paths = {transform.field_path
+                           for write in committed[0]._write_pbs
+                           for transform in write.update_transforms}
+        assert 'total.latest_epoch' in transform_paths
+        assert 'by_borough.Brooklyn.count' in transform_paths
+        assert 'by_topic.`Water main break on Atlantic Ave`.severity_max' in transform_paths
+
+
+class TestMergeRollup:
+    """Test cases for combining rollup documents."""
+
+    def test_merge_sums_counts_and_keeps_extremes(self):
+        """Counts add up, min/max and the latest time keep the extremes."""
+        base = datetime(2026, 10, 16, 10)
+        first, second = _new_stats(), _new_stats()
+        _add_to_stats(first, 3.0, base, 'reddit', 'safety')
+        _add_to_stats(second, 9.0, base + timedelta(hours=2), '311', 'safety')
+
+        combined = merge_rollup(merge_rollup({}, first), second)
+
+        assert combined['count'] == 2
+        assert combined['severity_sum'] == 12.0
+        assert combined['severity_min'] == 3.0
+        assert combined['severity_max'] == 9.0
+        assert combined['sources'] == {'reddit': 1, '311': 1}
+        assert latest_time(combined) == base + timedelta(hours=2)
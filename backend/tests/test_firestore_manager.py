@@ -0,0 +1,110 @@
+"""
+Unit tests for the batched Firestore writes and lookups.
+Runs FirestoreManager against an in-memory Firestore that can fail commits, and
+checks retries, partial failures and existence checks.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from google.api_core import exceptions as core_exceptions
+
+from monitor.storage import firestore_manager
+from monitor.storage.firestore_manager import FirestoreManager
+
+
+@pytest.fixture
+def manager(fake_firestore):
+    """FirestoreManager over the fake, retrying without backoff delays"""
+    with patch.object(firestore_manager, 'BULK_WRITE_RETRY_BASE_SECONDS', 0):
+        yield FirestoreManager(project_id='test-project', client=fake_firestore)
+
+
+def documents(count: int, prefix: str = 'doc'):
+    return [(f'{prefix}{i}', {'n': i}) for i in range(count)]
+
+
+class TestBulkSet:
+    """Test cases for batched writes."""
+
+    @pytest.mark.asyncio
+    async def test_writes_in_batches(self, manager):
+        """Documents are split into batches of at most BULK_WRITE_BATCH_SIZE."""
+        with patch.object(firestore_manager, 'BULK_WRITE_BATCH_SIZE', 2):
+            report = await manager.bulk_set('signals', documents(5))
+
+        assert report['written'] == 5
+        assert report['batches'] == 3
+        assert report['document_ids'] == [f'doc{i}' for i in range(5)]
+        assert manager.db.documents[('signals', 'doc4')] == {'n': 4}
+
+    @pytest.mark.asyncio
+    async def test_transient_errors_are_retried(self, manager):
+        """A commit failing with a retryable error succeeds on a later attempt."""
+        manager.db.commit_errors = [core_exceptions.ServiceUnavailable('busy'),
+                                    core_exceptions.Aborted('contention')]
+
+        report = await manager.bulk_set('signals', documents(3))
+
+        assert report['written'] == 3
+        assert report['retries'] == 2
+        assert report['failed'] == 0
+
+    @pytest.mark.asyncio
+    async def test_retries_give_up_after_the_limit(self, manager):
+        """A batch that keeps failing transiently is reported as failed."""
+        manager.db.commit_errors = [core_exceptions.ServiceUnavailable('busy')] * 10
+
+        with patch.object(firestore_manager, 'BULK_WRITE_MAX_RETRIES', 2):
+            report = await manager.bulk_set('signals', documents(2))
+
+        assert report['written'] == 0
+        assert report['failed'] == 2
+        assert set(report['errors']) == {'doc0', 'doc1'}
+        assert manager.db.commits == 3
+
+    @pytest.mark.asyncio
+    async def test_one_bad_document_does_not_fail_its_batch(self, manager):
+        """A rejected batch is rewritten one document at a time."""
+        manager.db.rejected_ids = {'doc1'}
+
+        report = await manager.bulk_set('signals', documents(3))
+
+        assert report['written'] == 2
+        assert report['failed'] == 1
+        assert list(report['errors']) == ['doc1']
+        assert ('signals', 'doc1') not in manager.db.documents
+        assert ('signals', 'doc2') in manager.db.documents
+
+    @pytest.mark.asyncio
+    async def test_missing_ids_are_generated(self, manager):
+        """A None document ID gets an auto-generated one."""
+        report = await manager.bulk_set('signals', [(None, {'n': 1})])
+
+        assert report['written'] == 1
+        assert ('signals', report['document_ids'][0]) in manager.db.documents
+
+
+class TestExistingDocumentIds:
+    """Test cases for looking candidate IDs up directly."""
+
+    @pytest.mark.asyncio
+    async def test_returns_only_stored_ids(self, manager):
+        """Stored candidates are found across getAll chunks; others are not."""
+        await manager.bulk_set('signals', documents(4))
+
+        with patch.object(firestore_manager, 'EXISTENCE_CHECK_CHUNK_SIZE', 3):
+            existing = await manager.existing_document_ids(
+                'signals', ['doc0', 'doc3', 'doc9', 'doc0', 'other'])
+
+        assert existing == {'doc0', 'doc3'}
+
+    @pytest.mark.asyncio
+    async def test_check_existing_reports_overwrites(self, manager):
+        """bulk_set(check_existing=True) lists the IDs it overwrote."""
+        await manager.bulk_set('signals', documents(2))
+
+        report = await manager.bulk_set('signals', documents(3), check_existing=True)
+
+        assert report['existing'] == ['doc0', 'doc1']
+        assert report['written'] == 3
@@ -0,0 +1,93 @@
+"""
+Unit tests for the offline NYC gazetteer.
+Resolves queries as the geocoder builds them and checks that a borough named in
+the query context is respected, falling through to Nominatim on a conflict.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from monitor.utils.gazetteer import NYCGazetteer
+from monitor.utils.geocode import NYCGeocoder
+from monitor.utils.geocode_cache import GeocodeCache
+from monitor.utils.rate_limiter import TokenBucket
+
+
+@pytest.fixture
+def gazetteer():
+    """The bundled gazetteer, loaded fresh so stats start at zero"""
+    return NYCGazetteer()
+
+
+class TestGazetteerResolve:
+    """Test cases for resolving geocoding queries offline."""
+
+    @pytest.mark.parametrize('query', [
+        '3rd Avenue and 23rd Street, New York, NY',
+        '3rd Avenue and 23rd Street, Manhattan, New York, NY',
+    ])
+    def test_grid_intersection_without_other_borough(self, gazetteer, query):
+        """The Manhattan grid applies with no borough or a Manhattan context."""
+        result = gazetteer.resolve(query, 'intersection')
+
+        assert result['source'] == 'gazetteer'
+        assert 'Manhattan' in result['formatted_address']
+        assert 40.73 < result['lat'] < 40.75
+
+    @pytest.mark.parametrize('query', [
+        '3rd Avenue and 23rd Street, Brooklyn, New York, NY',
+        '3rd Avenue and 23rd Street, Park Slope, New York, NY',
+    ])
+    def test_grid_intersection_in_another_borough(self, gazetteer, query):
+        """An intersection with a non-Manhattan context is not put on the grid."""
+        assert gazetteer.resolve(query, 'intersection') is None
+
+    def test_place_in_conflicting_borough(self, gazetteer):
+        """A place whose borough conflicts with the context is rejected."""
+        assert gazetteer.resolve('Park Slope, Manhattan, New York, NY', 'neighborhood') is None
+        assert gazetteer.stats['context_conflicts'] == 1
+
+    def test_place_in_matching_borough(self, gazetteer):
+        """A neighborhood context implies its borough and agrees with the venue."""
+        result = gazetteer.resolve('Barclays Center, Park Slope, New York, NY', 'venue')
+
+        assert result['formatted_address'] == 'Barclays Center, Brooklyn, New York, NY'
+        assert result['confidence'] == 0.8
+
+    def test_city_context_is_not_a_borough(self, gazetteer):
+        """'New York, NY' names the city, not Manhattan."""
+        result = gazetteer.resolve('Park Slope, New York, NY', 'neighborhood')
+
+        assert result['formatted_address'] == 'Park Slope, Brooklyn, New York, NY'
+
+    def test_address_skips_place_names(self, gazetteer):
+        """Street addresses are never answered with a place centroid."""
+        assert gazetteer.resolve('Brooklyn, New York, NY', 'address') is None
+
+    def test_locate_text_prefers_the_most_specific_place(self, gazetteer):
+        """A venue beats the neighborhood and borough mentioned with it."""
+        result = gazetteer.locate_text('Crowds outside Barclays Center in Park Slope, Brooklyn')
+
+        assert result['formatted_address'] == 'Barclays Center, Brooklyn, New York, NY'
+
+
+class TestGeocoderFallsThrough:
+    """Test cases for the geocoder when the gazetteer declines a query."""
+
+    @pytest.mark.asyncio
+    async def test_brooklyn_intersection_reaches_nominatim(self):
+        """A Brooklyn intersection is geocoded by Nominatim, not the Manhattan grid."""
+        geocoder = NYCGeocoder(cache=GeocodeCache(), limiter=TokenBucket(rate=1000))
+        network = {'lat': 40.66, 'lng': -73.99, 'formatted_address': '3rd Ave & 23rd St, Brooklyn',
+                   'confidence': 0.9, 'source': 'nominatim', 'success': True}
+
+        async def fetch(query, query_type):
+            return dict(network), True
+
+        with patch.object(geocoder, '_fetch_from_nominatim', side_effect=fetch) as nominatim:
+            result = await geocoder.geocode_intersection('3rd Avenue', '23rd Street', 'Brooklyn')
+
+        nominatim.assert_called_once_with(
+            '3rd Avenue and 23rd Street, Brooklyn, New York, NY', 'intersection')
+        assert result['source'] == 'nominatim'
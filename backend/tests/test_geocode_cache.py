@@ -0,0 +1,134 @@
+"""
+Unit tests for the geocoding result cache.
+Uses a fake Firestore store to check TTLs, negative entries, the memory LRU and
+that results persisted by one cycle are read by the next one.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from monitor.utils.geocode import NYCGeocoder
+from monitor.utils.geocode_cache import GeocodeCache, geocode_cache_key
+from monitor.utils.rate_limiter import TokenBucket
+
+TIMES_SQUARE = {'lat': 40.758, 'lng': -73.9855, 'formatted_address': 'Times Square, Manhattan',
+                'confidence': 0.9, 'source': 'nominatim', 'success': True}
+NOT_FOUND = {'lat': None, 'lng': None, 'formatted_address': None,
+             'confidence': 0.0, 'source': 'nominatim', 'success': False}
+
+
+class FakeGeocodeStore:
+    """The FirestoreManager geocode cache methods over a dict"""
+
+    def __init__(self):
+        self.documents = {}
+        self.reads = 0
+
+    async def get_geocode_results(self, keys):
+        self.reads += 1
+        return {key: self.documents[key] for key in keys if key in self.documents}
+
+    async def save_geocode_results(self, results):
+        self.documents.update(results)
+        return len(results)
+
+
+class TestGeocodeCache:
+    """Test cases for cache lookups, TTLs and persistence."""
+
+    def test_trivially_different_queries_share_an_entry(self):
+        """Case, spacing and comma spacing do not change the key."""
+        cache = GeocodeCache()
+        cache.set('Times Square, New York, NY', 'venue', TIMES_SQUARE)
+
+        assert cache.get('  times square ,new york,  ny', 'venue') == TIMES_SQUARE
+        assert cache.get('Times Square, New York, NY', 'neighborhood') is None
+
+    def test_failed_lookups_expire_sooner(self):
+        """Negative entries use the shorter TTL."""
+        cache = GeocodeCache(ttl_seconds=3600, negative_ttl_seconds=60)
+        cache.set('Times Square, New York, NY', 'venue', TIMES_SQUARE)
+        cache.set('Nowhere Street, New York, NY', 'address', NOT_FOUND)
+
+        assert cache.get('Nowhere Street, New York, NY', 'address') == NOT_FOUND
+        assert cache.stats['negative_hits'] == 1
+
+        later = datetime.utcnow() + timedelta(seconds=120)
+        with patch('monitor.utils.geocode_cache.datetime') as clock:
+            clock.utcnow.return_value = later
+            assert cache.get('Nowhere Street, New York, NY', 'address') is None
+            assert cache.get('Times Square, New York, NY', 'venue') == TIMES_SQUARE
+
+        assert cache.stats['expired'] == 1
+
+    def test_memory_lru_evicts_the_least_recently_used(self):
+        """Only max_memory_entries results stay in memory."""
+        cache = GeocodeCache(max_memory_entries=2)
+        cache.set('a', 'venue', TIMES_SQUARE)
+        cache.set('b', 'venue', TIMES_SQUARE)
+        cache.get('a', 'venue')
+        cache.set('c', 'venue', TIMES_SQUARE)
+
+        assert cache.get('b', 'venue') is None
+        assert cache.get('a', 'venue') is not None
+        assert cache.stats['evictions'] == 1
+
+    @pytest.mark.asyncio
+    async def test_results_survive_into_the_next_cycle(self):
+        """A result saved by one process is loaded by a fresh one."""
+        store = FakeGeocodeStore()
+        first_cycle = GeocodeCache(store)
+        first_cycle.set('Times Square, New York, NY', 'venue', TIMES_SQUARE)
+
+        assert await first_cycle.save() == 1
+        stored = store.documents[geocode_cache_key('Times Square, New York, NY', 'venue')]
+        assert stored['expires_at'] > datetime.utcnow() + timedelta(days=29)
+
+        next_cycle = GeocodeCache(store)
+        assert next_cycle.get('Times Square, New York, NY', 'venue') is None
+        assert await next_cycle.load([('Times Square, New York, NY', 'venue')]) == 1
+        assert next_cycle.get('Times Square, New York, NY', 'venue') == TIMES_SQUARE
+
+    @pytest.mark.asyncio
+    async def test_expired_stored_results_are_ignored(self):
+        """A stored result past its expiry is treated as a miss."""
+        store = FakeGeocodeStore()
+        store.documents[geocode_cache_key('Times Square, New York, NY', 'venue')] = {
+            'result': TIMES_SQUARE, 'expires_at': datetime.utcnow() - timedelta(minutes=1)}
+        cache = GeocodeCache(store)
+
+        await cache.load([('Times Square, New York, NY', 'venue')])
+
+        assert cache.get('Times Square, New York, NY', 'venue') is None
+
+    @pytest.mark.asyncio
+    async def test_stored_misses_are_read_once(self):
+        """A key absent from Firestore is not looked up again by the same process."""
+        store = FakeGeocodeStore()
+        cache = GeocodeCache(store)
+
+        await cache.load([('Nowhere Street, New York, NY', 'address')])
+        await cache.load([('Nowhere Street, New York, NY', 'address')])
+
+        assert store.reads == 1
+
+
+class TestGeocoderUsesStoredResults:
+    """Test cases for the geocoder in front of a persisted cache."""
+
+    @pytest.mark.asyncio
+    async def test_stored_result_skips_nominatim(self):
+        """A query answered by an earlier cycle is not sent to Nominatim."""
+        store = FakeGeocodeStore()
+        earlier = GeocodeCache(store)
+        earlier.set('123 Fulton Street, New York, NY', 'address', TIMES_SQUARE)
+        await earlier.save()
+
+        geocoder = NYCGeocoder(cache=GeocodeCache(store), limiter=TokenBucket(rate=1000))
+        with patch.object(geocoder, '_fetch_from_nominatim') as nominatim:
+            result = await geocoder.geocode_address('123 Fulton Street')
+
+        nominatim.assert_not_called()
+        assert result == TIMES_SQUARE
@@ -0,0 +1,81 @@
+"""
+Unit tests for near-duplicate alert detection.
+Indexes recent alerts and checks which rephrased, relocated or renumbered
+alerts are matched to them.
+"""
+
+from monitor.utils.near_duplicate import NearDuplicateIndex, alert_text, shingles
+
+
+def alert(title: str, event_type: str = 'fire', lat: float = None, lng: float = None, **fields) -> dict:
+    """An alert as the triage agent produces it"""
+    result = {'title': title, 'event_type': event_type, **fields}
+    if lat is not None:
+        result['coordinates'] = {'lat': lat, 'lng': lng}
+    return result
+
+
+class TestNearDuplicateIndex:
+    """Test cases for matching alerts against the index."""
+
+    def test_rephrased_alert_is_a_duplicate(self):
+        """Small wording changes to the same event match."""
+        original = alert('Building fire on Atlantic Avenue in Brooklyn')
+        index = NearDuplicateIndex([original])
+
+        match = index.find(alert('Building fire on Atlantic Ave, Brooklyn'))
+
+        assert match is not None
+        assert match.alert is original
+        assert match.distance_meters is None
+
+    def test_unrelated_alert_is_new(self):
+        """A different event is not matched."""
+        index = NearDuplicateIndex([alert('Building fire on Atlantic Avenue in Brooklyn')])
+
+        assert index.find(alert('Subway delays on the Q line at Union Square', 'transit')) is None
+
+    def test_nearby_same_type_alert_needs_less_text_overlap(self):
+        """The same event type within the radius matches on looser wording."""
+        original = alert('Smoke seen from apartment in Park Slope', lat=40.6710, lng=-73.9814)
+        index = NearDuplicateIndex([original])
+        reworded = alert('Heavy smoke, apartment fire, Park Slope', lat=40.6720, lng=-73.9820)
+        far_away = NearDuplicateIndex([alert('Smoke seen from apartment in Park Slope',
+                                             lat=40.8448, lng=-73.8648)])
+
+        match = index.find(reworded)
+        assert match is not None
+        assert match.distance_meters < 500
+        assert far_away.find(reworded) is None
+        assert index.find(alert('Heavy smoke, apartment fire, Park Slope')) is None
+
+    def test_different_house_numbers_are_different_events(self):
+        """'123 Main St' and '456 Main St' need near-identical text to match."""
+        index = NearDuplicateIndex([alert('Fire at 123 Main Street, Queens')])
+
+        assert index.find(alert('Fire at 456 Main Street, Queens')) is None
+        assert index.find(alert('Fire at 123 Main Street, Queens')) is not None
+
+    def test_different_event_types_need_near_identical_text(self):
+        """A flood and a fire at the same address are not merged."""
+        index = NearDuplicateIndex([alert('Emergency on Atlantic Avenue in Brooklyn', 'fire')])
+
+        assert index.find(alert('Emergency at Atlantic Avenue, Brooklyn', 'flood')) is None
+
+    def test_best_match_is_returned(self):
+        """With several candidates, the most similar one wins."""
+        closest = alert('Water main break on Atlantic Avenue in Brooklyn', 'water')
+        index = NearDuplicateIndex([alert('Water main break on Atlantic Ave', 'water'), closest])
+
+        match = index.find(alert('Water main break on Atlantic Avenue, Brooklyn', 'water'))
+
+        assert match.alert is closest
+        assert len(index) == 2
+
+    def test_alert_text_includes_location_fields(self):
+        """Title, area, venue and streets are compared, lower-cased and de-punctuated."""
+        text = alert_text(alert('Fire!', area='Park Slope', venue_address='5th Ave',
+                                specific_streets=['Union St']))
+
+        assert text == 'fire park slope 5th ave union st'
+        assert shingles('ab') == {'ab'}
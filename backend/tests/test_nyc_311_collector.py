@@ -0,0 +1,152 @@
+"""
+Unit tests for the incremental NYC 311 collector.
+Runs collections against a fake Socrata API and checks which checkpoints each
+query family reaches, commits or gives up.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from monitor.collectors.nyc_311_collector import MAX_PAGES_PER_QUERY, NYC311Collector
+
+
+def request_row(unique_key: str, created_date: str, complaint_type: str = 'Gas',
+                descriptor: str = 'Gas Leak') -> dict:
+    """A 311 row as the SODA API returns it"""
+    return {
+        'unique_key': unique_key,
+        'created_date': created_date,
+        'complaint_type': complaint_type,
+        'descriptor': descriptor,
+        'borough': 'BROOKLYN',
+        'agency': 'DOB',
+        'agency_name': 'Department of Buildings',
+        'status': 'Open',
+    }
+
+
+class FakeSocrata:
+    """Answers SoQL queries by kind; a kind mapped to an exception raises it"""
+
+    def __init__(self, **responses):
+        self.responses = {'type': [], 'keyword': [], 'event': [], 'aggregate': [], 'baseline': []}
+        self.responses.update(responses)
+        self.queries = []
+
+    async def __call__(self, params: dict):
+        kind = self._kind(params)
+        self.queries.append((kind, params))
+        response = self.responses[kind]
+        if isinstance(response, Exception):
+            raise response
+        offset, limit = params.get('$offset', 0), params['$limit']
+        return response[offset:offset + limit]
+
+    @staticmethod
+    def _kind(params: dict) -> str:
+        if 'date_extract_dow' in params.get('$select', ''):
+            return 'baseline'
+        if '$group' in params:
+            return 'aggregate'
+        if 'descriptor LIKE' in params['$where']:
+            return 'keyword'
+        if 'complaint_type LIKE' in params['$where']:
+            return 'event'
+        return 'type'
+
+
+async def collect(collector: NYC311Collector, socrata: FakeSocrata):
+    with patch.object(collector, '_get_json', new=socrata):
+        return await collector.collect_signals()
+
+
+class TestCheckpoints:
+    """Test cases for per-family checkpoint advance, commit and rollback."""
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_advances_to_the_newest_row(self):
+        """Both emergency queries succeed: the checkpoint reaches the newest row of either."""
+        collector = NYC311Collector()
+        socrata = FakeSocrata(
+            type=[request_row('1', '2026-10-16T09:00:00.000')],
+            keyword=[request_row('2', '2026-10-16T10:00:00.000', 'Water System', 'WATER MAIN BREAK')])
+
+        signals = await collect(collector, socrata)
+
+        assert {signal['metadata']['unique_key'] for signal in signals} == {'1', '2'}
+        assert collector.pending_checkpoints['emergency']['created_date'] == '2026-10-16T10:00:00.000'
+        assert collector.pending_checkpoints['emergency']['unique_key'] == '2'
+        assert 'emergency' not in collector.checkpoints
+
+        committed = collector.commit_checkpoints()
+
+        assert committed['emergency']['unique_key'] == '2'
+        assert collector.pending_checkpoints == {}
+
+    @pytest.mark.asyncio
+    async def test_failed_query_keeps_the_family_checkpoint(self):
+        """The keyword query fails after the type query succeeded: nothing advances."""
+        previous = {'emergency': {'created_date': '2026-10-16T08:00:00.000', 'unique_key': '0'}}
+        collector = NYC311Collector(checkpoints=previous)
+        socrata = FakeSocrata(
+            type=[request_row('1', '2026-10-16T09:00:00.000')],
+            keyword=RuntimeError('503 Service Unavailable'),
+            event=[request_row('3', '2026-10-16T09:30:00.000', 'Street Fair Permit', '')])
+
+        signals = await collect(collector, socrata)
+
+        assert [signal['metadata']['unique_key'] for signal in signals] == ['3']
+        assert 'emergency' not in collector.pending_checkpoints
+        assert collector.pending_checkpoints['event']['unique_key'] == '3'
+
+        committed = collector.commit_checkpoints()
+
+        assert committed['emergency'] == previous['emergency']
+
+    @pytest.mark.asyncio
+    async def test_truncated_window_caps_the_checkpoint(self):
+        """A window cut off at the page limit stops the checkpoint at its last row."""
+        collector = NYC311Collector()
+        socrata = FakeSocrata(
+            type=[request_row(f'{key:04d}', f'2026-10-16T{key // 3600:02d}:{key // 60 % 60:02d}:{key % 60:02d}.000')
+                  for key in range(MAX_PAGES_PER_QUERY * 500 + 100)],
+            keyword=[request_row('9999', '2026-10-16T11:00:00.000', 'Water System', 'WATER MAIN BREAK')])
+
+        # The type window is cut off after MAX_PAGES_PER_QUERY pages of 500 rows
+        await collect(collector, socrata)
+
+        last_read = f'{MAX_PAGES_PER_QUERY * 500 - 1:04d}'
+        assert collector.pending_checkpoints['emergency']['unique_key'] == last_read
+
+    @pytest.mark.asyncio
+    async def test_failed_spike_detection_keeps_the_checkpoint(self):
+        """Cluster members failing after the aggregate was read does not advance it."""
+        collector = NYC311Collector()
+        socrata = FakeSocrata(aggregate=[{
+            'complaint_type': 'Water System', 'incident_zip': '11217',
+            'hour': '2026-10-16T09:00:00.000', 'requests': '40'}])
+
+        with patch.object(collector, '_fetch_cluster_members', side_effect=RuntimeError('boom')):
+            signals = await collect(collector, socrata)
+
+        assert signals == []
+        assert 'volume' not in collector.pending_checkpoints
+        assert 'geographic' not in collector.pending_checkpoints
+
+
+class TestClusterSignals:
+    """Test cases for the signals built from volume spikes."""
+
+    def test_cluster_links_to_its_newest_member(self):
+        """A spike signal links to the open data record of its newest request."""
+        collector = NYC311Collector()
+        anomaly = {'complaint_type': 'Water System', 'incident_zip': '11217',
+                   'hour': '2026-10-16T09:00:00.000', 'requests': 40, 'expected': 4.0, 'ratio': 10.0}
+        members = [request_row('102', '2026-10-16T09:50:00.000', 'Water System', 'WATER MAIN BREAK'),
+                   request_row('101', '2026-10-16T09:10:00.000', 'Water System', 'WATER MAIN BREAK')]
+
+        signal = collector._cluster_to_signal('volume', anomaly, members, ('complaint_type', 'incident_zip'))
+
+        assert signal['url'] == f"{collector.base_url}?unique_key=102"
+        assert signal['metadata']['member_keys'] == ['102', '101']
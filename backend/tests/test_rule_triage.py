@@ -0,0 +1,64 @@
+"""
+Unit tests for the rule-based 311 pre-triage.
+Scores real 311 complaint type / descriptor / agency combinations and checks
+which ones are kept local and which are sent to the model.
+"""
+
+import pytest
+
+from monitor.agents.rule_triage import PRE_TRIAGE_LLM_SEVERITY, score_311_signal
+
+
+def signal_311(complaint_type: str, descriptor: str, agency: str) -> dict:
+    """A standardized 311 signal as NYC311Collector builds it"""
+    return {'metadata': {'complaint_type': complaint_type, 'descriptor': descriptor, 'agency': agency}}
+
+
+class TestScore311Signal:
+    """Test cases for scoring 311 signals with the local rules."""
+
+    @pytest.mark.parametrize('complaint_type, descriptor, agency', [
+        ('SAFETY', 'SMOKE DETECTOR', 'HPD'),
+        ('SAFETY', 'CARBON MONOXIDE DETECTOR', 'HPD'),
+        ('Water System', 'Hydrant Leaking (WC1)', 'DEP'),
+        ('Water System', 'Hydrant Running (WC3)', 'DEP'),
+        ('Water System', 'Fire Hydrant Leaking (WC1)', 'DEP'),
+        ('Water System', 'Leak (Use Comments) (WA2)', 'DEP'),
+        ('Water Leak', 'SLOW LEAK', 'HPD'),
+        ('Illegal Parking', 'Blocked Hydrant', 'NYPD'),
+        ('Noise - Residential', 'Loud Music/Party', 'NYPD'),
+        ('Street Condition', 'Pothole', 'DOT'),
+    ])
+    def test_routine_complaints_stay_local(self, complaint_type, descriptor, agency):
+        """Equipment named after life-safety words is not a life-safety signal."""
+        verdict = score_311_signal(signal_311(complaint_type, descriptor, agency))
+
+        assert not verdict.needs_llm
+        assert verdict.reason == 'routine'
+        assert verdict.severity < PRE_TRIAGE_LLM_SEVERITY
+
+    @pytest.mark.parametrize('complaint_type, descriptor, agency', [
+        ('Gas', 'Gas Leak', 'DOB'),
+        ('Structural', 'Building Collapse', 'DOB'),
+    ])
+    def test_life_safety_complaints_go_to_the_model(self, complaint_type, descriptor, agency):
+        """Whole life-safety phrases still raise the severity and ask the model."""
+        verdict = score_311_signal(signal_311(complaint_type, descriptor, agency))
+
+        assert verdict.needs_llm
+        assert verdict.reason == 'life_safety_keywords'
+
+    def test_water_main_break_outranks_a_leak(self):
+        """A water main break is a service outage, a leak in the same system is not."""
+        main_break = score_311_signal(signal_311('Water System', 'Water Main Break (WA1)', 'DEP'))
+        leak = score_311_signal(signal_311('Water System', 'Leak (Use Comments) (WA2)', 'DEP'))
+
+        assert main_break.needs_llm
+        assert main_break.reason == 'high_impact'
+        assert main_break.severity > leak.severity
+
+    def test_gas_leak_is_not_a_routine_leak(self):
+        """'leak' inside the longer 'gas leak' phrase does not count as routine."""
+        verdict = score_311_signal(signal_311('Gas', 'Gas Leak', 'DOB'))
+
+        assert verdict.severity == 10
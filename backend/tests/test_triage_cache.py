@@ -0,0 +1,99 @@
+"""
+Unit tests for the triage verdict cache.
+Persists verdicts through FirestoreManager into a fake Firestore and checks
+cache keys, TTLs and that a later cycle reuses earlier verdicts.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from monitor.agents.triage_cache import TriageCache, signal_cache_key
+from monitor.storage.firestore_manager import FirestoreManager
+
+SIGNAL = {'title': 'Water main break on Atlantic Ave', 'content': 'Street flooding near Nevins St',
+          'metadata': {'post_id': 'abc123'}}
+ALERTS = [{'title': 'Water main break', 'severity': 6}]
+
+
+@pytest.fixture
+def storage(fake_firestore):
+    """FirestoreManager over the fake"""
+    return FirestoreManager(project_id='test-project', client=fake_firestore)
+
+
+class TestSignalCacheKey:
+    """Test cases for the per-signal cache key."""
+
+    def test_whitespace_and_case_do_not_change_the_key(self):
+        """Reformatted text keeps the verdict."""
+        reformatted = {**SIGNAL, 'title': '  WATER main break on  Atlantic Ave '}
+
+        assert signal_cache_key('reddit', reformatted) == signal_cache_key('reddit', SIGNAL)
+
+    def test_edits_source_and_id_change_the_key(self):
+        """An edited post, another source or another post is triaged again."""
+        key = signal_cache_key('reddit', SIGNAL)
+
+        assert signal_cache_key('reddit', {**SIGNAL, 'content': 'Flooding has stopped'}) != key
+        assert signal_cache_key('hackernews', SIGNAL) != key
+        assert signal_cache_key('reddit', {**SIGNAL, 'metadata': {'post_id': 'def456'}}) != key
+
+
+class TestTriageCache:
+    """Test cases for verdict lookups, TTLs and persistence."""
+
+    def test_empty_verdicts_are_cached(self):
+        """A signal that produced no alerts is a hit, not a miss."""
+        cache = TriageCache()
+        cache.put('k', [])
+
+        assert cache.get('k') == []
+        assert cache.get_stats()['hit_rate'] == 1.0
+
+    def test_expired_verdicts_are_misses(self):
+        """Verdicts past the TTL are dropped on lookup."""
+        cache = TriageCache(ttl_seconds=60)
+        cache.put('k', ALERTS)
+
+        with patch('monitor.agents.triage_cache.datetime') as clock:
+            clock.utcnow.return_value = datetime.utcnow() + timedelta(seconds=120)
+            assert cache.get('k') is None
+
+        assert cache.stats['expired'] == 1
+
+    def test_returned_alerts_are_copies(self):
+        """Changing a returned alert does not change the cached verdict."""
+        cache = TriageCache()
+        cache.put('k', ALERTS)
+
+        cache.get('k')[0]['severity'] = 10
+
+        assert cache.get('k')[0]['severity'] == 6
+
+    @pytest.mark.asyncio
+    async def test_next_cycle_reuses_saved_verdicts(self, storage):
+        """Verdicts saved by one cycle are loaded by the next one's fresh cache."""
+        key = signal_cache_key('reddit', SIGNAL)
+        first_cycle = TriageCache(storage)
+        first_cycle.put(key, ALERTS)
+
+        assert await first_cycle.save() == 1
+        assert await first_cycle.save() == 0
+
+        next_cycle = TriageCache(storage)
+        assert await next_cycle.load([key, 'unknown']) == 1
+        assert next_cycle.get(key) == ALERTS
+        assert next_cycle.get('unknown') is None
+
+    @pytest.mark.asyncio
+    async def test_expired_stored_verdicts_are_ignored(self, storage):
+        """A stored verdict past its expiry is a miss even before Firestore deletes it."""
+        storage.db.collection('triage_cache').document('k').set(
+            {'alerts': ALERTS, 'expires_at': datetime.utcnow() - timedelta(minutes=1)})
+        cache = TriageCache(storage)
+
+        await cache.load(['k'])
+
+        assert cache.get('k') is None